@@ -0,0 +1,154 @@
+from collections import namedtuple
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+# distributions of the number of includes of a file: each file has the mean number of includes (fixed), varying
+# around it (poisson) or a long tail of files with many includes (geometric)
+FIXED_DISTRIBUTION = 'fixed'
+POISSON_DISTRIBUTION = 'poisson'
+GEOMETRIC_DISTRIBUTION = 'geometric'
+INCLUDE_DISTRIBUTIONS = [FIXED_DISTRIBUTION, POISSON_DISTRIBUTION, GEOMETRIC_DISTRIBUTION]
+
+# extensions of the generated headers and sources
+HEADER_EXTENSIONS = ['h', 'hpp']
+SOURCE_EXTENSION = 'cpp'
+
+# number of sub-directories of each top-level directory of the corpus
+SUB_DIRECTORIES = 10
+
+# headers of the standard library included by the generated files
+STL_HEADERS = ['algorithm', 'map', 'memory', 'string', 'unordered_map', 'vector']
+
+# options of a synthetic corpus:
+# - nb_files: number of code files, spread over directories mod<i>/sub<j> of files_per_directory files each
+# - header_ratio: share of headers (the remaining files are sources), only headers define classes
+# - mean_includes, include_distribution: number of includes of each file (see INCLUDE_DISTRIBUTIONS)
+# - include_skew: exponent of the Zipf-like popularity of the headers (0: all headers are included equally often)
+# - stl_ratio, missing_ratio: share of the includes of the standard library and of headers not in the corpus
+# - mean_classes: mean number of classes of a header (poisson distributed)
+# - abstract_ratio: share of the classes with a pure virtual method (interfaces)
+# - lines_per_class, line_length: size of the body of a class (and of a source) and the length of its lines
+# - seed: the same options (and seed) generate the same corpus
+CorpusOptions = namedtuple('CorpusOptions', ['nb_files', 'files_per_directory', 'header_ratio', 'mean_includes',
+                                             'include_distribution', 'include_skew', 'stl_ratio', 'missing_ratio',
+                                             'mean_classes', 'abstract_ratio', 'lines_per_class', 'line_length',
+                                             'seed'],
+                           defaults=[1000, 50, .5, 5., POISSON_DISTRIBUTION, 1., .2, .02, 1., .3, 10, 60, 0])
+
+# generated corpus: the paths of the files (relative to the corpus directory), their total size in bytes and the total
+# number of interfaces (abstract classes) and classes of the headers
+Corpus = namedtuple('Corpus', ['file_paths', 'nb_bytes', 'nb_interfaces', 'nb_classes'])
+
+
+class CorpusOptionError(RuntimeError):
+    ''' raised if the options of a corpus are invalid (e.g. unknown include distribution) '''
+
+
+def _draw_numbers_of_includes(random_state, options):
+    if options.include_distribution == FIXED_DISTRIBUTION:
+        return np.full(options.nb_files, int(round(options.mean_includes)), dtype=np.int64)
+    if options.include_distribution == POISSON_DISTRIBUTION:
+        return random_state.poisson(options.mean_includes, options.nb_files).astype(np.int64)
+    if options.include_distribution == GEOMETRIC_DISTRIBUTION:
+        # the geometric distribution starts at 1, shifted to start at 0 with the given mean
+        return random_state.geometric(1. / (options.mean_includes + 1.), options.nb_files).astype(np.int64) - 1
+
+    raise CorpusOptionError('Unknown include distribution "{}", use one of {}'.format(
+        options.include_distribution, ', '.join(INCLUDE_DISTRIBUTIONS)))
+
+
+def _get_file_paths(random_state, options):
+    ''' return the relative path of each file and whether it is a header '''
+    is_header = random_state.random_sample(options.nb_files) < options.header_ratio
+    header_extensions = random_state.randint(len(HEADER_EXTENSIONS), size=options.nb_files)
+    directories = np.arange(options.nb_files) // max(options.files_per_directory, 1)
+
+    file_paths = ['mod{}/sub{}/f{}.{}'.format(directory // SUB_DIRECTORIES, directory % SUB_DIRECTORIES, file_id,
+                                              HEADER_EXTENSIONS[extension] if header else SOURCE_EXTENSION)
+                  for file_id, (directory, header, extension) in enumerate(zip(directories.tolist(),
+                                                                               is_header.tolist(),
+                                                                               header_extensions.tolist()))]
+
+    return file_paths, is_header
+
+
+def _draw_includes(random_state, options, file_paths, is_header):
+    ''' return the included paths of each file. User-includes refer to headers (popular headers are included more
+    often), stl-includes and includes of missing headers are mixed in '''
+    nb_includes = _draw_numbers_of_includes(random_state, options)
+    headers = np.flatnonzero(is_header)
+
+    kinds = random_state.random_sample(int(nb_includes.sum()))
+    popularity = 1. / (random_state.permutation(headers.size) + 1.) ** options.include_skew
+    included_headers = headers[random_state.choice(headers.size, kinds.size, p=popularity / popularity.sum())] \
+        if headers.size else np.zeros(kinds.size, dtype=np.int64)
+    stl_headers = random_state.randint(len(STL_HEADERS), size=kinds.size)
+
+    includes = []
+    for index in range(kinds.size):
+        if kinds[index] < options.stl_ratio or not headers.size:
+            includes.append('<{}>'.format(STL_HEADERS[stl_headers[index]]))
+        elif kinds[index] < options.stl_ratio + options.missing_ratio:
+            includes.append('"missing{}.h"'.format(index))
+        else:
+            includes.append('"{}"'.format(file_paths[included_headers[index]]))
+
+    ends = np.cumsum(nb_includes).tolist()
+    return [includes[end - count:end] for end, count in zip(ends, nb_includes.tolist())]
+
+
+def _get_filler_line(line_id, line_length):
+    ''' return a member declaration padded by a comment to the given length '''
+    line = '    int member{};'.format(line_id)
+
+    return line + (' // ' + 'x' * (line_length - len(line) - 4) if len(line) + 4 < line_length else '')
+
+
+def _get_header_content(file_id, includes, nb_classes, nb_abstract_classes, options):
+    lines = ['// synthetic header {}'.format(file_id)] + ['#include {}'.format(include) for include in includes]
+    lines += ['', 'namespace synthetic {', '']
+    for class_id in range(nb_classes):
+        lines += ['class Class{}_{} {{'.format(file_id, class_id), 'public:']
+        if class_id < nb_abstract_classes:
+            lines.append('    virtual void run{}() = 0;'.format(class_id))
+        lines += [_get_filler_line(line_id, options.line_length) for line_id in range(options.lines_per_class)]
+        lines += ['};', '']
+
+    return '\n'.join(lines + ['}', ''])
+
+
+def _get_source_content(file_id, includes, options):
+    lines = ['// synthetic source {}'.format(file_id)] + ['#include {}'.format(include) for include in includes]
+    lines += ['', 'int function{}() {{'.format(file_id)]
+    lines += [_get_filler_line(line_id, options.line_length) for line_id in range(options.lines_per_class)]
+
+    return '\n'.join(lines + ['    return 0;', '}', ''])
+
+
+def generate_corpus(dir_path, options=CorpusOptions()):
+    ''' generate a synthetic C++ code base (see CorpusOptions) in the given directory and return the Corpus. The corpus
+    is deterministic: the same options generate the same files, e.g. to compare the performance of two versions '''
+    random_state = np.random.RandomState(options.seed)
+    file_paths, is_header = _get_file_paths(random_state, options)
+    includes_of_files = _draw_includes(random_state, options, file_paths, is_header)
+    nb_classes = np.where(is_header, random_state.poisson(options.mean_classes, options.nb_files), 0)
+    nb_abstract_classes = random_state.binomial(nb_classes, options.abstract_ratio)
+
+    nb_bytes = 0
+    for directory in sorted({os.path.dirname(file_path) for file_path in file_paths}):
+        Path(dir_path, directory).mkdir(parents=True, exist_ok=True)
+    for file_id, (file_path, includes) in enumerate(zip(file_paths, includes_of_files)):
+        if is_header[file_id]:
+            content = _get_header_content(file_id, includes, nb_classes[file_id], nb_abstract_classes[file_id], options)
+        else:
+            content = _get_source_content(file_id, includes, options)
+
+        data = content.encode('utf-8')
+        with open(os.path.join(dir_path, file_path), 'wb') as file:
+            file.write(data)
+        nb_bytes += len(data)
+
+    return Corpus(file_paths, nb_bytes, int(nb_abstract_classes.sum()), int(nb_classes.sum()))
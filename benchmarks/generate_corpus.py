@@ -0,0 +1,62 @@
+''' generate a synthetic C++ code base (see corpus_generator), e.g. to analyze it by hand or to profile a run.
+
+    python benchmarks/generate_corpus.py <directory> [--files N] [--mean-includes N] [--distribution poisson] ...
+'''
+import argparse
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import corpus_generator
+
+
+def _create_argument_parser():
+    defaults = corpus_generator.CorpusOptions()
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic C++ code base.')
+    parser.add_argument('directory', type=str, help='Directory the files are generated in')
+    parser.add_argument('--files', type=int, default=defaults.nb_files, dest='nb_files', metavar='N',
+                        help='Number of files (default: {})'.format(defaults.nb_files))
+    parser.add_argument('--files-per-directory', type=int, default=defaults.files_per_directory, metavar='N',
+                        help='Number of files per directory (default: {})'.format(defaults.files_per_directory))
+    parser.add_argument('--header-ratio', type=float, default=defaults.header_ratio, metavar='RATIO',
+                        help='Share of headers (default: {})'.format(defaults.header_ratio))
+    parser.add_argument('--mean-includes', type=float, default=defaults.mean_includes, metavar='N',
+                        help='Mean number of includes of a file (default: {})'.format(defaults.mean_includes))
+    parser.add_argument('--distribution', type=str, default=defaults.include_distribution,
+                        dest='include_distribution', choices=corpus_generator.INCLUDE_DISTRIBUTIONS,
+                        help='Distribution of the number of includes (default: {})'.format(
+                            defaults.include_distribution))
+    parser.add_argument('--include-skew', type=float, default=defaults.include_skew, metavar='S',
+                        help='Zipf exponent of the popularity of the headers, 0 includes all headers equally often ' +
+                        '(default: {})'.format(defaults.include_skew))
+    parser.add_argument('--stl-ratio', type=float, default=defaults.stl_ratio, metavar='RATIO',
+                        help='Share of includes of the standard library (default: {})'.format(defaults.stl_ratio))
+    parser.add_argument('--missing-ratio', type=float, default=defaults.missing_ratio, metavar='RATIO',
+                        help='Share of includes of headers missing in the code base (default: {})'.format(
+                            defaults.missing_ratio))
+    parser.add_argument('--mean-classes', type=float, default=defaults.mean_classes, metavar='N',
+                        help='Mean number of classes of a header (default: {})'.format(defaults.mean_classes))
+    parser.add_argument('--abstract-ratio', type=float, default=defaults.abstract_ratio, metavar='RATIO',
+                        help='Share of classes with a pure virtual method (default: {})'.format(
+                            defaults.abstract_ratio))
+    parser.add_argument('--lines-per-class', type=int, default=defaults.lines_per_class, metavar='N',
+                        help='Number of lines of the body of a class or function (default: {})'.format(
+                            defaults.lines_per_class))
+    parser.add_argument('--line-length', type=int, default=defaults.line_length, metavar='N',
+                        help='Length of the lines of a body (default: {})'.format(defaults.line_length))
+    parser.add_argument('--seed', type=int, default=defaults.seed, help='Seed (default: {})'.format(defaults.seed))
+
+    return parser
+
+
+def main():
+    args = vars(_create_argument_parser().parse_args())
+    directory = args.pop('directory')
+
+    corpus = corpus_generator.generate_corpus(directory, corpus_generator.CorpusOptions(**args))
+    print('Generated {} files ({:.1f} MB, {} classes, {} interfaces) in {}'.format(
+        len(corpus.file_paths), corpus.nb_bytes / (1024. * 1024.), corpus.nb_classes, corpus.nb_interfaces, directory))
+
+
+if __name__ == '__main__':
+    main()
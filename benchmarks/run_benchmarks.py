@@ -0,0 +1,188 @@
+''' time each stage of the analysis of synthetic C++ code bases (see corpus_generator) of different sizes and report
+the throughput (files/s, MB/s of code read) and the peak memory of the process and of its worker processes (-j).
+Each size runs in a separate process, hence the peak memory of a size does not depend on the sizes before it.
+
+    python benchmarks/run_benchmarks.py [--sizes 1000 10000 100000] [--jobs N] [--corpus-dir DIR] [--json FILE]
+'''
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import multiprocessing
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, the peak memory is not reported there
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import corpus_generator
+from scm_modules.utils import FileMetrics, FileUtility, MetricsFrame, ProgrammingLanguageConfig, \
+    SourceFileScanner
+
+
+# numbers of files of the benchmarked code bases
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# stages of the analysis, in order of their execution
+DISCOVERY = 'discovery'
+PARSING = 'parsing'
+GRAPH = 'graph'
+METRICS = 'metrics'
+EXPORT = 'export'
+PLOTTING = 'plotting'
+STAGES = [DISCOVERY, PARSING, GRAPH, METRICS, EXPORT, PLOTTING]
+
+
+def _get_peak_memory(who='RUSAGE_SELF'):
+    ''' return the peak resident memory so far in MB of the process (RUSAGE_SELF) or of the largest of its finished
+    child processes (RUSAGE_CHILDREN, e.g. the workers parsing the files), None if unknown '''
+    if resource is None:
+        return None
+
+    # kilobytes on Linux, bytes on macOS
+    peak_memory = resource.getrusage(getattr(resource, who)).ru_maxrss
+
+    return peak_memory / (1024. * 1024.) if sys.platform == 'darwin' else peak_memory / 1024.
+
+
+class _StageTimer:
+    ''' measure the wall time of the stages and the peak memory (of the process and of its worker processes) after
+    each of them '''
+    def __init__(self):
+        self.results = {}
+
+    def run(self, stage, function, *args):
+        start_time = time.perf_counter()
+        result = function(*args)
+        self.results[stage] = {'seconds': time.perf_counter() - start_time, 'peak_memory_mb': _get_peak_memory(),
+                               'peak_worker_memory_mb': _get_peak_memory('RUSAGE_CHILDREN')}
+
+        return result
+
+
+def _plot(dir_path, metrics_frame, plot_directory):
+    ''' render the Main Sequence and the distance headless (see FileUtility.save_plot_to_file) '''
+    from scm_modules.metrics import distance_ia, main_sequence
+
+    main_sequence.MainSequence(dir_path, metrics_frame).save_plot(str(Path(plot_directory, 'main_sequence.png')))
+    distance_ia.DistanceIA(dir_path, metrics_frame=metrics_frame).save_plot(str(Path(plot_directory, 'distance.png')))
+
+
+def _benchmark_stages(dir_path, jobs, output_directory):
+    ''' run the analysis of the given directory stage by stage, return the results of the stages '''
+    # the modules imported lazily are imported before, the stages measure their work only
+    import matplotlib.figure  # noqa: F401
+    import pandas  # noqa: F401
+
+    timer = _StageTimer()
+    file_extensions_am = ProgrammingLanguageConfig.get_file_extensions_am()
+    file_extensions_im = ProgrammingLanguageConfig.get_file_extensions_im()
+
+    code_files = timer.run(DISCOVERY, FileUtility.get_all_code_files, dir_path,
+                           SourceFileScanner.get_file_extensions())
+    file_records = timer.run(PARSING, SourceFileScanner.scan_files, code_files,
+                             [FileUtility.has_file_extension(file_path, file_extensions_am) for file_path in code_files],
+                             jobs)
+
+    def build_graph():
+        include_graph, nb_user_files = FileMetrics.create_include_graph(dir_path, [
+            record for record in file_records if FileUtility.has_file_extension(record.file_path, file_extensions_im)])
+        include_graph.get_csr()
+        return include_graph, nb_user_files
+
+    def compute_metrics():
+        names, columns = FileMetrics.compute_metrics_of_include_graph(dir_path, file_records, *graph)
+        return MetricsFrame.create_metrics_frame_from_columns(names, columns)
+
+    graph = timer.run(GRAPH, build_graph)
+    metrics_frame = timer.run(METRICS, compute_metrics)
+    timer.run(EXPORT, FileUtility.save_metrics_frame_to_file, metrics_frame, str(Path(output_directory, 'metrics.jsonl')))
+    timer.run(PLOTTING, _plot, dir_path, metrics_frame, output_directory)
+
+    return timer.results
+
+
+def benchmark_size(nb_files, jobs, corpus_directory, seed):
+    ''' generate (or reuse) the corpus of the given number of files and benchmark its analysis, return the results:
+    the corpus (files, bytes, generation time) and the time, throughput and peak memory of each stage '''
+    ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE = 'c++'
+    dir_path = Path(corpus_directory, 'corpus_{}_{}'.format(nb_files, seed))
+    corpus_file = dir_path.with_suffix('.json')
+
+    start_time = time.perf_counter()
+    if corpus_file.is_file():
+        corpus = json.loads(corpus_file.read_text())
+    else:
+        options = corpus_generator.CorpusOptions(nb_files=nb_files, seed=seed)
+        corpus = corpus_generator.generate_corpus(str(dir_path), options)._asdict()
+        del corpus['file_paths']
+        corpus_file.write_text(json.dumps(corpus))
+    generation_seconds = time.perf_counter() - start_time
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        stages = _benchmark_stages(str(dir_path), jobs, output_directory)
+
+    for result in stages.values():
+        result['files_per_second'] = nb_files / result['seconds']
+        result['mb_per_second'] = corpus['nb_bytes'] / (1024. * 1024.) / result['seconds']
+
+    return {'files': nb_files, 'bytes': corpus['nb_bytes'], 'generation_seconds': generation_seconds,
+            'stages': stages}
+
+
+def _format_memory(memory):
+    return 'n/a' if memory is None else '{:.0f}'.format(memory)
+
+
+def _print_results(results):
+    print('{:>8} {:<10} {:>10} {:>12} {:>10} {:>14} {:>18}'.format(
+        'files', 'stage', 'time [s]', 'files/s', 'MB/s', 'peak mem [MB]', 'peak worker [MB]'))
+    for result in results:
+        for stage in STAGES:
+            stage_result = result['stages'][stage]
+            print('{:>8} {:<10} {:>10.3f} {:>12.0f} {:>10.1f} {:>14} {:>18}'.format(
+                result['files'], stage, stage_result['seconds'], stage_result['files_per_second'],
+                stage_result['mb_per_second'], _format_memory(stage_result['peak_memory_mb']),
+                _format_memory(stage_result['peak_worker_memory_mb'])))
+
+
+def _create_argument_parser():
+    parser = argparse.ArgumentParser(description='Benchmark the stages of the analysis on synthetic code bases.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, metavar='N',
+                        help='Numbers of files of the code bases (default: {})'.format(DEFAULT_SIZES))
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='Number of processes used to parse ' +
+                        'the files (default: 1, 0: number of available cores)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the generated code bases (default: 0)')
+    parser.add_argument('--corpus-dir', type=str, metavar='DIR', help='Directory keeping the generated code bases ' +
+                        'to reuse them by later runs (default: a temporary directory)')
+    parser.add_argument('--json', type=str, metavar='FILE', help='Save the results as JSON file')
+
+    return parser
+
+
+def main():
+    args = _create_argument_parser().parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        corpus_directory = args.corpus_dir or temporary_directory
+        Path(corpus_directory).mkdir(parents=True, exist_ok=True)
+
+        # a fresh process per size, the peak memory is a property of the whole process
+        results = []
+        for nb_files in args.sizes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                results.append(executor.submit(benchmark_size, nb_files, args.jobs, corpus_directory,
+                                               args.seed).result())
+
+    _print_results(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
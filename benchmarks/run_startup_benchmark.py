@@ -0,0 +1,81 @@
+''' time the startup of the command line interface: printing the help and a --stream run of a small synthetic C++
+code base (see corpus_generator), each run in a fresh interpreter. The median wall time of each command and the heavy
+modules it imported (numpy, pandas, matplotlib) are reported, the exit code is 1 if a median exceeds the budget.
+
+    python benchmarks/run_startup_benchmark.py [--files N] [--runs N] [--budget SECONDS]
+'''
+import argparse
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIRECTORY))
+import corpus_generator
+
+
+# maximum median wall time (in seconds) of a command
+DEFAULT_BUDGET = .5
+
+# modules which are expensive to import, a command should only import those it needs
+HEAVY_MODULES = ['numpy', 'pandas', 'matplotlib']
+
+
+def _run_command(arguments):
+    ''' run the command line interface with the given arguments, return its wall time '''
+    start_time = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'scm_modules'] + arguments, cwd=str(ROOT_DIRECTORY), check=True,
+                   stdout=subprocess.DEVNULL)
+
+    return time.perf_counter() - start_time
+
+
+def _get_imported_heavy_modules(arguments):
+    ''' return the heavy modules imported by the command line interface run with the given arguments '''
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'scm_modules'] + arguments,
+                            cwd=str(ROOT_DIRECTORY), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            universal_newlines=True).stderr
+    imported_modules = {line.rsplit('|', 1)[-1].strip() for line in stderr.splitlines()}
+
+    return [module for module in HEAVY_MODULES if module in imported_modules]
+
+
+def _create_argument_parser():
+    parser = argparse.ArgumentParser(description='Benchmark the startup of the command line interface.')
+    parser.add_argument('--files', type=int, default=100, metavar='N', help='Number of files of the code base of ' +
+                        'the --stream run (default: 100)')
+    parser.add_argument('--runs', type=int, default=5, metavar='N', help='Number of runs of each command ' +
+                        '(default: 5)')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, metavar='SECONDS', help='Maximum median ' +
+                        'wall time of a command (default: {})'.format(DEFAULT_BUDGET))
+
+    return parser
+
+
+def main():
+    args = _create_argument_parser().parse_args()
+
+    with tempfile.TemporaryDirectory() as corpus_directory:
+        corpus_generator.generate_corpus(corpus_directory, corpus_generator.CorpusOptions(nb_files=args.files))
+        commands = {'help': ['-h'],
+                    'stream': ['-dp', corpus_directory, '-pl', 'c++', '--stream']}
+
+        print('{:<8} {:>12} {:>12}  {}'.format('command', 'median [s]', 'max [s]', 'heavy modules'))
+        exceeded = False
+        for name, arguments in commands.items():
+            wall_times = [_run_command(arguments) for _ in range(args.runs)]
+            median_time = statistics.median(wall_times)
+            exceeded |= median_time > args.budget
+            print('{:<8} {:>12.3f} {:>12.3f}  {}'.format(name, median_time, max(wall_times),
+                                                         ', '.join(_get_imported_heavy_modules(arguments)) or '-'))
+
+    if exceeded:
+        print('A command exceeded the budget of {} s'.format(args.budget), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,58 +1,345 @@
 import argparse
+import os
+import sys
+import time
 
-from scm_modules.metrics import main_sequence, distance_ia
-from scm_modules.utils import ProgrammingLanguageConfig
+# modules depending on numpy, pandas or matplotlib are imported by the functions using them, hence printing the help
+# does not load them and only plotting loads matplotlib
+from scm_modules.utils import AnalysisConfig, ComponentMapping, FileUtility, ParseCache, ProgrammingLanguageConfig
 
 
-def main():
-    # init parser
-    parser = argparse.ArgumentParser(description='Perform static code checks on a set of files.')
+# interval (in seconds) in which the figure processes events and the file watcher is asked for changes in watch mode,
+# the polling file watcher walks the directory only every poll interval of its own (see FileWatcher)
+WATCH_INTERVAL = 0.1
+
 
+def _add_analysis_arguments(parser):
+    ''' add the arguments needed to analyze a directory, shared by all applications '''
     # required arguments (directory to check, programming language)
     parser.add_argument('-dp', '--directory-path', type=str, required=True, help='Path to the directory which' +
                         'contains the files to check. All files from the provided directory will be checked recursively.')
     parser.add_argument('-pl', '--programming-language', type=str, required=True, help='Programming language ' +
                         'which is used in files to check. Currently only "c++" is supported.')
 
-    # either main-sequence or distance can be displayed
+    # optional argument to scan the files in parallel
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help='Number of processes used to parse ' +
+                        'the files (default: 1, 0: number of available cores)')
+
+    # optional arguments to resolve includes like the compiler does
+    parser.add_argument('-I', '--include-directory', type=str, action='append', default=[], metavar='DIR',
+                        dest='include_directories', help='Directory searched for included files (can be given ' +
+                        'several times)')
+    parser.add_argument('--compile-commands', type=str, metavar='PATH', help='Compilation database ' +
+                        '(compile_commands.json or the directory containing it): the include directories of each ' +
+                        'translation unit are used and only the translation units listed are checked')
+
+    # optional arguments to control the persistent parse cache
+    parser.add_argument('--cache', action='store_true', help='Use the persistent parse cache, which is stored in ' +
+                        'directory "{}": unchanged files are not parsed again by later runs'.format(
+                            ParseCache.DEFAULT_CACHE_DIRECTORY))
+    parser.add_argument('--clear-cache', action='store_true', help='Clear the persistent parse cache before ' +
+                        'checking the files')
+
+
+def _create_argument_parser():
+    # init parser
+    parser = argparse.ArgumentParser(description='Perform static code checks on a set of files. Run ' +
+                                     '"%(prog)s serve -h" to see the options of the metrics server.')
+    _add_analysis_arguments(parser)
+
+    # either main-sequence or distance can be displayed (or the results streamed)
     metrics_group = parser.add_mutually_exclusive_group(required=True)
     metrics_group.add_argument('-di', '--distance', action='store_true', help='Plot distance metric')
     metrics_group.add_argument('-ms', '--mainsequence', action='store_true', help='Plot Main Sequence')
+    metrics_group.add_argument('--stream', action='store_true', help='Write the results as JSON Lines to stdout ' +
+                               'instead of plotting them: one line per file as soon as it is parsed (its includes ' +
+                               'and classes), followed by one line of metrics per file (or component)')
+
+    # optional arguments to choose the view of the distance (the views of distance_ia.VIEWS, not imported to start fast)
+    parser.add_argument('--distance-view', type=str, default='files', choices=['files', 'top', 'histogram', 'components'],
+                        help='View of the distance: of each file (default), bars of the files with the largest ' +
+                        'distance, histogram or distribution per component (box plot)')
+    parser.add_argument('--top', type=int, default=30, metavar='N', help='Number of files shown by the top view and ' +
+                        'of components shown by the components view (default: 30)')
 
     # optional argument to save plotted metrics
     parser.add_argument('-s', '--save', action='store_true', help='If true, save metric(s).')
     parser.add_argument('-sp', '--save-path', type=str, help='Optional directory path where to save the metric-file(s)')
+    parser.add_argument('-o', '--output', type=str, metavar='FILE', help='Save all metrics and counts of each file ' +
+                        '(or component) to a single file, the format is given by its extension: csv, jsonl, parquet ' +
+                        'or arrow (the latter two require pyarrow). An existing file is replaced')
+    parser.add_argument('--condensation-out', type=str, metavar='PATH', help='Save the include cycles and the ' +
+                        'include graph between them (condensation) as JSON file')
+
+    # optional arguments to either update the plotted metrics on file changes or to render them without display
+    output_group = parser.add_mutually_exclusive_group()
+    output_group.add_argument('-w', '--watch', action='store_true', help='Keep running and update the plotted (and ' +
+                              'saved) metrics whenever code files change, until the figure is closed')
+    output_group.add_argument('--plot-out', type=str, action='append', metavar='FILE', dest='plot_files',
+                              help='Render the plot to the given file (png, svg, pdf, ...) instead of displaying it, ' +
+                              'no window is opened (can be given several times, the files are analyzed once)')
+
+    # optional arguments to compute the metrics per component instead of per file
+    components_group = parser.add_mutually_exclusive_group()
+    components_group.add_argument('--component-depth', type=int, metavar='N', help='Compute the metrics per ' +
+                                  'component, each directory up to depth N is a component')
+    components_group.add_argument('--component', type=str, action='append', metavar='NAME=PATTERN',
+                                  dest='component_rules', help='Compute the metrics per component, files matching ' +
+                                  'the glob pattern (or regular expression prefixed by "re:") belong to component ' +
+                                  'NAME, the first matching rule counts (can be given several times)')
+    components_group.add_argument('--cmake-targets', type=str, metavar='BUILD_DIR', help='Compute the metrics per ' +
+                                  'component, each CMake target is a component (read via the CMake file API)')
+
+    # optional arguments to find out which phase of a slow run is to blame
+    parser.add_argument('--profile', action='store_true', help='Print the wall and cpu time of each phase of the ' +
+                        'run (discovery, parsing, include graph, metrics, plotting, export, ...) and counters of the ' +
+                        'work done (files, bytes and lines read, regex evaluations, cells allocated) to stderr')
+    parser.add_argument('--profile-out', type=str, metavar='FILE', help='Save the statistics of the Python profiler ' +
+                        '(cProfile) of the run to the given file, to be analyzed by pstats or snakeviz')
+
+    # optional argument to scan only changed files
+    parser.add_argument('--since', type=str, metavar='REV', help='Only parse the files changed since the given git ' +
+                        'revision and patch the results of the previous run with --since, which has to be run at ' +
+                        'that revision (all files are parsed otw.). Enables the parse cache')
+
+    return parser
+
+
+def _create_serve_argument_parser():
+    from scm_modules.utils import MetricsServer
+
+    parser = argparse.ArgumentParser(prog='staticcodemetric serve', description='Run a metrics server which ' +
+                                     'scans the files once and answers queries via a JSON API.')
+    _add_analysis_arguments(parser)
+
+    # address of the server
+    parser.add_argument('--host', type=str, default=MetricsServer.DEFAULT_HOST, help='Host to listen on ' +
+                        '(default: {})'.format(MetricsServer.DEFAULT_HOST))
+    parser.add_argument('--port', type=int, default=MetricsServer.DEFAULT_PORT, help='Port to listen on ' +
+                        '(default: {})'.format(MetricsServer.DEFAULT_PORT))
+    parser.add_argument('--unix-socket', type=str, metavar='PATH', help='Listen on the given Unix socket instead ' +
+                        'of host and port')
+
+    return parser
+
+
+def _configure_analysis(args):
+    ''' set the programming language and the run-wide options given by the arguments '''
+    # set chosen programming language
+    ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE = args['programming_language']
+
+    # parse cache is used if enabled, patching the previous run (--since) requires its snapshot in the cache
+    if args['clear_cache']:
+        ParseCache.clear_cache(ParseCache.DEFAULT_CACHE_DIRECTORY)
+    if args['cache'] or args.get('since') is not None:
+        AnalysisConfig.PARSE_CACHE_DIRECTORY = ParseCache.DEFAULT_CACHE_DIRECTORY
+    AnalysisConfig.SINCE_REVISION = args.get('since')
+    AnalysisConfig.NUMBER_OF_JOBS = args['jobs']
+    AnalysisConfig.INCLUDE_DIRECTORIES = args['include_directories']
+    AnalysisConfig.COMPILATION_DATABASE = args['compile_commands']
+    AnalysisConfig.CONDENSATION_FILE = args.get('condensation_out')
+    AnalysisConfig.PROFILE = args.get('profile', False)
+
+
+def _create_component_mapping(args):
+    ''' return the component mapping given by the arguments, None if the metrics are computed per file '''
+    if args.get('component_depth') is not None:
+        return ComponentMapping.DirectoryComponents(args['component_depth'])
+    if args.get('component_rules'):
+        return ComponentMapping.RuleComponents([ComponentMapping.parse_component_rule(rule)
+                                                for rule in args['component_rules']])
+    if args.get('cmake_targets') is not None:
+        return ComponentMapping.load_cmake_targets(args['cmake_targets'], args['directory_path'])
+
+    return None
+
+
+def _serve(argv):
+    ''' scan the directory once and answer metric queries until interrupted '''
+    from scm_modules.utils import MetricsServer
+
+    args = vars(_create_serve_argument_parser().parse_args(argv))
+    _configure_analysis(args)
+
+    service = MetricsServer.MetricsService(args['directory_path'])
+    server = MetricsServer.create_server(service, args['host'], args['port'], args['unix_socket'])
+    address = args['unix_socket'] or 'http://{}:{}'.format(*server.server_address[:2])
+    print('Serving metrics of {} files on {} (press Ctrl+C to stop)..'.format(
+        service.get_index().get_number_of_files(), address))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args['unix_socket'] is not None and os.path.exists(args['unix_socket']):
+            os.remove(args['unix_socket'])
+
+
+def _watch(dir_path, redraw_metrics, save_metrics, per_file=False):
+    ''' keep the scanned files in memory and redraw (and save) the metrics whenever code files change. Changes are
+    detected by inotify (if available, polling otw.) and only changed files are scanned again. The metrics are
+    computed per file if desired, per component if a component mapping is configured otw. '''
+    import matplotlib.pyplot as plt
+
+    from scm_modules.utils import AnalysisSession, DataSeriesUtility, FileWatcher, SourceFileScanner
+
+    # the watcher is created before scanning, hence files changed while scanning are updated afterwards
+    file_watcher = FileWatcher.create_file_watcher(dir_path, SourceFileScanner.get_file_extensions())
+    session = AnalysisSession.AnalysisSession(dir_path, None if per_file else DataSeriesUtility.CONFIGURED_MAPPING)
+
+    try:
+        session.scan()
+        plt.ion()
+        redraw_metrics(session.get_metrics_frame())
+        save_metrics()
+        print('Watching {} for changes (close the figure or press Ctrl+C to stop)..'.format(dir_path or '.'))
+
+        while plt.get_fignums():
+            start_time = time.perf_counter()
+            if session.update_changed_files(file_watcher):
+                redraw_metrics(session.get_metrics_frame())
+                save_metrics()
+                print('Metrics updated in {:.0f} ms'.format((time.perf_counter() - start_time) * 1000))
+
+            plt.pause(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        file_watcher.close()
+
+
+def _run_distance(dir_path, save_metric, save_metric_path, output_file, watch, plot_files, view, top_n):
+    from scm_modules.metrics import distance_ia
+
+    # the components view groups the distance of the files by component, the files are not replaced by components
+    per_file = view == distance_ia.COMPONENTS_VIEW
+    dist = distance_ia.DistanceIA(dir_path, view, top_n, AnalysisConfig.COMPONENT_MAPPING if per_file else None)
+
+    def save_distance():
+        # save metric if desired
+        if save_metric:
+            dist.save_metric(save_metric_path if save_metric_path is not None else '')
+        if output_file is not None:
+            dist.export_metrics(output_file)
+
+    if plot_files:
+        for plot_file in plot_files:
+            dist.save_plot(plot_file)
+        save_distance()
+    elif watch:
+        _watch(dir_path, dist.redraw_distance, save_distance, per_file)
+    else:
+        dist.plot_distance()
+        save_distance()
+
+
+def _run_main_sequence(dir_path, save_metric, save_metric_path, output_file, watch, plot_files):
+    from scm_modules.metrics import main_sequence
+
+    main_seq = main_sequence.MainSequence(dir_path)
+
+    def save_main_sequence():
+        # save metric if desired
+        if save_metric:
+            main_seq.save_metrics(save_metric_path if save_metric_path is not None else '')
+        if output_file is not None:
+            main_seq.export_metrics(output_file)
+
+    if plot_files:
+        for plot_file in plot_files:
+            main_seq.save_plot(plot_file)
+        save_main_sequence()
+    elif watch:
+        _watch(dir_path, main_seq.redraw_metrics, save_main_sequence)
+    else:
+        main_seq.plot_metrics()
+        save_main_sequence()
+
+
+def _run_stream(dir_path, output_file):
+    from scm_modules.utils import MetricsStream
+
+    try:
+        names, columns = MetricsStream.stream_metrics(dir_path, sys.stdout)
+    except BrokenPipeError:
+        # the consumer stopped reading (e.g. head), stdout is redirected to not fail again when it is flushed at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+
+    if output_file is not None:
+        FileUtility.save_metrics_to_file(names, columns, output_file)
+
+
+def _run_profiled(run_application, profile_file):
+    ''' run the application, profiled by cProfile if a file for its statistics is given. If profiling is enabled in
+    AnalysisConfig, the phases and counters are printed afterwards (to stderr, stdout might be a stream of results) '''
+    import cProfile
+
+    profiler = None if profile_file is None else cProfile.Profile()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        run_application()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_file)
+
+    if AnalysisConfig.PROFILE:
+        from scm_modules.utils import Profiler
+        print(Profiler.format_report(), file=sys.stderr)
+
+
+def main():
+    # the metrics server is a sub-command with its own arguments
+    if sys.argv[1:2] == ['serve']:
+        _serve(sys.argv[2:])
+        return
 
     # parse arguments
+    parser = _create_argument_parser()
     args = vars(parser.parse_args())
 
     # extract given arguments
     dir_path = args['directory_path']
-    prog_lang = args['programming_language']
     show_distance = args['distance']
     show_main_sequence = args['mainsequence']
     save_metric = args['save']
     save_metric_path = args['save_path']
+    output_file = args['output']
+    watch = args['watch']
+    plot_files = args['plot_files']
 
-    # set chosen programming language
-    ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE = prog_lang
+    # set chosen programming language and options of the analysis
+    _configure_analysis(args)
+    try:
+        AnalysisConfig.COMPONENT_MAPPING = _create_component_mapping(args)
+    except ComponentMapping.ComponentMappingError as ex:
+        parser.error(str(ex))
+
+    # fail before the analysis if the metrics cannot be exported
+    if output_file is not None:
+        try:
+            FileUtility.get_export_format(output_file)
+        except FileUtility.ExportError as ex:
+            parser.error(str(ex))
 
     # start respective application
-    if show_distance:
-        dist = distance_ia.DistanceIA(dir_path)
-        dist.plot_distance()
+    def run_application():
+        if show_distance:
+            _run_distance(dir_path, save_metric, save_metric_path, output_file, watch, plot_files,
+                          args['distance_view'], args['top'])
 
-        # save metric if desired
-        if save_metric:
-            dist.save_metric(save_metric_path if save_metric_path is not None else '')
+        elif show_main_sequence:
+            _run_main_sequence(dir_path, save_metric, save_metric_path, output_file, watch, plot_files)
 
-    elif show_main_sequence:
-        main_seq = main_sequence.MainSequence(dir_path)
-        main_seq.plot_metrics()
+        else:
+            _run_stream(dir_path, output_file)
 
-        # save metric if desired
-        if save_metric:
-            main_seq.save_metrics(save_metric_path if save_metric_path is not None else '')
+    _run_profiled(run_application, args['profile_out'])
 
 
 if __name__ == '__main__':
@@ -1,94 +1,68 @@
+import numpy as np
 import pandas as pd
-import re
 import warnings
 
-from scm_modules.utils import FileUtility, ProgrammingLanguageConfig
+from scm_modules.utils import AnalysisConfig, FileMetrics, FileUtility, MetricKernels, ProgrammingLanguageConfig, \
+    SourceFileScanner
 
 
 class AbstractnessMetric:
-    def __init__(self, dir_path):
+    def __init__(self, dir_path, file_records=None, jobs=None):
         self._dir_path = dir_path
         self._interface_class_matrix = pd.DataFrame(index=['N_a', 'N_c'], dtype=int)
         self._list_of_files = []
 
-    def _get_number_of_interfaces_and_classes_of_file(self, file_path):  # noqa: C901
+        # already scanned files (e.g. shared with the instability metric), each file is read at most once
+        self._provided_file_records = file_records
+        self._file_records = {record.file_path: record for record in file_records or []}
+
+        # number of processes scanning the files if no file records are provided (see SourceFileScanner)
+        self._jobs = AnalysisConfig.NUMBER_OF_JOBS if jobs is None else jobs
+
+    def _get_number_of_interfaces_and_classes_of_file(self, file_path):
         ''' return the number of interfaces or classes present in given file.
         In C++, interfaces/abstract classes are defined using the virtual-keyword and/or one or more
         method equal to 0 (virtual void methodX() = 0;
         Info: an interface/abstract class also counts to the total amount of classes '''
-        nb_interfaces = 0
-        nb_classes = 0
-        class_definition_found = False
-        counter_namespaces = 0
-        counter_curly_braces = 0
+        # scan the file only if it was not already scanned before
+        if file_path not in self._file_records:
+            self._file_records[file_path] = SourceFileScanner.scan_file(file_path)
 
-        try:
-            with open(file_path, 'r') as file:
-                for line in file:
-                    # increment / decrement counter for curly braces
-                    if '{' in line:
-                        counter_curly_braces += 1
-
-                    if '}' in line:
-                        counter_curly_braces -= 1
-                        # check for end of class and reset flag
-                        if counter_curly_braces == counter_namespaces:
-                            class_definition_found = False
-
-                    # find namespace
-                    if re.match(ProgrammingLanguageConfig.get_namespace_identifier(), line):
-                        counter_namespaces += 1
-
-                    # find class
-                    if re.match(ProgrammingLanguageConfig.get_class_identifier(), line):
-                        # indicate inside class definition
-                        class_definition_found = True
-                        nb_classes += 1
-
-                    # find one abstract method
-                    if class_definition_found:
-                        if re.match(ProgrammingLanguageConfig.get_abstract_method_identifier(), line):
-                            # one virtual = 0 method is sufficient for an abstract class
-                            nb_interfaces += 1
-                            class_definition_found = False
-
-        except FileNotFoundError as ex:
-            warnings.warn('{} ...returning default values'.format(ex))
-        except ProgrammingLanguageConfig.LanguageOptionError as ex:
-            warnings.warn(ex.args)
+        file_record = self._file_records[file_path]
+
+        return file_record.nb_interfaces, file_record.nb_classes
 
-        return nb_interfaces, nb_classes
+    def _scan_files(self):
+        ''' scan the files not scanned yet at once, in parallel if more than one job is given '''
+        files_to_scan = [file_path for file_path in self._list_of_files if file_path not in self._file_records]
+        self._file_records.update(zip(files_to_scan, SourceFileScanner.iterate_scanned_files(
+            files_to_scan, [True] * len(files_to_scan), jobs=self._jobs)))
 
     def _search_files_for_interfaces(self):
-        ''' iterate through all files and get their interfaces / abstract class definitons '''
-        for file in self._list_of_files:
-            nb_interfaces, nb_classes = self._get_number_of_interfaces_and_classes_of_file(file)
+        ''' iterate through all files and get their interfaces / abstract class definitons. The counts are collected
+        per file (path relative to the analyzed directory, see FileMetrics.count_interfaces_and_classes) first and the
+        matrix is built at once (a file appearing twice keeps its first position and its last counts) '''
+        counts_of_files = FileMetrics.count_interfaces_and_classes(self._dir_path, [
+            SourceFileScanner.FileRecord(file, [], [], *self._get_number_of_interfaces_and_classes_of_file(file))
+            for file in self._list_of_files])
 
-            # add amount of interfaces and classes to matrix
-            self._interface_class_matrix[FileUtility.extract_filename(file)] = [nb_interfaces, nb_classes]
+        # one column per file, rows N_a and N_c
+        counts = np.array(list(counts_of_files.values()), dtype=int).reshape(-1, 2).T
+        self._interface_class_matrix = pd.DataFrame(counts, index=['N_a', 'N_c'], columns=list(counts_of_files))
 
     def _calculate_abstractness_for_each_file(self):
         ''' calculate the abstractness metric using A = Na / Nc:
         0 -> no abstract classes, 1 -> only abstract classes.
         info: since it might be possible that some files do not contain any class definition at all
-        each division checks for a division through zero '''
+        a division through zero results in 0 '''
         n_a = self._interface_class_matrix.loc['N_a', :]
         n_c = self._interface_class_matrix.loc['N_c', :]
 
-        # copy to get names in actual order, rename resulting array and change it's type accordingly
-        a = n_a
-        a = a.rename(index='Abstractness-Metric')
-        a = a.astype(float)
-
-        # compute abstractness metric for each row
-        for index in range(len(n_a)):
-            # prevent division through 0
-            if n_c[index] == 0:
-                a[index] = 0
-            else:
-                a[index] = n_a[index] / n_c[index]
+        # compute abstractness metric for all rows at once (division through 0 results in 0)
+        a = MetricKernels.compute_abstractness(n_a.values, n_c.values)
 
-        return a
+        # use names in actual order of the matrix
+        return pd.Series(a, index=n_a.index, name='Abstractness-Metric', dtype=float)
 
     def compute_abstractness(self):
         ''' encapsulate all methods necessary to compute the abstractness values for each file:
@@ -101,7 +75,12 @@ class AbstractnessMetric:
         except ProgrammingLanguageConfig.LanguageOptionError as ex:
             warnings.warn(ex.args)
 
-        self._list_of_files = FileUtility.get_all_code_files(self._dir_path, allowed_file_extensions)
+        if self._provided_file_records is None:
+            self._list_of_files = FileUtility.get_all_code_files(self._dir_path, allowed_file_extensions)
+            self._scan_files()
+        else:
+            self._list_of_files = [record.file_path for record in self._provided_file_records
+                                   if FileUtility.has_file_extension(record.file_path, allowed_file_extensions)]
         self._search_files_for_interfaces()
         abstractness_metric = self._calculate_abstractness_for_each_file()
 
@@ -1,48 +1,174 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
-from scm_modules.utils import DataSeriesUtility, FileUtility
+from scm_modules.utils import ComponentMapping, ComponentMetrics, DataSeriesUtility, FileUtility, MetricKernels, \
+    MetricsFrame, Profiler
+
+
+# views of the distance: of each file, of the files with the largest distance, histogram, distribution per component
+FILES_VIEW = 'files'
+TOP_VIEW = 'top'
+HISTOGRAM_VIEW = 'histogram'
+COMPONENTS_VIEW = 'components'
+VIEWS = [FILES_VIEW, TOP_VIEW, HISTOGRAM_VIEW, COMPONENTS_VIEW]
+
+# number of files (or components) shown by the top view and the components view
+DEFAULT_TOP_N = 30
+
+# maximum number of files (or components) labeled by the files view, larger numbers are labeled by their position
+MAX_LABELED_FILES = 200
+
+# number of bins of the histogram
+HISTOGRAM_BINS = 20
 
 
 class DistanceIA:
-    def __init__(self, dir_path):
+    def __init__(self, dir_path, view=FILES_VIEW, top_n=DEFAULT_TOP_N, component_mapping=None, metrics_frame=None):
+        # the metrics are computed when needed, unless already computed ones are given
         self._dir_path = dir_path
-        self._instability_metric = None
-        self._abstractness_metric = None
+        self._metrics_frame = metrics_frame
         self._distance = None
 
+        # the components view groups the files by the given component mapping (top-level directories by default)
+        self._view = view
+        self._top_n = top_n
+        self._component_mapping = component_mapping or ComponentMapping.DirectoryComponents(1)
+
+    def _get_metrics_frame(self):
+        ''' analyze the directory, the components view groups the metrics of the files by itself '''
+        if self._view == COMPONENTS_VIEW:
+            return DataSeriesUtility.get_metrics_frame(self._dir_path, component_mapping=None)
+
+        return DataSeriesUtility.get_metrics_frame(self._dir_path)
+
     def _calculate_distance(self):
         ''' calculates the distance between Abstractness and Instability of each file/component using
         D = |A+I-1|, with D being in range [0;1] with a
         ...D of 0 indicating that the corresponding file/component lies on the Main Sequence
-        ...D of 1 indicating that the corresponding file/component lies far away from the Main Sequence '''
-        self._distance = abs(self._abstractness_metric + self._instability_metric - 1)
+        ...D of 1 indicating that the corresponding file/component lies far away from the Main Sequence
+        The distance is already part of the metrics frame, it is named as required for saving it to a file '''
+        self._distance = MetricsFrame.get_distance_metric(self._metrics_frame)
+
+    def _compute_missing_distance(self):
+        ''' compute the metrics of the directory and the distance, unless already done '''
+        if self._distance is None:
+            if self._metrics_frame is None:
+                self._metrics_frame = self._get_metrics_frame()
+            self._calculate_distance()
+
+    def _draw_files(self, ax):
+        ''' draw the distance of each file/component, labeled by its name unless there are too many of them '''
+        ind = np.arange(self._distance.size)
+
+        # x = files/components, y = distance
+        ax.plot(ind, self._distance, marker='x', linestyle='None')
+        if self._distance.size <= MAX_LABELED_FILES:
+            ax.set_xticks(ind)
+            ax.set_xticklabels(self._metrics_frame.index, rotation=45, ha='right')
+        ax.set_ylabel('[D]istance', fontsize=18)
+
+    def _draw_top(self, ax):
+        ''' draw the distance of the files/components with the largest distance as horizontal bars, the largest on top '''
+        top_indices = MetricKernels.get_top_indices(self._distance.values, self._top_n)
+        positions = np.arange(top_indices.size)[::-1]
+
+        ax.barh(positions, self._distance.values[top_indices])
+        ax.set_yticks(positions)
+        ax.set_yticklabels(self._metrics_frame.index[top_indices])
+        ax.set_xlim((0, 1))
+        ax.set_xlabel('[D]istance', fontsize=18)
+
+    def _draw_histogram(self, ax):
+        ''' draw the number of files/components per range of the distance '''
+        counts, edges = np.histogram(self._distance.values, bins=HISTOGRAM_BINS, range=(0, 1))
+
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='white')
+        ax.set_xlim((0, 1))
+        ax.set_xlabel('[D]istance', fontsize=18)
+        ax.set_ylabel('Number of files', fontsize=18)
 
-        # provide a name to data series required for saving it to a file
-        self._distance = self._distance.rename('Distance_IA')
+    def _draw_components(self, ax):
+        ''' draw the distribution (box plot: quartiles, whiskers at the minimum and maximum) of the distance of the
+        files of each component. The statistics are computed for all components at once, only the components with
+        the largest median are drawn if there are too many of them '''
+        component_names, file_components = \
+            ComponentMetrics.get_file_components(self._metrics_frame.index, self._component_mapping)
+        in_component = file_components != ComponentMetrics.NO_COMPONENT
+        statistics = MetricKernels.compute_group_quantiles(self._distance.values[in_component],
+                                                           file_components[in_component], len(component_names),
+                                                           [0, .25, .5, .75, 1])
+
+        top_components = MetricKernels.get_top_indices(statistics[2], self._top_n)
+        ax.bxp([{'label': component_names[component], 'whislo': low, 'q1': q1, 'med': median, 'q3': q3,
+                 'whishi': high} for component, (low, q1, median, q3, high) in
+                zip(top_components, statistics[:, top_components].T)], showfliers=False)
+        ax.set_ylim((0, 1))
+        ax.set_ylabel('[D]istance', fontsize=18)
+        ax.tick_params(axis='x', labelrotation=45)
+
+    def _draw_distance(self, ax=None):
+        ''' draw the view of the distance into the given axes (current axes by default). Apart from the files view,
+        the views are computed from the distance of all files at once and label a bounded number of files '''
+        if ax is None:
+            # pyplot (and its backend) is only imported to display the diagram, saving it renders without pyplot
+            import matplotlib.pyplot as plt
+            ax = plt.gca()
+
+        draw_view = {FILES_VIEW: self._draw_files, TOP_VIEW: self._draw_top, HISTOGRAM_VIEW: self._draw_histogram,
+                     COMPONENTS_VIEW: self._draw_components}[self._view]
+        with Profiler.phase(Profiler.PLOTTING):
+            draw_view(ax)
 
     def plot_distance(self):
         ''' show a diagram picturing the distance in each components, where
         - y-axis denotes the distance
         - x-axis denotes the different files/components '''
-        self._instability_metric, self._abstractness_metric = \
-            DataSeriesUtility.get_instability_and_abstractness_metric(self._dir_path)
-        self._calculate_distance()
+        with Profiler.phase(Profiler.IMPORTS):
+            import matplotlib.pyplot as plt
 
-        ind = np.arange(self._distance.size)
+        # if not already computed get metrics
+        if self._metrics_frame is None:
+            self._metrics_frame = self._get_metrics_frame()
+        self._calculate_distance()
 
-        # x = files/components, y = distance
-        plt.plot(ind, self._distance, marker='x', linestyle='None')
-        plt.xticks(ind, self._instability_metric.index, rotation=45, ha='right')
-        plt.ylabel('[D]istance', fontsize=18)
+        self._draw_distance()
 
         plt.show()
 
+    def save_plot(self, file_path):
+        ''' render the diagram picturing the distance (see plot_distance) without displaying it and save it to the
+        given file (format given by its extension, e.g. png, svg, pdf) '''
+        # if not already computed get distance
+        self._compute_missing_distance()
+
+        FileUtility.save_plot_to_file(self._draw_distance, file_path)
+
+    def redraw_distance(self, metrics_frame):
+        ''' replace the diagram of the current figure by one picturing the distance of the given metrics frame, e.g.
+        after files changed '''
+        import matplotlib.pyplot as plt
+
+        self._metrics_frame = metrics_frame
+        self._calculate_distance()
+
+        fig = plt.gcf()
+        fig.clf()
+        self._draw_distance()
+        fig.canvas.draw_idle()
+
     def save_metric(self, dir_path=''):
         ''' save distance metric to directory. If provided use user-defined directory '''
         # if not already computed get distance
-        if self._distance is None:
-            self._calculate_distance()
+        self._compute_missing_distance()
+
+        # save it with the include cycle of the files
+        FileUtility.save_metric_to_file(self._distance, dir_path,
+                                        additional_columns=MetricsFrame.get_cycle_membership(self._metrics_frame))
+
+    def export_metrics(self, file_path):
+        ''' save all metrics and counts of each file (or component) to a single file, whose extension determines the
+        format (csv, jsonl, parquet, arrow) '''
+        # if not already computed get metrics
+        if self._metrics_frame is None:
+            self._metrics_frame = self._get_metrics_frame()
 
-        # save it
-        FileUtility.save_metric_to_file(self._distance, dir_path)
+        FileUtility.save_metrics_frame_to_file(self._metrics_frame, file_path)
@@ -1,125 +1,74 @@
-import numpy as np
 import pandas as pd
-from pathlib import Path
 import warnings
 
-from scm_modules.utils import FileUtility, ProgrammingLanguageConfig
+from scm_modules.utils import AnalysisConfig, FileMetrics, FileUtility, IncludeGraph, MetricKernels, \
+    ProgrammingLanguageConfig, SourceFileScanner
 
 
 class InstabilityMetric:
-    def __init__(self, dir_path):
+    def __init__(self, dir_path, file_records=None, jobs=None):
         self._dir_path = dir_path
         self._list_of_user_files = []
-        self._include_matrix = pd.DataFrame()
+        self._include_graph = IncludeGraph.IncludeGraph()
+        self._nb_user_file_nodes = 0
+
+        # already scanned files (e.g. shared with the abstractness metric), each file is read at most once
+        self._provided_file_records = file_records
+        self._file_records = {record.file_path: record for record in file_records or []}
+
+        # number of processes scanning the files if no file records are provided (see SourceFileScanner)
+        self._jobs = AnalysisConfig.NUMBER_OF_JOBS if jobs is None else jobs
 
     def _get_includes_of_file(self, file_path):
         ''' return the files included with #include "..." and #include <...> in provided file
         in two separated arrays, one for user-includes and one for stl-includes '''
-        user_include_list = []
-        stl_include_list = []
-
-        try:
-            with open(file_path, 'r') as file:
-                for line in file:
-                    if line.startswith(ProgrammingLanguageConfig.get_prefix_user_include_identifier()):
-                        # ignore ending " to get the pure filename
-                        include_filename = \
-                            line[len(ProgrammingLanguageConfig.get_prefix_user_include_identifier()):].strip()[:-1]
-                        # use filename (incl. extension) only, e.g. transform domain/namespace/header.hpp to header.hpp
-                        include_filename = Path(include_filename).name
-                        user_include_list.append(include_filename)
-                    elif line.startswith(ProgrammingLanguageConfig.get_prefix_standard_include_identifier()):
-                        # ignore ending > to get the pure filename
-                        include_filename = \
-                            line[len(ProgrammingLanguageConfig.get_prefix_standard_include_identifier()):].strip()[:-1]
-                        # use filename (incl. extension) only, e.g. transform domain/namespace/header.hpp to header.hpp
-                        include_filename = Path(include_filename).name
-                        stl_include_list.append(include_filename)
-
-        except FileNotFoundError as ex:
-            warnings.warn('{} ...returning default values'.format(ex))
-        except ProgrammingLanguageConfig.LanguageOptionError as ex:
-            warnings.warn(ex.args)
-
-        return user_include_list, stl_include_list
-
-    def _create_user_include_matrix(self):
-        ''' create a 2D matrix with dim = m x m, where m is the number of user-included files '''
-        m = len(self._list_of_user_files)
-        null_matrix = np.zeros((m, m), dtype=int)
-        names = [FileUtility.extract_filename(filepath) for filepath in self._list_of_user_files]
-        self._include_matrix = pd.DataFrame(null_matrix, index=names, columns=names)
+        # scan the file only if it was not already scanned before
+        if file_path not in self._file_records:
+            self._file_records[file_path] = SourceFileScanner.scan_file(file_path, count_classes=False)
 
-    def _fill_include_matrix(self):
-        ''' fill matrix by setting matrix[x,y] to 1 if x includes y for all user-included files, which
-        are indicated by #include "...". Additonally, stl-included files are also handled '''
-        # check includes
-        for filepath in self._list_of_user_files:
-            # get filename which includes the following files
-            including_file = FileUtility.extract_filename(filepath)
+        file_record = self._file_records[file_path]
 
-            # get list of user-includes
-            user_includes, stl_includes = self._get_includes_of_file(filepath)
+        return list(file_record.user_includes), list(file_record.stl_includes)
 
-            # #include "..." usage, fill 1 if needed (row=including_file, column=user_included_file)
-            for user_included_file in user_includes:
-                self._include_matrix.at[including_file, user_included_file] = 1
+    def _scan_user_files(self):
+        ''' scan the user-files not scanned yet at once, in parallel if more than one job is given '''
+        files_to_scan = [file_path for file_path in self._list_of_user_files if file_path not in self._file_records]
+        self._file_records.update(zip(files_to_scan, SourceFileScanner.iterate_scanned_files(
+            files_to_scan, [False] * len(files_to_scan), jobs=self._jobs)))
 
-            # #include <...> usage, fill 1 if needed (row=including_file, column=stl_included_file)
-            for stl_included_file in stl_includes:
-                self._include_matrix.at[including_file, stl_included_file] = 1
-
-    def _add_stl_includes(self):
-        ''' In order to be able to handle included stl-files, each time an including_file includes stl-files
-        (indicated by #include <...>), they are added to a member-list '''
-        self._list_of_stl_libs = []
-
-        # check includes
-        for filepath in self._list_of_user_files:
-            # get list of stl-includes
-            _, stl_includes = self._get_includes_of_file(filepath)
-
-            # #include <...> usage, add stl-files to global list
-            for stl_included_file in stl_includes:
-                self._list_of_stl_libs.append(stl_included_file)
-
-        # remove duplicates of global stl-files list
-        self._list_of_stl_libs = list(set(self._list_of_stl_libs))
-
-        for stl_included_file in self._list_of_stl_libs:
-            self._include_matrix.loc[:, stl_included_file] = pd.Series(np.zeros(len(self._include_matrix.index)), dtype=int)
+    def _create_include_graph(self):
+        ''' create the include-graph of the user-files (see FileMetrics.create_include_graph): one node for each
+        user-file, identified by its path relative to the analyzed directory, and an edge x -> y if x includes y.
+        Nodes of user-files are added first, hence they have the ids 0...m-1, where m is the number of user-files,
+        followed by the included files which are not resolved to a user-file (e.g. stl-includes) '''
+        file_records = [SourceFileScanner.FileRecord(filepath, *self._get_includes_of_file(filepath), 0, 0)
+                        for filepath in self._list_of_user_files]
+        self._include_graph, self._nb_user_file_nodes = FileMetrics.create_include_graph(self._dir_path, file_records)
 
     def _get_all_fan_in(self):
-        ''' uses provided data frame to evaluate the fan-in's of each file (:= #1's in row) '''
-        return np.sum(self._include_matrix, axis=1)
+        ''' uses the include-graph to evaluate the fan-in's of each user-file (:= #files included by the file) '''
+        names = self._include_graph.get_node_names()[:self._nb_user_file_nodes]
+        fan_in = self._include_graph.get_out_degrees()[:self._nb_user_file_nodes]
+
+        return pd.Series(fan_in, index=names, dtype=int)
 
     def _get_all_fan_out(self):
-        ''' uses provided data frame to evaluate the fan-out's of each file (:= #1's in column) '''
-        return np.sum(self._include_matrix, axis=0)
+        ''' uses the include-graph to evaluate the fan-out's of each file (:= #files including the file) '''
+        return pd.Series(self._include_graph.get_in_degrees(), index=self._include_graph.get_node_names(), dtype=int)
 
     def _calculate_instability_for_each_file(self):
         ''' calculate the instability metric using I = fan_out / (fan_in + fan_out):
         1 -> unstable, 0 -> stable.
-        info: fan_in might contain less values than fan_out due to the included stl-files, and hence
-        each row has its counterpart in the columns for shape m x m, if index(column) > m the symmetry
-        broken '''
+        info: fan_in might contain less values than fan_out due to the included stl-files, the first m
+        entries of fan_out belong to the m user-files '''
         fan_in = self._get_all_fan_in()
         fan_out = self._get_all_fan_out()
 
-        # copy to get names in actual order
-        i = fan_in
-        i = i.rename(index='Instability-Metric')
-        i = i.astype(float)
-
-        # compute instability metric for each row
-        for index in range(len(fan_in)):
-            # prevent division through 0
-            if fan_out[index] == 0 and fan_in[index] == 0:
-                i[index] = 0
-            else:
-                i[index] = fan_out[index] / (fan_in[index] + fan_out[index])
+        # compute instability metric for all rows at once (division through 0 results in 0)
+        i = MetricKernels.compute_instability(fan_in.values, fan_out.values[:len(fan_in)])
 
-        return i
+        # use names in actual order of fan_in
+        return pd.Series(i, index=fan_in.index, name='Instability-Metric', dtype=float)
 
     def compute_instability(self):
         ''' encapsulate all methods necessary to compute the instability values for each component '''
@@ -129,10 +78,13 @@ class InstabilityMetric:
         except ProgrammingLanguageConfig.LanguageOptionError as ex:
             warnings.warn(ex.args)
 
-        self._list_of_user_files = FileUtility.get_all_code_files(self._dir_path, allowed_file_extensions)
-        self._create_user_include_matrix()
-        self._add_stl_includes()
-        self._fill_include_matrix()
+        if self._provided_file_records is None:
+            self._list_of_user_files = FileUtility.get_all_code_files(self._dir_path, allowed_file_extensions)
+            self._scan_user_files()
+        else:
+            self._list_of_user_files = [record.file_path for record in self._provided_file_records
+                                        if FileUtility.has_file_extension(record.file_path, allowed_file_extensions)]
+        self._create_include_graph()
         instability_metric = self._calculate_instability_for_each_file()
 
         return instability_metric
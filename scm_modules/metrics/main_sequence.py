@@ -1,77 +1,70 @@
-import matplotlib.pyplot as plt
-import numpy as np
+from matplotlib.patches import Circle
 import warnings
 
-from scm_modules.utils import DataSeriesUtility, FileUtility
+from scm_modules.utils import DataSeriesUtility, FileUtility, MetricsFrame, PointIndex, Profiler
 
 
-class MainSequence:
-    def __init__(self, dir_path):
-        self._dir_path = dir_path
-        self._annotation_points = []
-        self._last_hov_anno_index = -1
-        self._instability_metric = None
-        self._abstractness_metric = None
+# number of points above which the density of the points (hexagonal bins) is drawn instead of the single points
+DENSITY_THRESHOLD = 20000
 
-    def _annotate_point(self, event, sc):  # noqa: C901
-        ''' displays a text, if a user hovers over a point with the mouse '''
-        fig = plt.gcf()
-        visibility_changed = False
-
-        if event.inaxes == plt.gca():
-            anno_visible, ind = sc.contains(event)
-            ind_array = ind['ind']
-
-            # check if not hovering over a point (empty index list)
-            if ind_array.size == 0:
-                for annotation in self._annotation_points:
-                    # make sure every annotation is invisible
-                    if annotation.get_visible():
-                        annotation.set_visible(False)
-                        visibility_changed = True
-
-            # only one annotation available
-            elif ind_array.size == 1:
-                if not self._annotation_points[ind_array[0]].get_visible():
-                    self._annotation_points[ind_array[0]].set_visible(True)
-                    visibility_changed = True
-
-            # more than one annotation available (display only one)
-            else:
-                # again hovered over the same summary of points
-                if self._last_hov_anno_index in ind_array:
-                    # do not change annotation if mouse still is on point
-                    if self._annotation_points[self._last_hov_anno_index].get_visible():
-                        return
+# number of hexagons in x-direction of the density
+DENSITY_GRID_SIZE = 60
 
-                    # get array index and increment it
-                    arr_ind, = np.where(ind_array == self._last_hov_anno_index)
-                    next_arr_ind = arr_ind[0] + 1
+# distance (in pixels) up to which a point is annotated if the mouse hovers over the diagram
+PICK_RADIUS = 5
 
-                    # start from beginning if end of array indices is reached
-                    if next_arr_ind == ind_array.size:
-                        next_arr_ind = 0
+# maximum number of names shown by the annotation if several points are close to the mouse
+MAX_ANNOTATED_NAMES = 5
 
-                    # map array index to annotation index
-                    anno_ind = ind_array[next_arr_ind]
 
-                    # set respective annotation visible
-                    self._annotation_points[anno_ind].set_visible(True)
-                    visibility_changed = True
-                    self._last_hov_anno_index = anno_ind
+class MainSequence:
+    def __init__(self, dir_path, metrics_frame=None):
+        # the metrics are computed when needed, unless already computed ones are given
+        self._dir_path = dir_path
+        self._metrics_frame = metrics_frame
+        self._point_index = None
+        self._annotation = None
+        self._annotated_points = ()
+        self._motion_callback_id = None
+
+    def _get_annotation_text(self, points):
+        ''' return the names of the given points (the first ones only if there are too many) '''
+        names = list(self._metrics_frame.index[list(points[:MAX_ANNOTATED_NAMES])])
+        if len(points) > MAX_ANNOTATED_NAMES:
+            names.append('... ({} more)'.format(len(points) - MAX_ANNOTATED_NAMES))
+
+        return '\n'.join(names)
+
+    def _annotate_point(self, event, ax):
+        ''' displays the name of the file(s) next to the mouse in a single annotation, if a user hovers over points.
+        The points close to the mouse are looked up in the point index, hence hovering does not depend on the number
+        of points '''
+        annotated_points = ()
+        if event.inaxes is ax and event.xdata is not None:
+            # pick radius in data coordinates
+            (x0, y0), (x1, y1) = ax.transData.inverted().transform([(0, 0), (PICK_RADIUS, PICK_RADIUS)])
+            annotated_points = tuple(self._point_index.query(event.xdata, event.ydata, abs(x1 - x0), abs(y1 - y0)))
+
+        # the diagram is only drawn again if the annotation changes
+        if annotated_points == self._annotated_points:
+            return
+        self._annotated_points = annotated_points
 
-                # hovered over another summary of points
-                else:
-                    self._annotation_points[ind_array[0]].set_visible(True)
-                    visibility_changed = True
-                    self._last_hov_anno_index = ind_array[0]
+        if annotated_points:
+            nearest_point = annotated_points[0]
+            self._annotation.xy = (self._metrics_frame[MetricsFrame.INSTABILITY].values[nearest_point],
+                                   self._metrics_frame[MetricsFrame.ABSTRACTNESS].values[nearest_point])
+            self._annotation.set_text(self._get_annotation_text(annotated_points))
+        self._annotation.set_visible(bool(annotated_points))
 
-        if visibility_changed:
-            fig.canvas.draw_idle()
+        ax.figure.canvas.draw_idle()
 
-    def _layout_ax(self):
-        ''' creates and returns the basic layout of the diagram displayed '''
-        ax = plt.gca()
+    def _layout_ax(self, ax=None):
+        ''' creates and returns the basic layout of the diagram displayed (in the current axes by default) '''
+        if ax is None:
+            # pyplot (and its backend) is only imported to display the diagram, saving it renders without pyplot
+            import matplotlib.pyplot as plt
+            ax = plt.gca()
 
         # x/y range from 0 to 1
         ax.set_xlim((0, 1))
@@ -81,11 +74,11 @@ class MainSequence:
         ax.plot([0, 1], [1, 0], marker='x', color='red')
 
         # zone of pain
-        ax.add_artist(plt.Circle((0, 0), .5, alpha=.3, color='r'))
+        ax.add_artist(Circle((0, 0), .5, alpha=.3, color='r'))
         ax.annotate("Zone of Pain", xy=(.1, .2), fontsize=10)
 
         # zone of uselessness
-        ax.add_artist(plt.Circle((1, 1), .5, alpha=.3, color='r'))
+        ax.add_artist(Circle((1, 1), .5, alpha=.3, color='r'))
         ax.annotate("Zone of Uselessness", xy=(.65, .8), fontsize=10)
 
         # label x and y
@@ -94,48 +87,110 @@ class MainSequence:
 
         return ax
 
-    def _define_motion_annotation_callback(self, sc):
-        ''' fill displayed diagram with a mouse-event to show annotations within it '''
-        fig = plt.gcf()
+    def _define_motion_annotation_callback(self, ax):
+        ''' fill displayed diagram with a mouse-event to show the annotation of the points within it '''
+        fig = ax.figure
         fig.canvas.set_window_title('Main Sequence')
 
-        # check for empty name map
-        if self._annotation_points == []:
-            warnings.warn('"self._names_map" is empty...returning directly, no motion_notifiy_event connected')
+        # check for empty diagram
+        if self._metrics_frame is None or self._metrics_frame.empty:
+            warnings.warn('No points to annotate...returning directly, no motion_notifiy_event connected')
             return
 
+        # a single annotation is reused for all points
+        self._point_index = PointIndex.PointIndex(self._metrics_frame[MetricsFrame.INSTABILITY].values,
+                                                  self._metrics_frame[MetricsFrame.ABSTRACTNESS].values)
+        self._annotation = ax.annotate('', (0, 0), xytext=(10, 10), textcoords='offset points', visible=False,
+                                       bbox=dict(boxstyle='round', facecolor='white', alpha=.8))
+        self._annotated_points = ()
+
         # callback executed at each mouse motion event
-        fig.canvas.mpl_connect("motion_notify_event", lambda event: self._annotate_point(event, sc))
+        self._motion_callback_id = fig.canvas.mpl_connect("motion_notify_event",
+                                                          lambda event: self._annotate_point(event, ax))
+
+    def _draw_metrics(self, ax=None):
+        ''' draw the Main Sequence and the metrics into the given axes. Only the diagram drawn into the current figure
+        (default) shows annotations on mouse motion. The density of the points is drawn instead of the single points
+        if there are too many of them '''
+        interactive = ax is None
+
+        with Profiler.phase(Profiler.PLOTTING):
+            # create basic layout format
+            ax = self._layout_ax(ax)
+
+            instability_metric = self._metrics_frame[MetricsFrame.INSTABILITY]
+            abstractness_metric = self._metrics_frame[MetricsFrame.ABSTRACTNESS]
+
+            # x = instability, y = abstractness
+            if len(self._metrics_frame) > DENSITY_THRESHOLD:
+                ax.hexbin(instability_metric, abstractness_metric, gridsize=DENSITY_GRID_SIZE, extent=(0, 1, 0, 1),
+                          mincnt=1, bins='log', cmap='Blues')
+            else:
+                ax.scatter(instability_metric, abstractness_metric)
+
+            # use a motion-event to display annotations
+            if interactive:
+                self._define_motion_annotation_callback(ax)
 
     def plot_metrics(self):
         ''' show a diagram picturing the Main Sequence, where
         - y-axis denotes the Abstractness
         - x-axis denotes the Instability '''
-        self._instability_metric, self._abstractness_metric = \
-            DataSeriesUtility.get_instability_and_abstractness_metric(self._dir_path)
+        with Profiler.phase(Profiler.IMPORTS):
+            import matplotlib.pyplot as plt
 
-        # create basic layout format
-        ax = self._layout_ax()
+        # if not already computed get metrics
+        if self._metrics_frame is None:
+            self._metrics_frame = DataSeriesUtility.get_metrics_frame(self._dir_path)
 
-        # create a list which contains all annotations
-        self._annotation_points = [ax.annotate(n, (x, y), visible=False) for n, x, y in
-                                   zip(self._instability_metric.index, self._instability_metric, self._abstractness_metric)]
+        self._draw_metrics()
 
-        # x = instability, y = abstractness
-        sc = ax.scatter(self._instability_metric, self._abstractness_metric)
+        plt.show()
 
-        # use a motion-event to display annotations
-        self._define_motion_annotation_callback(sc)
+    def save_plot(self, file_path):
+        ''' render the diagram picturing the Main Sequence (see plot_metrics) without displaying it and save it to the
+        given file (format given by its extension, e.g. png, svg, pdf) '''
+        # if not already computed get metrics
+        if self._metrics_frame is None:
+            self._metrics_frame = DataSeriesUtility.get_metrics_frame(self._dir_path)
 
-        plt.show()
+        FileUtility.save_plot_to_file(self._draw_metrics, file_path)
+
+    def redraw_metrics(self, metrics_frame):
+        ''' replace the diagram of the current figure by one picturing the given metrics frame, e.g. after files
+        changed '''
+        import matplotlib.pyplot as plt
+
+        self._metrics_frame = metrics_frame
+
+        # the callback of the previous diagram refers to its points
+        fig = plt.gcf()
+        if self._motion_callback_id is not None:
+            fig.canvas.mpl_disconnect(self._motion_callback_id)
+            self._motion_callback_id = None
+
+        fig.clf()
+        self._draw_metrics()
+        fig.canvas.draw_idle()
 
     def save_metrics(self, dir_path=''):
         ''' save both metrics to directory. If provided use user-defined directory '''
         # if not already computed get metrics
-        if self._instability_metric is None or self._abstractness_metric is None:
-            self._instability_metric, self._abstractness_metric = \
-                DataSeriesUtility.get_instability_and_abstractness_metric(self._dir_path)
+        if self._metrics_frame is None:
+            self._metrics_frame = DataSeriesUtility.get_metrics_frame(self._dir_path)
+
+        # save them, each with the include cycle of the files
+        cycle_membership = MetricsFrame.get_cycle_membership(self._metrics_frame)
+        FileUtility.save_metric_to_file(MetricsFrame.get_instability_metric(self._metrics_frame), dir_path,
+                                        additional_columns=cycle_membership)
+        FileUtility.save_metric_to_file(MetricsFrame.get_abstractness_metric(self._metrics_frame), dir_path,
+                                        additional_columns=cycle_membership)
+
+    def export_metrics(self, file_path):
+        ''' save all metrics and counts of each file (or component) to a single file, whose extension determines the
+        format (csv, jsonl, parquet, arrow) '''
+        # if not already computed get metrics
+        if self._metrics_frame is None:
+            self._metrics_frame = DataSeriesUtility.get_metrics_frame(self._dir_path)
 
-        # save them
-        FileUtility.save_metric_to_file(self._instability_metric, dir_path)
-        FileUtility.save_metric_to_file(self._abstractness_metric, dir_path)
+        FileUtility.save_metrics_frame_to_file(self._metrics_frame, file_path)
@@ -0,0 +1,29 @@
+# run-wide options of the analysis, set once before the metrics are computed (e.g. by __main__)
+
+# directory of the persistent parse cache (see ParseCache), None disables the cache
+PARSE_CACHE_DIRECTORY = None
+
+# git revision, only files changed since then are scanned again (requires the snapshot of a previous run at that
+# revision, which is stored in the parse cache directory), None scans all files
+SINCE_REVISION = None
+
+# number of worker processes used to scan the code files, 0 uses all available cores
+NUMBER_OF_JOBS = 1
+
+# directories searched for included files (like the -I option of a compiler)
+INCLUDE_DIRECTORIES = []
+
+# compilation database (compile_commands.json or the directory containing it): the include directories of each
+# translation unit are searched for its includes and only the translation units listed are scanned, None if not used
+COMPILATION_DATABASE = None
+
+# mapping of the files to components (see ComponentMapping), the metrics are computed per component if given and per
+# file if None
+COMPONENT_MAPPING = None
+
+# file the condensation of the include-graph (see IncludeCycles) is saved to whenever the metrics are computed, None
+# if it is not saved
+CONDENSATION_FILE = None
+
+# measure the time of the phases of a run and count the work of the hot paths (see Profiler)
+PROFILE = False
@@ -0,0 +1,48 @@
+import warnings
+
+from scm_modules.utils import DataSeriesUtility, SourceFileScanner
+
+
+class AnalysisSession:
+    ''' keep the scanned files (FileRecords) of a directory in memory, hence after a change only the changed files
+    are scanned again before the metrics are computed (per component if a component mapping is given, see
+    DataSeriesUtility.compute_metrics_columns) '''
+    def __init__(self, dir_path, component_mapping=DataSeriesUtility.CONFIGURED_MAPPING):
+        self._dir_path = dir_path
+        self._component_mapping = component_mapping
+        self._file_records = {}
+
+    def scan(self):
+        ''' scan all code files of the directory (the persistent parse cache is used if configured) '''
+        file_records = SourceFileScanner.scan_code_files(self._dir_path)
+        self._file_records = {file_record.file_path: file_record for file_record in file_records}
+
+    def update_files(self, changed_files):
+        ''' scan the given changed (or deleted) files again, None indicates that all files might have changed '''
+        if changed_files is None:
+            self.scan()
+        else:
+            SourceFileScanner.update_file_records(self._file_records, sorted(changed_files), self._dir_path)
+
+    def update_changed_files(self, file_watcher, timeout=0):
+        ''' wait up to timeout seconds for changes reported by the given file watcher and update the changed files.
+        Return True if files changed '''
+        try:
+            changed_files = file_watcher.get_changed_files(timeout)
+        except OSError as ex:
+            warnings.warn('{} ...scanning all files'.format(ex))
+            changed_files = None
+
+        if changed_files is not None and not changed_files:
+            return False
+
+        self.update_files(changed_files)
+        return True
+
+    def get_file_records(self):
+        return list(self._file_records.values())
+
+    def get_metrics_frame(self):
+        ''' return the metrics frame (see MetricsFrame) of the files currently known '''
+        return DataSeriesUtility.compute_metrics_frame(self._dir_path, self.get_file_records(),
+                                                       self._component_mapping)
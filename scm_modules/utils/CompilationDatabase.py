@@ -0,0 +1,92 @@
+import json
+import os
+import shlex
+import warnings
+
+from scm_modules.utils import AnalysisConfig
+
+
+# name of a compilation database (as written by CMake, Bear, ...) inside a build directory
+COMPILATION_DATABASE_FILENAME = 'compile_commands.json'
+
+# compiler options adding an include directory, either followed by the directory or with the directory attached
+INCLUDE_DIRECTORY_OPTIONS = ('-I', '-isystem', '-iquote', '-idirafter', '/I')
+
+
+class CompilationDatabaseError(RuntimeError):
+    ''' raised if a compilation database cannot be read (e.g. missing file, invalid JSON) '''
+
+
+def get_compilation_database_file(path):
+    ''' return the path of the compilation database given by a file or by the directory containing it '''
+    if os.path.isdir(path):
+        return os.path.join(path, COMPILATION_DATABASE_FILENAME)
+
+    return path
+
+
+def _get_arguments(entry):
+    ''' return the compiler arguments of an entry, given either as list ("arguments") or as string ("command") '''
+    if 'arguments' in entry:
+        return list(entry['arguments'])
+
+    return shlex.split(entry.get('command', ''))
+
+
+def get_include_directories(arguments, directory=''):
+    ''' return the include directories of the given compiler arguments in order of appearance, relative directories
+    are joined with the given (working) directory of the compiler '''
+    include_directories = []
+    arguments = iter(arguments)
+    for argument in arguments:
+        for option in INCLUDE_DIRECTORY_OPTIONS:
+            if argument.startswith(option):
+                include_directory = argument[len(option):] or next(arguments, '')
+                if include_directory:
+                    include_directories.append(os.path.normpath(os.path.join(directory, include_directory)))
+                break
+
+    return include_directories
+
+
+def load_compilation_database(path):
+    ''' return a dictionary (absolute path of a translation unit -> list of its absolute include directories) of the
+    given compilation database (file or directory containing compile_commands.json) '''
+    database_file = get_compilation_database_file(path)
+    try:
+        with open(database_file, 'r') as file:
+            entries = json.load(file)
+
+        include_directories_of_files = {}
+        for entry in entries:
+            directory = os.path.abspath(entry.get('directory', os.path.dirname(database_file)))
+            file_path = os.path.normpath(os.path.join(directory, entry['file']))
+            include_directories_of_files[file_path] = get_include_directories(_get_arguments(entry), directory)
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as ex:
+        raise CompilationDatabaseError('Failed to read compilation database "{}": {}'.format(database_file, ex))
+
+    return include_directories_of_files
+
+
+# the compilation database read last and the modification time of its file, it is read again only if it changed
+_loaded_database = (None, None, {})
+
+
+def get_compilation_database(path=None):
+    ''' return the compilation database given (or configured in AnalysisConfig) as dictionary (see
+    load_compilation_database), None if no database is used. A database which cannot be read is ignored '''
+    global _loaded_database
+    if path is None:
+        path = AnalysisConfig.COMPILATION_DATABASE
+    if path is None:
+        return None
+
+    try:
+        modification_time = os.stat(get_compilation_database_file(path)).st_mtime_ns
+        if _loaded_database[:2] != (path, modification_time):
+            _loaded_database = (path, modification_time, load_compilation_database(path))
+    except (OSError, CompilationDatabaseError) as ex:
+        warnings.warn('{} ...ignoring compilation database'.format(ex))
+        return None
+
+    return _loaded_database[2]
@@ -0,0 +1,118 @@
+import fnmatch
+import glob
+import json
+import os
+import posixpath
+import re
+
+from scm_modules.utils import FileUtility
+
+
+# prefix of a component rule whose pattern is a regular expression (glob pattern otw.)
+REGEX_RULE_PREFIX = 're:'
+
+# directory of the replies of the CMake file API within a build directory
+CMAKE_REPLY_DIRECTORY = os.path.join('.cmake', 'api', 'v1', 'reply')
+
+
+class ComponentMappingError(RuntimeError):
+    ''' raised if a component mapping cannot be created (e.g. invalid rule, missing CMake reply) '''
+
+
+class DirectoryComponents:
+    ''' map each file to the directory containing it, cut after the given number of directories (files above this
+    depth belong to their own directory, files of the analyzed directory to ".") '''
+    def __init__(self, depth):
+        self._depth = depth
+
+    def get_component(self, relative_path):
+        directories = posixpath.dirname(relative_path).split('/')[:self._depth]
+
+        return '/'.join(directories) or '.'
+
+
+class RuleComponents:
+    ''' map each file by the first matching rule (component name, pattern), the pattern is a glob pattern or a regular
+    expression (prefixed by "re:") matched against the start of the relative path. The component name of a regular
+    expression may refer to its groups (e.g. \\1). Files matching no rule do not belong to a component '''
+    def __init__(self, rules):
+        self._rules = []
+        for component, pattern in rules:
+            try:
+                if pattern.startswith(REGEX_RULE_PREFIX):
+                    self._rules.append((component, re.compile(pattern[len(REGEX_RULE_PREFIX):]), True))
+                else:
+                    self._rules.append((component, re.compile(fnmatch.translate(pattern)), False))
+            except re.error as ex:
+                raise ComponentMappingError('Invalid pattern "{}" of component "{}": {}'.format(pattern, component, ex))
+
+    def get_component(self, relative_path):
+        for component, pattern, is_regex in self._rules:
+            match = pattern.match(relative_path)
+            if match is not None:
+                return match.expand(component) if is_regex else component
+
+        return None
+
+
+class FileComponents:
+    ''' map each file by a given dictionary (relative path -> component). A file not contained belongs to the
+    component of the nearest directory containing mapped files (e.g. headers not listed as sources of a target) '''
+    def __init__(self, components_of_files):
+        self._components_of_files = dict(components_of_files)
+        self._components_of_directories = {}
+        for relative_path in sorted(self._components_of_files):
+            self._components_of_directories.setdefault(posixpath.dirname(relative_path),
+                                                       self._components_of_files[relative_path])
+
+    def get_component(self, relative_path):
+        if relative_path in self._components_of_files:
+            return self._components_of_files[relative_path]
+
+        directory = posixpath.dirname(relative_path)
+        while True:
+            if directory in self._components_of_directories:
+                return self._components_of_directories[directory]
+            if directory in ('', '.', '..') or directory.endswith('/..'):
+                return None
+            directory = posixpath.dirname(directory)
+
+
+def parse_component_rule(rule):
+    ''' return the component name and the pattern of a rule given as "<component>=<pattern>" '''
+    component, separator, pattern = rule.partition('=')
+    if not separator or not component or not pattern:
+        raise ComponentMappingError('Invalid component rule "{}", use <component>=<pattern>'.format(rule))
+
+    return component, pattern
+
+
+def _read_json(file_path):
+    with open(file_path, 'r') as file:
+        return json.load(file)
+
+
+def load_cmake_targets(build_directory, dir_path):
+    ''' return the FileComponents mapping each source file of a CMake target to the target, read from the codemodel
+    reply of the CMake file API (requires the query file .cmake/api/v1/query/codemodel-v2 in the build directory
+    before running cmake). A source belonging to several targets is mapped to the first target (by name) '''
+    reply_directory = os.path.join(build_directory, CMAKE_REPLY_DIRECTORY)
+    codemodel_files = sorted(glob.glob(os.path.join(reply_directory, 'codemodel-v2-*.json')))
+    if not codemodel_files:
+        raise ComponentMappingError('No codemodel found in "{}", create the query file ".cmake/api/v1/query/'
+                                    'codemodel-v2" and run cmake again'.format(reply_directory))
+
+    components_of_files = {}
+    try:
+        codemodel = _read_json(codemodel_files[-1])
+        source_directory = codemodel['paths']['source']
+        targets = [target for configuration in codemodel['configurations'][:1] for target in configuration['targets']]
+        for target in sorted(targets, key=lambda target: target['name']):
+            target_reply = _read_json(os.path.join(reply_directory, target['jsonFile']))
+            for source in target_reply.get('sources', []):
+                relative_path = FileUtility.get_relative_path(os.path.join(source_directory, source['path']), dir_path)
+                components_of_files.setdefault(relative_path, target['name'])
+    except (OSError, ValueError, TypeError, KeyError, IndexError) as ex:
+        raise ComponentMappingError('Failed to read the CMake codemodel "{}": {}'.format(codemodel_files[-1], ex))
+
+    return FileComponents(components_of_files)
@@ -0,0 +1,114 @@
+import numpy as np
+
+from scm_modules.utils import IncludeCycles, IncludeGraph, MetricKernels, MetricsFrame, Profiler
+
+
+# column of the component metrics containing the number of files of a component
+NB_FILES = 'files'
+
+# id of a node (file) which does not belong to any component
+NO_COMPONENT = -1
+
+
+def _count_distinct_pairs(components, nodes, nb_components, nb_nodes):
+    ''' return the number of distinct nodes paired with each component (group-by component, count distinct node) '''
+    if components.size == 0:
+        return np.zeros(nb_components, dtype=np.int64)
+
+    pair_keys = np.unique(components * np.int64(nb_nodes) + nodes)
+
+    return np.bincount(pair_keys // nb_nodes, minlength=nb_components)
+
+
+def aggregate_include_graph(indptr, indices, node_components, nb_components):
+    ''' aggregate the include graph (CSR) by component in a single pass over all edges, which equals the product of
+    the membership matrix and the adjacency. Return fan_in (number of distinct nodes outside the component included
+    by it) and fan_out (number of distinct nodes outside the component including it) of each component.
+    node_components contains the component id of each node, NO_COMPONENT for nodes outside of any component '''
+    nb_nodes = node_components.size
+    sources = np.repeat(np.arange(nb_nodes, dtype=np.int64), np.diff(indptr))
+    targets = np.asarray(indices, dtype=np.int64)
+    source_components = node_components[sources]
+    target_components = node_components[targets]
+
+    # only edges crossing the boundary of a component count
+    crossing = source_components != target_components
+    outgoing = crossing & (source_components != NO_COMPONENT)
+    incoming = crossing & (target_components != NO_COMPONENT)
+
+    fan_in = _count_distinct_pairs(source_components[outgoing], targets[outgoing], nb_components, nb_nodes)
+    fan_out = _count_distinct_pairs(target_components[incoming], sources[incoming], nb_components, nb_nodes)
+
+    return fan_in, fan_out
+
+
+def get_component_cycle_ids(indptr, indices, node_components, nb_components):
+    ''' return the id of the include cycle each component is part of (see IncludeCycles), computed on the graph of the
+    components: component x includes component y if any file of x includes a file of y '''
+    sources = node_components[np.repeat(np.arange(node_components.size, dtype=np.int64), np.diff(indptr))]
+    targets = node_components[np.asarray(indices, dtype=np.int64)]
+    between_components = (sources != NO_COMPONENT) & (targets != NO_COMPONENT) & (sources != targets)
+
+    return IncludeCycles.get_cycle_ids(*IncludeGraph.create_csr(sources[between_components],
+                                                                targets[between_components], nb_components))
+
+
+def get_file_components(file_names, component_mapping):
+    ''' return the sorted component names and the component id of each file (NO_COMPONENT if the component mapping,
+    see ComponentMapping, does not map the file to a component) '''
+    components = [component_mapping.get_component(name) for name in file_names]
+    component_names = sorted({component for component in components if component is not None})
+    component_ids = {component: component_id for component_id, component in enumerate(component_names)}
+
+    return component_names, np.array([component_ids.get(component, NO_COMPONENT) for component in components],
+                                     dtype=np.int64)
+
+
+def compute_component_metrics(include_graph, file_names, file_columns, component_mapping):
+    ''' return the metrics of the components given by the component mapping computed by numpy only, i.e. without
+    pandas: the sorted component names and the columns of a metrics frame (see MetricsFrame) extended by the number of
+    files, one entry per component. The metrics of the files (their names and columns, see FileMetrics) are aggregated
+    by a single group-by over the include graph: fan_in, fan_out count the dependencies crossing the component
+    boundary, N_a and N_c are summed up. The cycle column refers to the include cycles between components '''
+    component_names, file_components = get_file_components(file_names, component_mapping)
+    nb_components = len(component_names)
+
+    # nodes of the include graph which are no files of the metrics (e.g. stl-includes) are outside of components
+    node_components = np.full(include_graph.get_number_of_nodes(), NO_COMPONENT, dtype=np.int64)
+    for file_component, name in zip(file_components, file_names):
+        node_id = include_graph.get_node_id(name)
+        if node_id is not None:
+            node_components[node_id] = file_component
+
+    indptr, indices = include_graph.get_csr()
+    fan_in, fan_out = aggregate_include_graph(indptr, indices, node_components, nb_components)
+
+    in_component = file_components != NO_COMPONENT
+    components_of_files = file_components[in_component]
+
+    def sum_by_component(column):
+        return np.bincount(components_of_files, weights=np.asarray(file_columns[column])[in_component],
+                           minlength=nb_components).astype(np.int64)
+
+    nb_interfaces = sum_by_component(MetricsFrame.NB_INTERFACES)
+    nb_classes = sum_by_component(MetricsFrame.NB_CLASSES)
+    instability = MetricKernels.compute_instability(fan_in, fan_out)
+    abstractness = MetricKernels.compute_abstractness(nb_interfaces, nb_classes)
+    Profiler.count(Profiler.CELLS_ALLOCATED, nb_components * (len(MetricsFrame.COLUMNS) + 1))
+
+    return component_names, {
+        MetricsFrame.INSTABILITY: instability, MetricsFrame.ABSTRACTNESS: abstractness,
+        MetricsFrame.DISTANCE: MetricKernels.compute_distance(abstractness, instability),
+        MetricsFrame.FAN_IN: fan_in, MetricsFrame.FAN_OUT: fan_out,
+        MetricsFrame.NB_INTERFACES: nb_interfaces, MetricsFrame.NB_CLASSES: nb_classes,
+        MetricsFrame.CYCLE: get_component_cycle_ids(indptr, indices, node_components, nb_components),
+        NB_FILES: np.bincount(components_of_files, minlength=nb_components)}
+
+
+def create_component_metrics_frame(include_graph, metrics_frame, component_mapping):
+    ''' return the metrics of the components (see compute_component_metrics) computed from the given metrics frame of
+    the files as metrics frame extended by the number of files, one row per component '''
+    file_names, file_columns = MetricsFrame.get_names_and_columns(metrics_frame)
+
+    return MetricsFrame.create_metrics_frame_from_columns(
+        *compute_component_metrics(include_graph, file_names, file_columns, component_mapping))
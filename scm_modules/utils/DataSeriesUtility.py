@@ -1,59 +1,69 @@
-import pandas as pd
+from scm_modules.utils import AnalysisConfig, ComponentMetrics, FileMetrics, IncludeCycles, MetricsFrame, Profiler, \
+    SourceFileScanner
 
-from scm_modules.metrics.instability_metric import InstabilityMetric
-from scm_modules.metrics.abstractness_metric import AbstractnessMetric
 
+# component mapping argument standing for the mapping configured in AnalysisConfig, None computes the metrics per file
+# whatever is configured
+CONFIGURED_MAPPING = object()
 
-# default value used to pad data-sequences to required size
-DEFAULT_PADDING_VALUE = 0
 
+def _import_pandas():
+    ''' import pandas (used by MetricsFrame to build a frame) within the imports phase of the profiler '''
+    with Profiler.phase(Profiler.IMPORTS):
+        import pandas  # noqa: F401
 
-def get_instability_and_abstractness_metric(dir_path):
-    ''' return instability and abstractness metric. If one array is of lower size than the other,
-    it has to be extended with the default values to be able to plot it '''
-    instabilityMetric = InstabilityMetric(dir_path)
-    instability_metric = instabilityMetric.compute_instability()
 
-    abstractnessMetric = AbstractnessMetric(dir_path)
-    abstractness_metric = abstractnessMetric.compute_abstractness()
+def get_metrics_frame(dir_path, component_mapping=CONFIGURED_MAPPING):
+    ''' return the metrics frame (see MetricsFrame) of all files (or components) of the given directory '''
+    # read each code file once, both metrics are computed from the same file records
+    file_records = SourceFileScanner.scan_code_files(dir_path)
+
+    return compute_metrics_frame(dir_path, file_records, component_mapping)
 
-    # for each instability-value an abstractness-value needs to exist
-    if len(instability_metric) > len(abstractness_metric):
-        abstractness_metric = pad_data_series_with_default_values(instability_metric, abstractness_metric)
-    # for each abstractness-value an instability-value needs to exist
-    elif len(abstractness_metric) > len(instability_metric):
-        instability_metric = pad_data_series_with_default_values(abstractness_metric, instability_metric)
 
-    # order elements of array the same
-    abstractness_metric = reorder_data_series_elements(instability_metric, abstractness_metric)
+def compute_file_metrics(dir_path, file_records):
+    ''' return the metrics frame of all files computed from already scanned files (FileRecords) and the include-graph
+    of the files. The metrics are computed by numpy only (see FileMetrics), the frame is built from them at once '''
+    names, columns, include_graph = FileMetrics.compute_file_metrics(dir_path, file_records)
+    _import_pandas()
+    with Profiler.phase(Profiler.METRICS_FRAME):
+        metrics_frame = MetricsFrame.create_metrics_frame_from_columns(names, columns)
 
-    # return both metrics
-    return instability_metric, abstractness_metric
+    return metrics_frame, include_graph
 
 
-def pad_data_series_with_default_values(data_series, data_series_to_pad):
-    ''' pad data_series_to_pad with default values to be the same size as data_series
-    and contain the same index-names, too. Return the padded data-series '''
-    if not isinstance(data_series, type(pd.Series(dtype=float))) or \
-       not isinstance(data_series_to_pad, type(pd.Series(dtype=float))):
-        return pd.Series(dtype=float)
+def compute_metrics_columns(dir_path, file_records, component_mapping=CONFIGURED_MAPPING):
+    ''' return the metrics computed from already scanned files (FileRecords) by numpy only, i.e. without pandas: the
+    names of the rows and the columns (column -> array with one entry per row, see FileMetrics). If a component
+    mapping is given (by default the one configured in AnalysisConfig), the metrics of the components are returned
+    (see ComponentMetrics), one row per component, the metrics of the files if it is None. If configured in
+    AnalysisConfig, the condensation of the include-graph is saved as well (see IncludeCycles) '''
+    if component_mapping is CONFIGURED_MAPPING:
+        component_mapping = AnalysisConfig.COMPONENT_MAPPING
 
-    padded_data_series = data_series_to_pad
-    for index_name in data_series.index:
-        if index_name not in data_series_to_pad:
-            padded_data_series[index_name] = DEFAULT_PADDING_VALUE
+    names, columns, include_graph = FileMetrics.compute_file_metrics(dir_path, file_records)
+    if AnalysisConfig.CONDENSATION_FILE is not None:
+        with Profiler.phase(Profiler.CONDENSATION):
+            IncludeCycles.save_condensation(include_graph, AnalysisConfig.CONDENSATION_FILE)
+    if component_mapping is None:
+        return names, columns
 
-    return padded_data_series
+    with Profiler.phase(Profiler.COMPONENTS):
+        return ComponentMetrics.compute_component_metrics(include_graph, names, columns, component_mapping)
 
 
-def reorder_data_series_elements(data_series, data_series_to_reorder):
-    ''' order elements in data_series_to_reorder the same way as they are in data_series '''
-    if not isinstance(data_series, type(pd.Series(dtype=float))) or \
-       not isinstance(data_series_to_reorder, type(pd.Series(dtype=float))):
-        return pd.Series(dtype=float)
+def compute_metrics_frame(dir_path, file_records, component_mapping=CONFIGURED_MAPPING):
+    ''' return the metrics frame of the metrics computed from already scanned files (FileRecords), one row per file
+    or component (see compute_metrics_columns) '''
+    names, columns = compute_metrics_columns(dir_path, file_records, component_mapping)
+    _import_pandas()
+    with Profiler.phase(Profiler.METRICS_FRAME):
+        return MetricsFrame.create_metrics_frame_from_columns(names, columns)
 
-    ordered_data_series = pd.Series(name=data_series_to_reorder.name, dtype=float)
-    for index_name in data_series.index:
-        ordered_data_series[index_name] = data_series_to_reorder[index_name]
 
-    return ordered_data_series
+def get_instability_and_abstractness_metric(dir_path):
+    ''' return instability and abstractness metric, both containing the same files in the same order (files missing
+    in one metric get the default value) '''
+    metrics_frame = get_metrics_frame(dir_path)
+
+    return MetricsFrame.get_instability_metric(metrics_frame), MetricsFrame.get_abstractness_metric(metrics_frame)
@@ -0,0 +1,97 @@
+import warnings
+
+import numpy as np
+
+from scm_modules.utils import FileUtility, IncludeCycles, IncludeGraph, IncludeResolver, MetricKernels, MetricsFrame, \
+    Profiler, ProgrammingLanguageConfig
+
+
+def _select_file_records(file_records, get_file_extensions):
+    ''' return the file records of the files with one of the extensions given by the programming language '''
+    file_extensions = []
+    try:
+        file_extensions = get_file_extensions()
+    except ProgrammingLanguageConfig.LanguageOptionError as ex:
+        warnings.warn(ex.args)
+
+    return [record for record in file_records if FileUtility.has_file_extension(record.file_path, file_extensions)]
+
+
+def create_include_graph(dir_path, file_records):
+    ''' return the include-graph of the given files (FileRecords) and the number of user-files. The user-files are
+    the first nodes (identified by their path relative to the analyzed directory), followed by the included files
+    which are not resolved to a user-file (see IncludeResolver) '''
+    include_graph = IncludeGraph.IncludeGraph()
+    user_file_ids = [include_graph.add_node(FileUtility.get_relative_path(record.file_path, dir_path))
+                     for record in file_records]
+    nb_user_files = include_graph.get_number_of_nodes()
+
+    include_resolver = IncludeResolver.create_include_resolver(include_graph.get_node_names()[:nb_user_files], dir_path)
+    for record, including_id in zip(file_records, user_file_ids):
+        IncludeResolver.add_include_edges(include_graph, include_resolver, including_id, record.user_includes, True)
+        IncludeResolver.add_include_edges(include_graph, include_resolver, including_id, record.stl_includes, False)
+
+    return include_graph, nb_user_files
+
+
+def count_interfaces_and_classes(dir_path, file_records):
+    ''' return the number of interfaces and classes of each file (relative path -> (N_a, N_c)), a file appearing
+    twice keeps its first position and its last counts '''
+    counts_of_files = {}
+    for record in file_records:
+        counts_of_files[FileUtility.get_relative_path(record.file_path, dir_path)] = \
+            (record.nb_interfaces, record.nb_classes)
+
+    return counts_of_files
+
+
+def compute_metrics_of_include_graph(dir_path, file_records, include_graph, nb_user_files):
+    ''' return the paths and the columns of the metrics (see compute_file_metrics) of the given files (FileRecords)
+    and their include-graph (see create_include_graph) '''
+    counts_of_files = count_interfaces_and_classes(
+        dir_path, _select_file_records(file_records, ProgrammingLanguageConfig.get_file_extensions_am))
+
+    user_files = include_graph.get_node_names()[:nb_user_files]
+    known_files = set(user_files)
+    names = user_files + [name for name in counts_of_files if name not in known_files]
+    rows = {name: row for row, name in enumerate(names)}
+
+    fan_in = np.full(len(names), MetricsFrame.DEFAULT_VALUE, dtype=np.int64)
+    fan_out = np.full(len(names), MetricsFrame.DEFAULT_VALUE, dtype=np.int64)
+    fan_in[:nb_user_files] = include_graph.get_out_degrees()[:nb_user_files]
+    fan_out[:nb_user_files] = include_graph.get_in_degrees()[:nb_user_files]
+
+    rows_of_counts = np.array([rows[name] for name in counts_of_files], dtype=np.int64)
+    counts = np.array(list(counts_of_files.values()), dtype=np.int64).reshape(-1, 2)
+    nb_interfaces = np.full(len(names), MetricsFrame.DEFAULT_VALUE, dtype=np.int64)
+    nb_classes = np.full(len(names), MetricsFrame.DEFAULT_VALUE, dtype=np.int64)
+    nb_interfaces[rows_of_counts], nb_classes[rows_of_counts] = counts[:, 0], counts[:, 1]
+
+    cycle = np.full(len(names), IncludeCycles.NO_CYCLE, dtype=np.int64)
+    cycle[:nb_user_files] = IncludeCycles.get_cycle_ids(*include_graph.get_csr())[:nb_user_files]
+
+    instability = MetricKernels.compute_instability(fan_in, fan_out)
+    abstractness = MetricKernels.compute_abstractness(nb_interfaces, nb_classes)
+    columns = {MetricsFrame.INSTABILITY: instability, MetricsFrame.ABSTRACTNESS: abstractness,
+               MetricsFrame.DISTANCE: MetricKernels.compute_distance(abstractness, instability),
+               MetricsFrame.FAN_IN: fan_in, MetricsFrame.FAN_OUT: fan_out, MetricsFrame.NB_INTERFACES: nb_interfaces,
+               MetricsFrame.NB_CLASSES: nb_classes, MetricsFrame.CYCLE: cycle}
+    Profiler.count(Profiler.CELLS_ALLOCATED, len(names) * len(columns))
+
+    return names, columns
+
+
+def compute_file_metrics(dir_path, file_records):
+    ''' return the metrics of all files computed from already scanned files (FileRecords) by numpy only, i.e. without
+    pandas: the paths of the files (relative to the analyzed directory), the columns of the metrics (column name of
+    MetricsFrame -> array with one entry per file) and the include-graph. The rows equal those of a metrics frame:
+    the files of the instability metric, followed by the files only considered by the abstractness metric, missing
+    values are MetricsFrame.DEFAULT_VALUE (IncludeCycles.NO_CYCLE for the cycle) '''
+    with Profiler.phase(Profiler.INCLUDE_GRAPH):
+        include_graph, nb_user_files = create_include_graph(
+            dir_path, _select_file_records(file_records, ProgrammingLanguageConfig.get_file_extensions_im))
+        include_graph.get_csr()
+    with Profiler.phase(Profiler.METRICS):
+        names, columns = compute_metrics_of_include_graph(dir_path, file_records, include_graph, nb_user_files)
+
+    return names, columns, include_graph
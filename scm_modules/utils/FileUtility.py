@@ -1,12 +1,35 @@
+import csv
 from datetime import datetime
-import glob
+import importlib.util
+import json
+import os
 from pathlib import Path
 import warnings
 
+from scm_modules.utils import Profiler
+
 
 # default directory for saved metric
 DEFAULT_DIRECTORY = 'saved_metrics'
 
+# formats of the export of all metrics into a single file, given by the extension of the file
+CSV_FORMAT = 'csv'
+JSONL_FORMAT = 'jsonl'
+PARQUET_FORMAT = 'parquet'
+ARROW_FORMAT = 'arrow'
+EXPORT_FORMATS = {'.csv': CSV_FORMAT, '.jsonl': JSONL_FORMAT, '.ndjson': JSONL_FORMAT, '.parquet': PARQUET_FORMAT,
+                  '.arrow': ARROW_FORMAT, '.feather': ARROW_FORMAT}
+
+# formats written by the optional dependency pyarrow
+PYARROW_FORMATS = [PARQUET_FORMAT, ARROW_FORMAT]
+
+# column of an exported metrics frame containing the names of the files (or components)
+EXPORT_NAME_COLUMN = 'name'
+
+
+class ExportError(RuntimeError):
+    ''' raised if the metrics cannot be exported to a file (e.g. unknown format, pyarrow not installed) '''
+
 
 def get_all_code_files(directory_path, allowed_file_extensions):
     ''' return a list containing all files with the provided file-extension(s) found in the given directory '''
@@ -17,15 +40,90 @@ def get_all_code_files(directory_path, allowed_file_extensions):
         warnings.warn('"allowed_file_extensions" is not of required type list. Returning empty list..')
         return code_files
 
-    for extension in allowed_file_extensions:
-        directory_content = [file for file in glob.glob(directory_path + "**/*." + extension, recursive=True)]
-
-        # add files of given extension to list
-        code_files += [file for file in directory_content]
+    code_files += iterate_code_files(directory_path, allowed_file_extensions)
 
     return code_files
 
 
+def iterate_code_files(directory_path, allowed_file_extensions):
+    ''' lazily yield all files with the provided file-extension(s) found in the given directory.
+    The directory tree is traversed once for all extensions, hidden files/directories are pruned (like glob does)
+    and directories already visited via a symlink are skipped by their inode '''
+    suffixes = tuple('.' + extension for extension in allowed_file_extensions)
+    if not suffixes:
+        return
+
+    visited_directories = set()
+    pending_directories = [directory_path]
+
+    # register the start directory as well, a symlink pointing back to it would cause a loop otherwise
+    try:
+        _is_new_directory(os.stat(directory_path if directory_path != '' else '.'), visited_directories)
+    except OSError:
+        return
+
+    while pending_directories:
+        code_files, sub_directories = scan_directory(pending_directories.pop(), suffixes, visited_directories)
+        yield from code_files
+
+        # depth-first traversal, sub-directories are processed in alphabetical order
+        pending_directories += reversed(sub_directories)
+
+
+def scan_directory(directory_path, suffixes, visited_directories):
+    ''' return the files ending with one of the given suffixes and the not yet visited sub-directories (their
+    inodes are added to the given set) of given directory, one level only and pruned like iterate_code_files (e.g. to
+    traverse a directory tree step by step) '''
+    code_files = []
+    sub_directories = []
+
+    try:
+        with os.scandir(directory_path if directory_path != '' else '.') as directory_iterator:
+            entries = sorted(directory_iterator, key=lambda entry: entry.name)
+    except OSError:
+        return code_files, sub_directories
+
+    for entry in entries:
+        # entries with a leading dot are neither matched nor descended into
+        if entry.name.startswith('.'):
+            continue
+
+        # an empty directory path denotes the current working directory, keep paths relative to it
+        entry_path = entry.path if directory_path != '' else entry.name
+
+        try:
+            if entry.is_dir():
+                # one stat call per directory on POSIX (only is_dir() is answered by the directory listing), the
+                # identity of the target is needed to detect symlink loops (inode() is the one of the link itself)
+                if _is_new_directory(entry.stat(), visited_directories):
+                    sub_directories.append(entry_path)
+            elif entry.name.endswith(suffixes) and entry.is_file():
+                code_files.append(entry_path)
+        except OSError:
+            continue
+
+    return code_files, sub_directories
+
+
+def _is_new_directory(stat_result, visited_directories):
+    ''' register the directory of given stat-result and return False if it was already visited (symlink loop) '''
+    # some platforms do not provide inode numbers, directories cannot be deduplicated there
+    if stat_result.st_ino == 0:
+        return True
+
+    directory_id = (stat_result.st_dev, stat_result.st_ino)
+    if directory_id in visited_directories:
+        return False
+
+    visited_directories.add(directory_id)
+    return True
+
+
+def has_file_extension(filepath, allowed_file_extensions):
+    ''' return True if the given file has one of the provided file-extension(s) '''
+    return str(filepath).endswith(tuple('.' + extension for extension in allowed_file_extensions))
+
+
 def extract_filename(filepath):
     ''' return the filename including the extension '''
     # get last part of file_path
@@ -34,8 +132,23 @@ def extract_filename(filepath):
     return filename
 
 
-def save_metric_to_file(metric, directory_path=''):
-    ''' save given metric to given directory-path. Use (and create) default directory if it does not exist '''
+def get_relative_path(filepath, directory_path=''):
+    ''' return the normalized path of the given file relative to the given directory with '/' as separator, which
+    identifies a file within the analyzed directory (unlike its filename) '''
+    relative_path = os.path.relpath(filepath, directory_path if directory_path != '' else '.')
+
+    return relative_path.replace(os.sep, '/')
+
+
+def save_metric_to_file(metric, directory_path='', additional_columns=None):
+    ''' save given metric to given directory-path. Use (and create) default directory if it does not exist.
+    Additional columns (data series or table with the same index, e.g. the cycle membership) are saved next to the
+    metric '''
+    with Profiler.phase(Profiler.EXPORT):
+        _save_metric_to_file(metric, directory_path, additional_columns)
+
+
+def _save_metric_to_file(metric, directory_path, additional_columns):
     # use default directory if provided path does not exist
     if not Path(directory_path).is_dir() or directory_path == '':
         directory_path = Path.joinpath(Path.cwd().absolute(), DEFAULT_DIRECTORY)
@@ -49,4 +162,105 @@ def save_metric_to_file(metric, directory_path=''):
 
     filename = '{}_{}.csv'.format(metric.name.lower(), datetime.now().strftime('%Y-%m-%d_%H-%M-%S'))
     filepath = Path.joinpath(directory_path, filename)
+    if additional_columns is not None:
+        metric = metric.to_frame().join(additional_columns)
     metric.to_csv(filepath)
+
+
+def save_plot_to_file(draw_plot, file_path, figure_size=None):
+    ''' draw a plot by the given function (called with the axes to draw into) and save it to the given file, whose
+    extension determines the format (e.g. png, svg, pdf). The plot is rendered by the Agg backend without pyplot,
+    hence no window is opened (e.g. on headless machines). The directory of the file is created if it does not exist '''
+    # only needed to render plots, which is rarely done compared to parsing files
+    with Profiler.phase(Profiler.IMPORTS):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+    with Profiler.phase(Profiler.PLOTTING):
+        figure = Figure(figsize=figure_size)
+        FigureCanvasAgg(figure)
+        draw_plot(figure.add_subplot(1, 1, 1))
+
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        figure.savefig(file_path, bbox_inches='tight')
+
+
+def get_export_format(file_path):
+    ''' return the format of the export of all metrics to the given file, given by its extension (see EXPORT_FORMATS).
+    Raise an ExportError if the format is unknown or requires pyarrow, which is not installed '''
+    extension = Path(file_path).suffix.lower()
+    if extension not in EXPORT_FORMATS:
+        raise ExportError('Unknown format of "{}", use one of the extensions {}'.format(
+            file_path, ', '.join(sorted(EXPORT_FORMATS))))
+
+    export_format = EXPORT_FORMATS[extension]
+    if export_format in PYARROW_FORMATS and importlib.util.find_spec('pyarrow') is None:
+        raise ExportError('Exporting to "{}" requires pyarrow, install it or use the extension .csv or .jsonl'.format(
+            file_path))
+
+    return export_format
+
+
+def iterate_metrics_rows(names, columns):
+    ''' yield each row of the given metrics (names of the rows and columns, see MetricsFrame.get_names_and_columns)
+    as dictionary of its name and all columns, the values are plain python values (e.g. to be serialized as JSON) '''
+    keys = [EXPORT_NAME_COLUMN] + list(columns)
+    for row in zip(names, *[column.tolist() for column in columns.values()]):
+        yield dict(zip(keys, row))
+
+
+def _write_csv(names, columns, file_path):
+    ''' write a header of the column names followed by one line per row '''
+    with open(file_path, 'w', newline='') as file:
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow([EXPORT_NAME_COLUMN] + list(columns))
+        writer.writerows(zip(names, *[column.tolist() for column in columns.values()]))
+
+
+def _write_jsonl(names, columns, file_path):
+    ''' write one JSON object per row, row by row without building the whole document '''
+    with open(file_path, 'w') as file:
+        for row in iterate_metrics_rows(names, columns):
+            file.write(json.dumps(row) + '\n')
+
+
+def _write_pyarrow(names, columns, file_path, export_format):
+    ''' write the rows as Parquet file or Arrow IPC file (Feather V2) '''
+    # optional dependency, only imported if one of its formats is exported
+    import pyarrow as pa
+
+    table = pa.table(dict({EXPORT_NAME_COLUMN: names}, **columns))
+    if export_format == PARQUET_FORMAT:
+        import pyarrow.parquet as pq
+        pq.write_table(table, file_path)
+    else:
+        with pa.OSFile(file_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def save_metrics_to_file(names, columns, file_path):
+    ''' save the given metrics (names of the rows and columns, see MetricsFrame.get_names_and_columns) to a single
+    file, one row per file (or component) named by the column "name". The format is given by the extension of the
+    file (see get_export_format), no format requires pandas. Unlike save_metric_to_file the file name is kept as given
+    and an existing file is replaced. The file is written next to its destination and renamed afterwards, hence
+    readers never see a partially written file '''
+    with Profiler.phase(Profiler.EXPORT):
+        export_format = get_export_format(file_path)
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = file_path.with_name(file_path.name + '.tmp')
+
+        if export_format == CSV_FORMAT:
+            _write_csv(names, columns, temporary_path)
+        elif export_format == JSONL_FORMAT:
+            _write_jsonl(names, columns, temporary_path)
+        else:
+            _write_pyarrow(names, columns, str(temporary_path), export_format)
+
+        os.replace(temporary_path, file_path)
+
+
+def save_metrics_frame_to_file(metrics_frame, file_path):
+    ''' save all columns of the given metrics frame (see MetricsFrame) to a single file (see save_metrics_to_file) '''
+    save_metrics_to_file([str(name) for name in metrics_frame.index],
+                         {column: metrics_frame[column].values for column in metrics_frame.columns}, file_path)
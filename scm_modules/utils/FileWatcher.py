@@ -0,0 +1,226 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from scm_modules.utils import FileUtility
+
+
+# changes are collected until no further change happened for this time (in seconds), e.g. an editor saving a file
+DEBOUNCE_INTERVAL = 0.1
+
+# upper bound (in seconds) for collecting a burst of changes
+MAX_DEBOUNCE_TIME = 1.0
+
+# inotify constants (see inotify(7))
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct('iIII')
+_READ_BUFFER_SIZE = 65536
+
+
+class PollingFileWatcher:
+    ''' detect changed code files by comparing the modification time and size of all code files with the previous
+    state, works on every platform but each poll walks the whole directory. Hence the directory is polled at most
+    every poll_interval seconds, however often the changed files are requested '''
+    def __init__(self, directory_path, allowed_file_extensions, poll_interval=0.5):
+        self._directory_path = directory_path
+        self._allowed_file_extensions = allowed_file_extensions
+        self._poll_interval = poll_interval
+        self._file_states = self._get_file_states()
+        self._last_poll_time = time.monotonic()
+
+    def _get_file_states(self):
+        file_states = {}
+        for file_path in FileUtility.iterate_code_files(self._directory_path, self._allowed_file_extensions):
+            try:
+                stat_result = os.stat(file_path)
+                file_states[file_path] = (stat_result.st_mtime_ns, stat_result.st_size)
+            except OSError:
+                continue
+
+        return file_states
+
+    def _poll(self):
+        ''' return the code files which were added, changed or deleted since the last poll '''
+        file_states = self._get_file_states()
+        changed_files = {file_path for file_path, file_state in file_states.items()
+                         if self._file_states.get(file_path) != file_state}
+        changed_files.update(file_path for file_path in self._file_states if file_path not in file_states)
+        self._file_states = file_states
+        self._last_poll_time = time.monotonic()
+
+        return changed_files
+
+    def get_changed_files(self, timeout=0):
+        ''' wait up to timeout seconds for changes and return the set of changed (or deleted) code files, a burst of
+        changes is collected as a whole (debounced). The directory is only polled if the poll interval passed since
+        the last poll, e.g. called without timeout more often than that returns an empty set in between '''
+        end_time = time.monotonic() + timeout
+        changed_files = set()
+        while not changed_files and self._last_poll_time + self._poll_interval <= end_time:
+            time.sleep(max(self._last_poll_time + self._poll_interval - time.monotonic(), 0))
+            changed_files = self._poll()
+
+        # the files are compared by their state, hence a short pause suffices to debounce
+        if changed_files:
+            time.sleep(DEBOUNCE_INTERVAL)
+            changed_files |= self._poll()
+
+        return changed_files
+
+    def close(self):
+        self._file_states = {}
+
+
+class InotifyFileWatcher:
+    ''' detect changed code files using the inotify API of Linux, hence only the changed files are reported without
+    walking the directory. Each (non-hidden) directory is watched, new directories are added automatically '''
+    def __init__(self, directory_path, allowed_file_extensions, libc):
+        self._directory_path = directory_path
+        self._suffixes = tuple('.' + extension for extension in allowed_file_extensions)
+        self._libc = libc
+        self._watched_directories = {}
+        self._watched_directory_ids = set()
+        self._rescan_required = False
+
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        self._add_watches(directory_path)
+
+    def _add_watches(self, directory_path):
+        ''' watch the given directory and all its sub-directories, return the code files found within them '''
+        code_files = []
+        pending_directories = [directory_path]
+        while pending_directories:
+            current_directory = pending_directories.pop()
+            try:
+                stat_result = os.stat(current_directory or '.')
+            except OSError:
+                continue
+
+            # a directory reached twice (symlink loop) is watched once
+            directory_id = (stat_result.st_dev, stat_result.st_ino)
+            if directory_id in self._watched_directory_ids:
+                continue
+
+            watch_descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(current_directory or '.'),
+                                                            _WATCH_MASK)
+            if watch_descriptor >= 0:
+                self._watched_directories[watch_descriptor] = (current_directory, directory_id)
+                self._watched_directory_ids.add(directory_id)
+
+            files, sub_directories = FileUtility.scan_directory(current_directory, self._suffixes, set())
+            code_files += files
+            pending_directories += sub_directories
+
+        return code_files
+
+    def _process_event(self, watch_descriptor, mask, name, changed_files):
+        if mask & _IN_Q_OVERFLOW:
+            # events were lost, the caller has to compare all files
+            self._rescan_required = True
+            return
+
+        if mask & _IN_IGNORED:
+            # the watched directory was removed, its inode might be reused by a new directory
+            _, directory_id = self._watched_directories.pop(watch_descriptor, (None, None))
+            self._watched_directory_ids.discard(directory_id)
+            return
+
+        if watch_descriptor not in self._watched_directories or name.startswith('.'):
+            return
+
+        path = os.path.join(self._watched_directories[watch_descriptor][0], name)
+        if mask & _IN_ISDIR:
+            # code files of a directory moved into the tree did not cause events of their own
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                changed_files.update(self._add_watches(path))
+            else:
+                self._rescan_required = True
+        elif name.endswith(self._suffixes):
+            changed_files.add(path)
+
+    def _read_events(self, timeout, changed_files):
+        ''' wait up to timeout seconds for events and add the changed code files, return False on timeout '''
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not readable:
+            return False
+
+        try:
+            buffer = os.read(self._fd, _READ_BUFFER_SIZE)
+        except BlockingIOError:
+            return True
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buffer):
+            watch_descriptor, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + name_length].rstrip(b'\0'))
+            offset += name_length
+            self._process_event(watch_descriptor, mask, name, changed_files)
+
+        return True
+
+    def get_changed_files(self, timeout=0):
+        ''' wait up to timeout seconds for changes and return the set of changed (or deleted) code files, a burst of
+        changes is collected as a whole (debounced). Return None if events were lost, then all files have to be
+        compared '''
+        changed_files = set()
+        if self._read_events(timeout, changed_files):
+            end_time = time.monotonic() + MAX_DEBOUNCE_TIME
+            while time.monotonic() < end_time and self._read_events(DEBOUNCE_INTERVAL, changed_files):
+                pass
+
+        if self._rescan_required:
+            self._rescan_required = False
+            return None
+
+        return changed_files
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _load_inotify():
+    ''' return the C library if it provides inotify (Linux), None otw. '''
+    library_name = ctypes.util.find_library('c')
+    if library_name is None:
+        return None
+
+    try:
+        libc = ctypes.CDLL(library_name, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+
+    return libc
+
+
+def create_file_watcher(directory_path, allowed_file_extensions, poll_interval=0.5):
+    ''' return a file watcher for the code files of the given directory: inotify is used if available, otherwise
+    the directory is polled every poll_interval seconds '''
+    libc = _load_inotify()
+    if libc is not None:
+        try:
+            return InotifyFileWatcher(directory_path, allowed_file_extensions, libc)
+        except OSError:
+            pass
+
+    return PollingFileWatcher(directory_path, allowed_file_extensions, poll_interval)
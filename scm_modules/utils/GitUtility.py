@@ -0,0 +1,80 @@
+import os
+import subprocess
+
+
+class GitError(RuntimeError):
+    ''' raised if a git command cannot be executed (e.g. git not installed, no repository, unknown revision) '''
+
+
+def _run_git(directory_path, git_arguments):
+    ''' run git with given arguments inside the given directory and return its decoded output '''
+    command = ['git', '-C', directory_path if directory_path != '' else '.'] + git_arguments
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    except OSError as ex:
+        raise GitError('Failed to execute git: {}'.format(ex))
+    except subprocess.CalledProcessError as ex:
+        raise GitError('"{}" failed: {}'.format(' '.join(command), ex.stderr.decode(errors='replace').strip()))
+
+    return result.stdout.decode('utf-8', errors='surrogateescape')
+
+
+def _to_file_path(directory_path, git_path):
+    ''' join a path reported by git (always separated by /) with the directory path '''
+    return os.path.join(directory_path, *git_path.split('/'))
+
+
+def parse_name_status(name_status_output):
+    ''' parse the output of "git diff --name-status -z" and return two lists (changed and deleted paths).
+    Added, modified and copied paths count as changed, renamed paths count as deleted (old) and changed (new) '''
+    changed_paths = []
+    deleted_paths = []
+
+    tokens = name_status_output.split('\0')
+    index = 0
+    while index < len(tokens) and tokens[index] != '':
+        status = tokens[index][0]
+
+        # renames and copies are followed by the source and the destination path
+        if status in ('R', 'C'):
+            source_path, path = tokens[index + 1], tokens[index + 2]
+            if status == 'R':
+                deleted_paths.append(source_path)
+            index += 3
+        else:
+            path = tokens[index + 1]
+            index += 2
+
+        if status == 'D':
+            deleted_paths.append(path)
+        else:
+            changed_paths.append(path)
+
+    return changed_paths, deleted_paths
+
+
+def get_changed_files(directory_path, revision):
+    ''' return the files of given directory which changed since the given revision (including uncommitted and
+    untracked files) as two lists: changed files and deleted files '''
+    name_status_output = _run_git(directory_path, ['diff', '--name-status', '-z', '--relative', '--find-renames',
+                                                   revision, '--'])
+    changed_paths, deleted_paths = parse_name_status(name_status_output)
+
+    # untracked files are not part of the diff, but still might be new code files
+    untracked_output = _run_git(directory_path, ['ls-files', '--others', '--exclude-standard', '-z'])
+    changed_paths += [path for path in untracked_output.split('\0') if path != '']
+
+    return ([_to_file_path(directory_path, path) for path in changed_paths],
+            [_to_file_path(directory_path, path) for path in deleted_paths])
+
+
+def get_commit(directory_path, revision='HEAD'):
+    ''' return the hash of the commit the given revision refers to '''
+    return _run_git(directory_path, ['rev-parse', '--verify', revision + '^{commit}']).strip()
+
+
+def get_uncommitted_files(directory_path):
+    ''' return the files of given directory with uncommitted changes: changed, deleted and untracked files '''
+    changed_files, deleted_files = get_changed_files(directory_path, 'HEAD')
+
+    return changed_files + deleted_files
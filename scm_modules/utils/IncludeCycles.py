@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from scm_modules.utils import IncludeGraph
+
+
+# cycle id of a node which is not part of an include cycle
+NO_CYCLE = -1
+
+
+class _StronglyConnectedComponents:
+    ''' iterative version of Tarjan's algorithm (no recursion, hence no recursion limit) running in O(V+E). The
+    strongly connected components are labeled in reverse topological order: a component only includes components
+    with a smaller label '''
+    def __init__(self, indptr, indices):
+        # plain lists are considerably faster than numpy arrays for element-wise access
+        self._indptr = np.asarray(indptr).tolist()
+        self._indices = np.asarray(indices).tolist()
+        nb_nodes = len(self._indptr) - 1
+
+        self._index = [-1] * nb_nodes
+        self._lowlink = [0] * nb_nodes
+        self._on_stack = [False] * nb_nodes
+        self._stack = []
+        self._next_index = 0
+        self.labels = [-1] * nb_nodes
+        self.nb_components = 0
+
+    def find(self):
+        for root in range(len(self._index)):
+            if self._index[root] == -1:
+                self._visit(root)
+
+        return np.array(self.labels, dtype=np.int64), self.nb_components
+
+    def _push(self, node):
+        self._index[node] = self._lowlink[node] = self._next_index
+        self._next_index += 1
+        self._stack.append(node)
+        self._on_stack[node] = True
+
+    def _visit(self, root):
+        ''' depth-first search starting at root, the call stack holds the nodes and the position of their next edge '''
+        indptr, indices, index, lowlink, on_stack = self._indptr, self._indices, self._index, self._lowlink, self._on_stack
+        self._push(root)
+        call_stack = [root]
+        positions = [indptr[root]]
+        while call_stack:
+            node = call_stack[-1]
+            position, end = positions[-1], indptr[node + 1]
+            while position < end:
+                target = indices[position]
+                position += 1
+                if index[target] == -1:
+                    break
+                if on_stack[target] and index[target] < lowlink[node]:
+                    lowlink[node] = index[target]
+            else:
+                # all edges of node processed
+                call_stack.pop()
+                positions.pop()
+                if call_stack and lowlink[node] < lowlink[call_stack[-1]]:
+                    lowlink[call_stack[-1]] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    self._pop_component(node)
+                continue
+
+            # descend into target, continue with the next edge of node afterwards
+            positions[-1] = position
+            self._push(target)
+            call_stack.append(target)
+            positions.append(indptr[target])
+
+    def _pop_component(self, root):
+        ''' label all nodes on the stack down to root as one strongly connected component '''
+        while True:
+            member = self._stack.pop()
+            self._on_stack[member] = False
+            self.labels[member] = self.nb_components
+            if member == root:
+                break
+
+        self.nb_components += 1
+
+
+def find_strongly_connected_components(indptr, indices):
+    ''' return the label of the strongly connected component of each node of the graph (CSR) and the number of
+    components, the labels are in reverse topological order '''
+    return _StronglyConnectedComponents(indptr, indices).find()
+
+
+def get_cycle_ids(indptr, indices):
+    ''' return the id of the include cycle each node is part of, NO_CYCLE if it is not part of a cycle. A cycle is a
+    strongly connected component of more than one node or a node including itself. Cycles are numbered in order of
+    their first node '''
+    labels, nb_components = find_strongly_connected_components(indptr, indices)
+    nb_nodes = labels.size
+
+    # components of several nodes and self-includes
+    is_cyclic = np.bincount(labels, minlength=nb_components) > 1
+    sources = np.repeat(np.arange(nb_nodes, dtype=np.int64), np.diff(indptr))
+    is_cyclic[labels[sources[sources == np.asarray(indices)]]] = True
+
+    # number the cycles by their first node
+    _, first_nodes = np.unique(labels, return_index=True)
+    cyclic_labels = np.flatnonzero(is_cyclic)
+    cycle_ids_of_labels = np.full(nb_components, NO_CYCLE, dtype=np.int64)
+    cycle_ids_of_labels[cyclic_labels[np.argsort(first_nodes[cyclic_labels], kind='stable')]] = \
+        np.arange(cyclic_labels.size)
+
+    return cycle_ids_of_labels[labels] if nb_nodes else np.zeros(0, dtype=np.int64)
+
+
+def create_condensation(indptr, indices, labels, nb_components):
+    ''' return the condensation (DAG of the strongly connected components) of the graph (CSR) in CSR format, an edge
+    between two components exists if any of their nodes are connected '''
+    nb_nodes = len(indptr) - 1
+    sources = labels[np.repeat(np.arange(nb_nodes, dtype=np.int64), np.diff(indptr))]
+    targets = labels[np.asarray(indices, dtype=np.int64)]
+
+    return IncludeGraph.create_csr(sources[sources != targets], targets[sources != targets], nb_components)
+
+
+def save_condensation(include_graph, file_path):
+    ''' save the condensation of the include-graph as JSON: the components (in topological order, each with its files
+    and whether it is an include cycle) and the edges between them (component x includes component y) '''
+    indptr, indices = include_graph.get_csr()
+    labels, nb_components = find_strongly_connected_components(indptr, indices)
+    cycle_ids = get_cycle_ids(indptr, indices)
+    condensation_indptr, condensation_indices = create_condensation(indptr, indices, labels, nb_components)
+
+    # labels are in reverse topological order, component k of the output has the label nb_components - 1 - k
+    members = [[] for _ in range(nb_components)]
+    for node_name, label in zip(include_graph.get_node_names(), labels.tolist()):
+        members[nb_components - 1 - label].append(node_name)
+    is_cycle = np.zeros(nb_components, dtype=bool)
+    is_cycle[nb_components - 1 - labels[cycle_ids != NO_CYCLE]] = True
+
+    edges = [[nb_components - 1 - label, nb_components - 1 - included_label] for label in range(nb_components)
+             for included_label in condensation_indices[condensation_indptr[label]:condensation_indptr[label + 1]].tolist()]
+
+    Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, 'w') as file:
+        json.dump({'components': [{'id': component_id, 'files': files, 'cycle': bool(is_cycle[component_id])}
+                                  for component_id, files in enumerate(members)],
+                   'edges': sorted(edges)}, file)
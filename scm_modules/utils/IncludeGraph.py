@@ -0,0 +1,93 @@
+from array import array
+import numpy as np
+
+from scm_modules.utils import Profiler
+
+
+class IncludeGraph:
+    ''' directed include-graph with interned node names: each name is mapped to a dense integer id and the
+    edges (x includes y) are stored in compressed sparse row (CSR) format, hence memory stays O(V+E) '''
+    def __init__(self):
+        self._node_ids = {}
+        self._node_names = []
+
+        # edges collected as compact integer arrays, converted to CSR on first access
+        self._edge_sources = array('q')
+        self._edge_targets = array('q')
+        self._indptr = None
+        self._indices = None
+
+    def add_node(self, name):
+        ''' return the id of the given node name, the node is added if not already existing '''
+        node_id = self._node_ids.get(name)
+        if node_id is None:
+            node_id = len(self._node_names)
+            self._node_ids[name] = node_id
+            self._node_names.append(name)
+
+        return node_id
+
+    def add_edge(self, including_name, included_name):
+        ''' add the edge including_name -> included_name, unknown nodes are added '''
+        self.add_edge_between_ids(self.add_node(including_name), self.add_node(included_name))
+
+    def add_edge_between_ids(self, including_id, included_id):
+        ''' add the edge including_id -> included_id between two existing nodes '''
+        self._edge_sources.append(including_id)
+        self._edge_targets.append(included_id)
+
+        # invalidate CSR representation
+        self._indptr = None
+        self._indices = None
+
+    def get_node_id(self, name):
+        ''' return the id of the given node name or None if it does not exist '''
+        return self._node_ids.get(name)
+
+    def get_node_names(self):
+        ''' return all node names ordered by their id '''
+        return self._node_names
+
+    def get_number_of_nodes(self):
+        return len(self._node_names)
+
+    def get_number_of_edges(self):
+        return self.get_csr()[1].size
+
+    def get_csr(self):
+        ''' return the adjacency in CSR format (indptr, indices), where the nodes included by node i are
+        indices[indptr[i]:indptr[i + 1]]. Duplicated edges are contained only once '''
+        if self._indptr is None:
+            self._build_csr()
+
+        return self._indptr, self._indices
+
+    def get_out_degrees(self):
+        ''' return the number of distinct nodes each node includes '''
+        indptr, _ = self.get_csr()
+        return np.diff(indptr)
+
+    def get_in_degrees(self):
+        ''' return the number of distinct nodes each node is included by '''
+        _, indices = self.get_csr()
+        return np.bincount(indices, minlength=self.get_number_of_nodes())
+
+    def _build_csr(self):
+        self._indptr, self._indices = create_csr(np.frombuffer(self._edge_sources, dtype=np.int64),
+                                                 np.frombuffer(self._edge_targets, dtype=np.int64),
+                                                 self.get_number_of_nodes())
+
+
+def create_csr(sources, targets, nb_nodes):
+    ''' return the CSR representation (indptr, indices) of the edges sources[k] -> targets[k] between nb_nodes nodes,
+    duplicated edges are contained only once '''
+    # a file including another one several times still is a single dependency, unique() also sorts
+    # the edges by source and target
+    edge_keys = np.unique(np.asarray(sources, dtype=np.int64) * nb_nodes + np.asarray(targets, dtype=np.int64))
+    sources = edge_keys // max(nb_nodes, 1)
+
+    indptr = np.zeros(nb_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=nb_nodes), out=indptr[1:])
+    Profiler.count(Profiler.CELLS_ALLOCATED, indptr.size + edge_keys.size)
+
+    return indptr, edge_keys % max(nb_nodes, 1)
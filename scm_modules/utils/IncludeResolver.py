@@ -0,0 +1,102 @@
+import posixpath
+
+from scm_modules.utils import AnalysisConfig, CompilationDatabase, FileUtility
+
+
+class IncludeResolver:
+    ''' map the includes of a file to the files of the analyzed directory. Files are identified by their normalized
+    relative path and interned to dense integer ids (their position in the given list of paths). An include is
+    resolved like the preprocessor does: relative to the directory of the including file first (only for
+    user-includes), then relative to the include directories of the including file (e.g. from a compilation database)
+    and the include directories of all files (e.g. -I options). Otherwise it is resolved by the known file whose path
+    ends with the included path, if several files match, the one closest to the including file is taken (longest
+    common directory, then the smallest path). Include directories are given relative to the analyzed directory '''
+    def __init__(self, file_paths, include_directories=(), include_directories_of_files=None):
+        self._file_paths = list(file_paths)
+        self._file_ids = {}
+        self._file_ids_by_name = {}
+        for file_id, file_path in enumerate(self._file_paths):
+            self._file_ids.setdefault(file_path, file_id)
+            self._file_ids_by_name.setdefault(posixpath.basename(file_path), []).append(file_id)
+
+        self._include_directories = tuple(include_directories)
+        self._include_directories_of_files = include_directories_of_files or {}
+
+        # suffix map (included path -> ids of the files ending with it), filled once per distinct included path
+        self._file_ids_by_suffix = {}
+
+        # files of the same directory usually include the same headers, hence the results are cached per directory
+        self._resolved_includes = {}
+
+    def resolve(self, including_path, include, search_including_directory=True):
+        ''' return the id of the file included by the given file (relative path) or None if the include does not
+        refer to a known file (e.g. a header of a library) '''
+        include_directories = self._include_directories_of_files.get(including_path, ()) + self._include_directories
+        if search_including_directory:
+            include_directories = (posixpath.dirname(including_path),) + include_directories
+
+        key = (posixpath.dirname(including_path), include, include_directories)
+        if key not in self._resolved_includes:
+            self._resolved_includes[key] = self._resolve(key[0], include, include_directories)
+
+        return self._resolved_includes[key]
+
+    def _resolve(self, including_directory, include, include_directories):
+        for include_directory in include_directories:
+            file_id = self._file_ids.get(posixpath.normpath(posixpath.join(include_directory, include)))
+            if file_id is not None:
+                return file_id
+
+        candidates = self._get_file_ids_with_suffix(posixpath.normpath(include))
+        if not candidates:
+            return None
+
+        return min(candidates, key=lambda file_id: (-_get_common_directory_length(including_directory,
+                                                                                  self._file_paths[file_id]),
+                                                    self._file_paths[file_id]))
+
+    def _get_file_ids_with_suffix(self, include):
+        ''' return the ids of the files whose path ends with all components of the included path '''
+        if include not in self._file_ids_by_suffix:
+            self._file_ids_by_suffix[include] = [
+                file_id for file_id in self._file_ids_by_name.get(posixpath.basename(include), [])
+                if self._file_paths[file_id] == include or self._file_paths[file_id].endswith('/' + include)]
+
+        return self._file_ids_by_suffix[include]
+
+
+def _get_common_directory_length(directory, file_path):
+    ''' return the number of leading directories the given directory and the directory of the file have in common '''
+    common_length = 0
+    for part, other_part in zip(directory.split('/'), posixpath.dirname(file_path).split('/')):
+        if part != other_part or not part:
+            break
+        common_length += 1
+
+    return common_length
+
+
+def add_include_edges(include_graph, include_resolver, including_id, includes, search_including_directory=True):
+    ''' add an edge from the given node of the include-graph to each included file, includes not resolved to a known
+    file are added as nodes named by the included path '''
+    including_path = include_graph.get_node_names()[including_id]
+    for include in includes:
+        included_id = include_resolver.resolve(including_path, include, search_including_directory)
+        if included_id is None:
+            included_id = include_graph.add_node(include)
+
+        include_graph.add_edge_between_ids(including_id, included_id)
+
+
+def create_include_resolver(file_paths, dir_path):
+    ''' return an IncludeResolver for the given files (paths relative to dir_path), which searches the include
+    directories and the compilation database configured in AnalysisConfig '''
+    include_directories = [FileUtility.get_relative_path(include_directory, dir_path)
+                           for include_directory in AnalysisConfig.INCLUDE_DIRECTORIES]
+
+    include_directories_of_files = {}
+    for file_path, directories in (CompilationDatabase.get_compilation_database() or {}).items():
+        include_directories_of_files[FileUtility.get_relative_path(file_path, dir_path)] = \
+            tuple(FileUtility.get_relative_path(directory, dir_path) for directory in directories)
+
+    return IncludeResolver(file_paths, include_directories, include_directories_of_files)
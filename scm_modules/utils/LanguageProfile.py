@@ -0,0 +1,57 @@
+import re
+
+from scm_modules.utils import ProgrammingLanguageConfig
+
+
+# names of the groups of the include pattern
+USER_INCLUDE_GROUP = 'user'
+STL_INCLUDE_GROUP = 'stl'
+
+# names of the groups of the fused class-counting pattern
+NAMESPACE_GROUP = 'namespace'
+CLASS_GROUP = 'class'
+ABSTRACT_METHOD_GROUP = 'abstract_method'
+
+
+class LanguageProfile:
+    ''' everything the scanners need to know about a programming language, built once per run: the precompiled
+    patterns. Includes are found by a single bytes pattern, which is applied to the whole content of a file.
+    Namespace, class and abstract method definitions are fused into a single alternation, hence each line is matched
+    only once. This requires that a line can match at most one of them, which holds as they start with different
+    keywords (namespace, class/struct, virtual) '''
+    def __init__(self, programming_language, include_pattern, namespace_identifier, class_identifier,
+                 abstract_method_identifier):
+        self.programming_language = programming_language
+        self.include_pattern = re.compile(include_pattern, re.MULTILINE)
+        self.class_definition_pattern = re.compile('(?P<{}>{})|(?P<{}>{})|(?P<{}>{})'.format(
+            NAMESPACE_GROUP, namespace_identifier, CLASS_GROUP, class_identifier, ABSTRACT_METHOD_GROUP,
+            abstract_method_identifier))
+
+    def find_includes(self, content):
+        ''' return the included files (user-includes and stl-includes as two lists of bytes) of the given file
+        content (bytes or a memory-mapped file) '''
+        user_includes = []
+        stl_includes = []
+        for match in self.include_pattern.finditer(content):
+            if match.lastgroup == USER_INCLUDE_GROUP:
+                user_includes.append(match.group(USER_INCLUDE_GROUP))
+            else:
+                stl_includes.append(match.group(STL_INCLUDE_GROUP))
+
+        return user_includes, stl_includes
+
+    def match_class_definition(self, line):
+        ''' return the name of the group (NAMESPACE_GROUP, CLASS_GROUP, ABSTRACT_METHOD_GROUP) matching the start of
+        the given line or None '''
+        match = self.class_definition_pattern.match(line)
+        return None if match is None else match.lastgroup
+
+
+def create_language_profile():
+    ''' return the LanguageProfile of the programming language set in ProgrammingLanguageConfig, raise a
+    LanguageOptionError if the language is not supported '''
+    return LanguageProfile(ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE,
+                           ProgrammingLanguageConfig.get_include_pattern(),
+                           ProgrammingLanguageConfig.get_namespace_identifier(),
+                           ProgrammingLanguageConfig.get_class_identifier(),
+                           ProgrammingLanguageConfig.get_abstract_method_identifier())
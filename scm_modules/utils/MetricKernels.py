@@ -0,0 +1,71 @@
+import numpy as np
+
+
+def _divide_or_zero(numerator, denominator):
+    ''' element-wise numerator / denominator, where a denominator of 0 results in 0 '''
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+
+    result = np.zeros(np.broadcast(numerator, denominator).shape, dtype=float)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+
+    return result
+
+
+def compute_instability(fan_in, fan_out):
+    ''' compute the instability metric I = fan_out / (fan_in + fan_out) for whole arrays of any shape:
+    1 -> unstable, 0 -> stable. Entries without any dependency (fan_in + fan_out = 0) get an instability of 0 '''
+    fan_in = np.asarray(fan_in, dtype=float)
+    fan_out = np.asarray(fan_out, dtype=float)
+
+    return _divide_or_zero(fan_out, fan_in + fan_out)
+
+
+def compute_abstractness(nb_interfaces, nb_classes):
+    ''' compute the abstractness metric A = N_a / N_c for whole arrays of any shape:
+    0 -> no abstract classes, 1 -> only abstract classes. Entries without any class (N_c = 0) get an abstractness of 0 '''
+    return _divide_or_zero(nb_interfaces, nb_classes)
+
+
+def compute_distance(abstractness, instability):
+    ''' compute the distance D = |A + I - 1| for whole arrays of any shape:
+    0 -> on the Main Sequence, 1 -> far away from the Main Sequence '''
+    return np.abs(np.asarray(abstractness, dtype=float) + np.asarray(instability, dtype=float) - 1)
+
+
+def get_top_indices(values, nb_top):
+    ''' return the indices of the nb_top largest values in descending order (equal values by index). Only the top
+    values are sorted, they are selected by a partial sort in O(n) '''
+    values = np.asarray(values, dtype=float)
+    nb_top = min(max(nb_top, 0), values.size)
+    if nb_top == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # all values equal to the smallest selected value are candidates, hence ties are broken by index
+    threshold = values[np.argpartition(-values, nb_top - 1)[nb_top - 1]]
+    candidates = np.flatnonzero(values >= threshold)
+
+    return candidates[np.lexsort((candidates, -values[candidates]))][:nb_top]
+
+
+def compute_group_quantiles(values, groups, nb_groups, quantiles):
+    ''' compute the given quantiles (in [0, 1], linear interpolation) of the values of each group in one pass over all
+    values, groups contains the group (0...nb_groups-1) of each value. Return an array of shape (number of
+    quantiles, nb_groups), groups without values get NaN '''
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups, dtype=np.int64)
+
+    # values sorted by group and value, the values of a group are consecutive
+    sorted_values = values[np.lexsort((values, groups))]
+    counts = np.bincount(groups, minlength=nb_groups)
+    starts = np.cumsum(counts) - counts
+
+    result = np.full((len(quantiles), nb_groups), np.nan)
+    non_empty = counts > 0
+    for row, quantile in enumerate(quantiles):
+        positions = starts[non_empty] + quantile * (counts[non_empty] - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.ceil(positions).astype(np.int64)
+        result[row, non_empty] = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (positions - lower)
+
+    return result
@@ -0,0 +1,59 @@
+from scm_modules.utils import Profiler
+
+
+# pandas is imported by the functions creating a metrics frame only, the column names (and the module) are used by the
+# pandas-free computation of the metrics (see FileMetrics) as well
+
+# columns of a metrics frame (one row per file)
+INSTABILITY = 'I'
+ABSTRACTNESS = 'A'
+DISTANCE = 'D'
+FAN_IN = 'fan_in'
+FAN_OUT = 'fan_out'
+NB_INTERFACES = 'N_a'
+NB_CLASSES = 'N_c'
+CYCLE = 'cycle'
+COLUMNS = [INSTABILITY, ABSTRACTNESS, DISTANCE, FAN_IN, FAN_OUT, NB_INTERFACES, NB_CLASSES, CYCLE]
+COUNT_COLUMNS = [FAN_IN, FAN_OUT, NB_INTERFACES, NB_CLASSES]
+
+# names of the single metrics (e.g. used for the files the metrics are saved to)
+INSTABILITY_METRIC_NAME = 'Instability-Metric'
+ABSTRACTNESS_METRIC_NAME = 'Abstractness-Metric'
+DISTANCE_METRIC_NAME = 'Distance_IA'
+CYCLE_MEMBERSHIP_NAME = 'Cycle'
+
+# value of files missing in one of the metrics (e.g. source files are not considered by the abstractness metric)
+DEFAULT_VALUE = 0
+
+
+def create_metrics_frame_from_columns(names, columns):
+    ''' return the metrics frame of the given files or components (their names) and the columns computed without
+    pandas (column -> array with one entry per row, see FileMetrics), the columns keep their order '''
+    import pandas as pd
+
+    Profiler.count(Profiler.CELLS_ALLOCATED, len(names) * len(columns))
+
+    return pd.DataFrame(columns, index=pd.Index(names, dtype=object), columns=list(columns))
+
+
+def get_names_and_columns(metrics_frame):
+    ''' return the names of the rows and the columns (column -> array) of the given metrics frame, i.e. the input of
+    create_metrics_frame_from_columns '''
+    return [str(name) for name in metrics_frame.index], \
+        {column: metrics_frame[column].values for column in metrics_frame.columns}
+
+
+def get_instability_metric(metrics_frame):
+    return metrics_frame[INSTABILITY].rename(INSTABILITY_METRIC_NAME)
+
+
+def get_abstractness_metric(metrics_frame):
+    return metrics_frame[ABSTRACTNESS].rename(ABSTRACTNESS_METRIC_NAME)
+
+
+def get_distance_metric(metrics_frame):
+    return metrics_frame[DISTANCE].rename(DISTANCE_METRIC_NAME)
+
+
+def get_cycle_membership(metrics_frame):
+    return metrics_frame[CYCLE].rename(CYCLE_MEMBERSHIP_NAME)
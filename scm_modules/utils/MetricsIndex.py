@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+
+from scm_modules.utils import ComponentMetrics, DataSeriesUtility, FileUtility, MetricsFrame
+
+
+# metrics which can be used to rank the files
+METRIC_COLUMNS = ['instability', 'abstractness', 'distance', 'fan_in', 'fan_out']
+
+# names of the columns of a metrics frame in the answers of the index
+FRAME_COLUMNS = {MetricsFrame.INSTABILITY: 'instability', MetricsFrame.ABSTRACTNESS: 'abstractness',
+                 MetricsFrame.DISTANCE: 'distance', MetricsFrame.FAN_IN: 'fan_in', MetricsFrame.FAN_OUT: 'fan_out'}
+
+
+class _DirectoryComponent:
+    ''' component mapping (see ComponentMapping) of a single directory, given by the prefix of its files '''
+    def __init__(self, prefix):
+        self._prefix = prefix
+
+    def get_component(self, relative_path):
+        return self._prefix if relative_path.startswith(self._prefix) else None
+
+
+class MetricsIndex:
+    ''' in-memory index of the metrics of all files, built once from the scanned files (FileRecords) to answer
+    queries without scanning again. Files are identified by their path relative to the analyzed directory. A component
+    is a directory (relative to the analyzed directory), its metrics are aggregated from the file metrics and the
+    include-graph (see ComponentMetrics) '''
+    def __init__(self, dir_path, file_records):
+        self._dir_path = dir_path
+        self._metrics_frame, self._include_graph = DataSeriesUtility.compute_file_metrics(dir_path, list(file_records))
+        self._table = self._metrics_frame.rename(columns=FRAME_COLUMNS)[METRIC_COLUMNS]
+
+        self._paths_of_filenames = {}
+        for relative_path in self._table.index:
+            self._paths_of_filenames.setdefault(os.path.basename(relative_path), []).append(relative_path)
+
+    def _get_relative_path(self, path):
+        ''' return the given path (absolute or relative to the analyzed directory) relative to the analyzed directory '''
+        return FileUtility.get_relative_path(os.path.join(self._dir_path, path), self._dir_path)
+
+    def get_number_of_files(self):
+        return len(self._table)
+
+    def get_file_metrics(self, file):
+        ''' return the metrics of the given file (path relative to the analyzed directory or a filename incl. extension
+        which is unique within the directory) as a dict, None if the file is unknown or ambiguous '''
+        relative_path = self._get_relative_path(file)
+        if relative_path not in self._table.index:
+            paths_of_filename = self._paths_of_filenames.get(file, [])
+            if len(paths_of_filename) != 1:
+                return None
+            relative_path = paths_of_filename[0]
+
+        return _to_metrics_dict(_get_file_identity(relative_path), self._table.loc[relative_path])
+
+    def get_component_metrics(self, component):
+        ''' return the metrics of the given component (directory relative to the analyzed directory) as a dict, None
+        if it does not contain any file. fan_in is the number of files outside the component included by it, fan_out
+        the number of files outside the component including it '''
+        component = self._get_relative_path(component)
+        component_metrics_frame = ComponentMetrics.create_component_metrics_frame(
+            self._include_graph, self._metrics_frame, _DirectoryComponent('' if component == '.' else component + '/'))
+        if component_metrics_frame.empty:
+            return None
+
+        metrics = component_metrics_frame.rename(columns=FRAME_COLUMNS).iloc[0]
+
+        return _to_metrics_dict({'component': component, 'files': int(metrics[ComponentMetrics.NB_FILES])}, metrics)
+
+    def get_top_files(self, number_of_files, metric='distance'):
+        ''' return the metrics of the number_of_files files with the highest value of the given metric (worst first,
+        ties ordered by path) '''
+        if metric not in METRIC_COLUMNS:
+            raise ValueError('Unknown metric "{}", use one of {}'.format(metric, ', '.join(METRIC_COLUMNS)))
+
+        order = np.lexsort((self._table.index.values.astype(str), -self._table[metric].values))
+        top_table = self._table.iloc[order[:max(number_of_files, 0)]]
+
+        return [_to_metrics_dict(_get_file_identity(relative_path), row) for relative_path, row in top_table.iterrows()]
+
+
+def _get_file_identity(relative_path):
+    return {'file': os.path.basename(relative_path), 'path': relative_path}
+
+
+def _to_metrics_dict(identity, metrics):
+    ''' return the given identity (e.g. file and path) extended by the metrics, converted to JSON-compatible types '''
+    metrics_dict = dict(identity)
+    for column in METRIC_COLUMNS:
+        metrics_dict[column] = int(metrics[column]) if column in ('fan_in', 'fan_out') else float(metrics[column])
+
+    return metrics_dict
@@ -0,0 +1,157 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import socketserver
+import stat
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from scm_modules.utils import AnalysisSession, FileWatcher, MetricsIndex, SourceFileScanner
+
+
+# default address of the metrics server (localhost only)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# number of files returned by /top if not requested otherwise
+DEFAULT_TOP_N = 10
+
+
+class MetricsService:
+    ''' answer metric queries of a directory from an in-memory index. The files are scanned once, a refresh scans
+    only the files changed since the last refresh (reported by a file watcher or given explicitly) '''
+    def __init__(self, dir_path):
+        self._dir_path = dir_path
+
+        # the index is swapped under the lock, refreshes are serialized by their own lock and do not block queries
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+        # the watcher is created before scanning, hence files changed while scanning are found by the next refresh
+        self._file_watcher = FileWatcher.create_file_watcher(dir_path, SourceFileScanner.get_file_extensions())
+        self._session = AnalysisSession.AnalysisSession(dir_path)
+        try:
+            self._session.scan()
+        except BaseException:
+            self._file_watcher.close()
+            raise
+        self._index = MetricsIndex.MetricsIndex(dir_path, self._session.get_file_records())
+
+    def refresh(self, changed_files=None):
+        ''' scan the given files again (paths relative to the analyzed directory), if no files are given the changes
+        reported by the file watcher are used. Queries are answered by the previous index until the new one is built.
+        Return a summary of the refresh '''
+        start_time = time.perf_counter()
+        with self._refresh_lock:
+            if changed_files is None:
+                updated = self._session.update_changed_files(self._file_watcher)
+            else:
+                self._session.update_files({os.path.join(self._dir_path, file_path) for file_path in changed_files})
+                updated = True
+            index = MetricsIndex.MetricsIndex(self._dir_path, self._session.get_file_records()) if updated else None
+
+            with self._lock:
+                if index is not None:
+                    self._index = index
+
+                return {'updated': updated, 'files': self._index.get_number_of_files(),
+                        'milliseconds': round((time.perf_counter() - start_time) * 1000, 1)}
+
+    def get_index(self):
+        ''' return the current index, an index is never changed after its creation '''
+        with self._lock:
+            return self._index
+
+    def close(self):
+        self._file_watcher.close()
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    ''' JSON API of the metrics server:
+    GET  /metrics?file=<path>          metrics of a file (path relative to the analyzed directory or unique filename)
+    GET  /metrics?component=<dir>      metrics of a component (directory relative to the analyzed directory)
+    GET  /top?n=<N>&metric=<metric>    N files with the highest value of the metric (default: distance)
+    POST /refresh                      scan changed files again, optional body {"files": [<path>, ...]} '''
+    service = None
+
+    def _send_json(self, status, content):
+        body = json.dumps(content).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _get_metrics(self, query):
+        index = self.service.get_index()
+        if 'file' in query:
+            metrics = index.get_file_metrics(query['file'][0])
+        elif 'component' in query:
+            metrics = index.get_component_metrics(query['component'][0])
+        else:
+            return self._send_json(400, {'error': 'Query parameter "file" or "component" is required'})
+
+        if metrics is None:
+            return self._send_json(404, {'error': 'Unknown file or component'})
+
+        return self._send_json(200, metrics)
+
+    def _get_top(self, query):
+        try:
+            top_files = self.service.get_index().get_top_files(int(query.get('n', [DEFAULT_TOP_N])[0]),
+                                                               query.get('metric', ['distance'])[0])
+        except ValueError as ex:
+            return self._send_json(400, {'error': str(ex)})
+
+        return self._send_json(200, top_files)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/metrics':
+            self._get_metrics(query)
+        elif url.path == '/top':
+            self._get_top(query)
+        else:
+            self._send_json(404, {'error': 'Unknown path "{}"'.format(url.path)})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/refresh':
+            return self._send_json(404, {'error': 'Unknown path "{}"'.format(self.path)})
+
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(content_length) or b'{}')
+            changed_files = request.get('files')
+            if changed_files is not None and (not isinstance(changed_files, list) or
+                                              not all(isinstance(file_path, str) for file_path in changed_files)):
+                raise ValueError('"files" has to be a list of paths')
+        except (ValueError, AttributeError) as ex:
+            return self._send_json(400, {'error': 'Invalid request: {}'.format(ex)})
+
+        return self._send_json(200, self.service.refresh(changed_files))
+
+    def address_string(self):
+        # clients of a Unix socket do not have an address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix-socket'
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def create_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None):
+    ''' return a server answering requests with the given MetricsService, either on host:port or on a Unix socket '''
+    handler = type('BoundMetricsRequestHandler', (MetricsRequestHandler,), {'service': service})
+    if unix_socket is not None:
+        # a socket left over by a previous server is replaced, any other file is kept (binding fails then)
+        if os.path.exists(unix_socket) and stat.S_ISSOCK(os.stat(unix_socket).st_mode):
+            os.remove(unix_socket)
+        return _ThreadingUnixHTTPServer(unix_socket, handler)
+
+    return _ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,45 @@
+import json
+
+from scm_modules.utils import DataSeriesUtility, FileUtility, MetricsFrame, Profiler, SourceFileScanner
+
+
+# value of the key "type" of a line: a scanned file or the metrics of a file (or component)
+FILE_LINE = 'file'
+METRICS_LINE = 'metrics'
+
+
+def _write_line(stream, line):
+    stream.write(json.dumps(line) + '\n')
+
+
+def get_file_line(dir_path, file_record):
+    ''' return the line of a scanned file (FileRecord): its path relative to the analyzed directory, its includes and
+    the number of interfaces and classes '''
+    relative_path = FileUtility.get_relative_path(file_record.file_path, dir_path)
+
+    return {'type': FILE_LINE, FileUtility.EXPORT_NAME_COLUMN: relative_path,
+            'user_includes': file_record.user_includes, 'stl_includes': file_record.stl_includes,
+            MetricsFrame.NB_INTERFACES: file_record.nb_interfaces, MetricsFrame.NB_CLASSES: file_record.nb_classes}
+
+
+def stream_metrics(dir_path, stream):
+    ''' write the results of the analysis of the given directory as JSON Lines (NDJSON) to the given stream (e.g.
+    stdout) while the files are scanned: one line per file as soon as it is scanned, followed by one line of metrics
+    per file (or component, see DataSeriesUtility.compute_metrics_columns) once all files are scanned. Each line has
+    the key "type" (FILE_LINE or METRICS_LINE). The metrics are computed without pandas. Return the names of the rows
+    and the columns of the metrics '''
+    file_records = []
+    with Profiler.phase(Profiler.PARSING):
+        for file_record in SourceFileScanner.iterate_code_file_records(dir_path):
+            file_records.append(file_record)
+            _write_line(stream, get_file_line(dir_path, file_record))
+
+            # flushed at once, the consumer of the stream (e.g. a pipe) reads each file while the next ones are scanned
+            stream.flush()
+
+    names, columns = DataSeriesUtility.compute_metrics_columns(dir_path, file_records)
+    for row in FileUtility.iterate_metrics_rows(names, columns):
+        _write_line(stream, dict({'type': METRICS_LINE}, **row))
+    stream.flush()
+
+    return names, columns
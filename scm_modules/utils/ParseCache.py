@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import sqlite3
+import time
+
+from scm_modules.utils import ProgrammingLanguageConfig
+
+
+# default directory and filename of the cache (relative to the current working directory)
+DEFAULT_CACHE_DIRECTORY = '.scm_cache'
+CACHE_FILENAME = 'parse_cache.sqlite3'
+SNAPSHOT_FILENAME = 'snapshot_{}.json'
+
+# least recently used entries are evicted once the cache holds more entries
+DEFAULT_MAX_ENTRIES = 1000000
+
+# increment if the parsing changes, cached results of older versions are discarded
+CACHE_FORMAT_VERSION = 3
+
+
+class ParseCache:
+    ''' persistent SQLite cache of parsed files (includes and number of interfaces/classes).
+    An entry is valid if modification time and size of the file did not change, otw. the content hash decides.
+    This way files, which were only touched (e.g. by a fresh checkout), do not need to be parsed again '''
+    def __init__(self, cache_directory=DEFAULT_CACHE_DIRECTORY, max_entries=DEFAULT_MAX_ENTRIES):
+        Path(cache_directory).mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(Path(cache_directory, CACHE_FILENAME)))
+        self._max_entries = max_entries
+        self._run_timestamp = time.time()
+        self._used_keys = []
+
+        # stat-result of files which need to be (re-)parsed, used when storing the result
+        self._pending_files = {}
+
+        # content of files read to compare their hash which need to be parsed, the scan does not read them again
+        self._read_contents = {}
+
+        self._create_tables()
+        self._discard_other_formats()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _create_tables(self):
+        self._connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime_ns INTEGER, '
+                                 'size INTEGER, content_hash TEXT, counted_classes INTEGER, parsed_file TEXT, '
+                                 'last_used REAL)')
+
+    def _discard_other_formats(self):
+        ''' cached results depend on the format version and the programming language, drop them if either changed '''
+        cache_format = '{}:{}'.format(CACHE_FORMAT_VERSION, ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE)
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+
+        if row is None or row[0] != cache_format:
+            self._connection.execute('DELETE FROM files')
+            self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('format', ?)", (cache_format,))
+            self._connection.commit()
+
+    @staticmethod
+    def _get_key(file_path):
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def _read_content(file_path):
+        with open(file_path, 'rb') as file:
+            return file.read()
+
+    def get_parsed_file(self, file_path, count_classes):
+        ''' return the cached (user_includes, stl_includes, nb_interfaces, nb_classes) of given file,
+        or None if the file is not cached or changed '''
+        key = self._get_key(file_path)
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+
+        row = self._connection.execute('SELECT mtime_ns, size, content_hash, counted_classes, parsed_file FROM files '
+                                       'WHERE path = ?', (key,)).fetchone()
+        self._pending_files[key] = stat_result
+
+        # classes need to be counted, but were not when the file was cached
+        if row is None or (count_classes and not row[3]):
+            return None
+
+        mtime_ns, size, content_hash, _, parsed_file = row
+        if (mtime_ns, size) != (stat_result.st_mtime_ns, stat_result.st_size):
+            # a changed size always indicates a changed content, otw. compare content hashes
+            if size != stat_result.st_size or not self._has_same_content(key, file_path, stat_result, content_hash):
+                return None
+
+        del self._pending_files[key]
+        self._used_keys.append(key)
+
+        user_includes, stl_includes, nb_interfaces, nb_classes = json.loads(parsed_file)
+        if not count_classes:
+            nb_interfaces, nb_classes = 0, 0
+
+        return user_includes, stl_includes, nb_interfaces, nb_classes
+
+    def _has_same_content(self, key, file_path, stat_result, content_hash):
+        ''' compare content hashes and update modification time of cached entry if the content did not change. The
+        content of a changed file is kept until it is taken by pop_read_content '''
+        content = self._read_content(file_path)
+        if get_content_hash(content) != content_hash:
+            self._read_contents[key] = content
+            return False
+
+        self._connection.execute('UPDATE files SET mtime_ns = ? WHERE path = ?', (stat_result.st_mtime_ns, key))
+        return True
+
+    def pop_read_content(self, file_path):
+        ''' return the content of the given file if get_parsed_file read it to compare its hash and found it changed
+        (None otw.), hence the file does not need to be read again to parse it '''
+        return self._read_contents.pop(self._get_key(file_path), None)
+
+    def store_parsed_file(self, file_path, count_classes, parsed_file, content_hash):
+        ''' store the parsed file (user_includes, stl_includes, nb_interfaces, nb_classes) and the hash of the parsed
+        content (see get_content_hash, computed by whoever read the file) in the cache, the file is not read again '''
+        key = self._get_key(file_path)
+        try:
+            # prefer the stat-result taken before the file was parsed
+            stat_result = self._pending_files.pop(key, None) or os.stat(file_path)
+        except OSError:
+            return
+
+        self._connection.execute('INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash, counted_classes, '
+                                 'parsed_file, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                 (key, stat_result.st_mtime_ns, stat_result.st_size, content_hash, int(count_classes),
+                                  json.dumps(list(parsed_file)), self._run_timestamp))
+
+    def get_number_of_entries(self):
+        return self._connection.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def _evict_least_recently_used(self):
+        nb_entries_to_evict = self.get_number_of_entries() - self._max_entries
+        if nb_entries_to_evict > 0:
+            self._connection.execute('DELETE FROM files WHERE path IN '
+                                     '(SELECT path FROM files ORDER BY last_used ASC LIMIT ?)', (nb_entries_to_evict,))
+
+    def close(self):
+        ''' mark used entries, evict entries exceeding the maximum size and write everything to disk '''
+        if self._connection is None:
+            return
+
+        self._connection.executemany('UPDATE files SET last_used = ? WHERE path = ?',
+                                     ((self._run_timestamp, key) for key in self._used_keys))
+        self._evict_least_recently_used()
+        self._connection.commit()
+        self._connection.close()
+        self._connection = None
+
+
+def get_content_hash(content):
+    ''' return the hash of the given file content, which decides if a touched file changed '''
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def clear_cache(cache_directory=DEFAULT_CACHE_DIRECTORY):
+    ''' remove all cached entries and snapshots by deleting the respective files '''
+    cache_files = [Path(cache_directory, CACHE_FILENAME)] + list(Path(cache_directory).glob(SNAPSHOT_FILENAME.format('*')))
+    for cache_file in cache_files:
+        if cache_file.is_file():
+            cache_file.unlink()
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+class PointIndex:
+    ''' uniform grid index of 2D points (e.g. the files in the Main Sequence diagram) to find the points close to a
+    position without checking all points. The grid covers the bounding box of the points, its size is chosen such
+    that a cell contains the given number of points on average. The points are sorted by cell (row-major), hence the
+    points of consecutive cells of a row are stored consecutively and a query reads one slice per row of cells '''
+    def __init__(self, x, y, points_per_cell=4, max_grid_size=1024):
+        self._x = np.asarray(x, dtype=float)
+        self._y = np.asarray(y, dtype=float)
+        nb_points = self._x.size
+
+        self._grid_size = int(min(max(np.sqrt(nb_points / points_per_cell), 1), max_grid_size))
+        self._origin = (self._x.min(), self._y.min()) if nb_points else (0., 0.)
+        extent = (self._x.max() - self._origin[0], self._y.max() - self._origin[1]) if nb_points else (1., 1.)
+        self._cell_size = tuple(max(length, np.finfo(float).eps) / self._grid_size for length in extent)
+
+        cells = self._get_rows(self._y) * self._grid_size + self._get_columns(self._x)
+        self._points = np.argsort(cells, kind='stable')
+        self._cell_starts = np.zeros(self._grid_size * self._grid_size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self._grid_size * self._grid_size), out=self._cell_starts[1:])
+
+    def _get_columns(self, x):
+        return np.clip(((np.asarray(x) - self._origin[0]) / self._cell_size[0]).astype(np.int64), 0,
+                       self._grid_size - 1)
+
+    def _get_rows(self, y):
+        return np.clip(((np.asarray(y) - self._origin[1]) / self._cell_size[1]).astype(np.int64), 0,
+                       self._grid_size - 1)
+
+    def query(self, x, y, radius_x, radius_y):
+        ''' return the indices of the points within the ellipse of the given radii around (x, y), ordered by their
+        distance (relative to the radii) and by index '''
+        first_column, last_column = self._get_columns([x - radius_x, x + radius_x])
+        first_row, last_row = self._get_rows([y - radius_y, y + radius_y])
+
+        row_starts = np.arange(first_row, last_row + 1) * self._grid_size
+        candidates = np.concatenate([self._points[self._cell_starts[row_start + first_column]:
+                                                  self._cell_starts[row_start + last_column + 1]]
+                                     for row_start in row_starts])
+
+        distances = ((self._x[candidates] - x) / radius_x) ** 2 + ((self._y[candidates] - y) / radius_y) ** 2
+        close = distances <= 1
+
+        return candidates[close][np.lexsort((candidates[close], distances[close]))]
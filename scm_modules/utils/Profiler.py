@@ -0,0 +1,118 @@
+from contextlib import contextmanager
+import os
+import time
+
+from scm_modules.utils import AnalysisConfig
+
+
+# phases of a run, reported in this order (phases not entered are omitted). The modules imported lazily (pandas,
+# matplotlib) are imported within the imports phase before the phase using them, hence it measures its own work only
+IMPORTS = 'imports'
+DISCOVERY = 'discovery'
+PARSING = 'parsing'
+INCLUDE_GRAPH = 'include graph'
+METRICS = 'metrics'
+METRICS_FRAME = 'metrics frame'
+CONDENSATION = 'condensation'
+COMPONENTS = 'components'
+PLOTTING = 'plotting'
+EXPORT = 'export'
+PHASES = [IMPORTS, DISCOVERY, PARSING, INCLUDE_GRAPH, METRICS, METRICS_FRAME, CONDENSATION, COMPONENTS, PLOTTING, EXPORT]
+
+# counters of the hot paths
+FILES_READ = 'files read'
+BYTES_READ = 'bytes read'
+LINES_READ = 'lines read'
+REGEX_EVALUATIONS = 'regex evaluations'
+CELLS_ALLOCATED = 'cells allocated'
+COUNTERS = [FILES_READ, BYTES_READ, LINES_READ, REGEX_EVALUATIONS, CELLS_ALLOCATED]
+
+# wall time, cpu time (including finished worker processes) and number of calls of each phase, the time of a phase
+# excludes the time of the phases entered within it
+_phase_times = {}
+
+# phases entered but not yet left: name, wall and cpu time at entering, wall and cpu time of the nested phases
+_phase_stack = []
+
+_counters = {}
+
+
+def _get_cpu_time():
+    times = os.times()
+
+    return times.user + times.system + times.children_user + times.children_system
+
+
+@contextmanager
+def phase(name):
+    ''' measure the wall and cpu time of the code within the context as the given phase, if profiling is enabled in
+    AnalysisConfig. A phase entered within another one is subtracted from the outer phase '''
+    if not AnalysisConfig.PROFILE:
+        yield
+        return
+
+    entry = [name, time.perf_counter(), _get_cpu_time(), 0., 0.]
+    _phase_stack.append(entry)
+    try:
+        yield
+    finally:
+        _phase_stack.pop()
+        wall_time = time.perf_counter() - entry[1]
+        cpu_time = _get_cpu_time() - entry[2]
+        if _phase_stack:
+            _phase_stack[-1][3] += wall_time
+            _phase_stack[-1][4] += cpu_time
+
+        times = _phase_times.setdefault(name, [0., 0., 0])
+        times[0] += wall_time - entry[3]
+        times[1] += cpu_time - entry[4]
+        times[2] += 1
+
+
+def count(counter, value=1):
+    ''' increment the given counter, if profiling is enabled in AnalysisConfig '''
+    if AnalysisConfig.PROFILE:
+        _counters[counter] = _counters.get(counter, 0) + value
+
+
+def pop_counters():
+    ''' return the counters and reset them (e.g. to pass the counters of a worker process to the main process) '''
+    counters = dict(_counters)
+    _counters.clear()
+
+    return counters
+
+
+def add_counters(counters):
+    ''' add the given counters (e.g. of a worker process, see pop_counters) '''
+    for counter, value in counters.items():
+        count(counter, value)
+
+
+def reset():
+    _phase_times.clear()
+    _phase_stack.clear()
+    _counters.clear()
+
+
+def get_phase_times():
+    ''' return the wall time, cpu time and number of calls of each phase entered so far '''
+    return {name: tuple(times) for name, times in _phase_times.items()}
+
+
+def get_counters():
+    return dict(_counters)
+
+
+def format_report():
+    ''' return the phases (wall and cpu time, calls) and the counters as table '''
+    names = [name for name in PHASES if name in _phase_times] + sorted(set(_phase_times) - set(PHASES))
+    lines = ['{:<16} {:>10} {:>10} {:>8}'.format('phase', 'wall [s]', 'cpu [s]', 'calls')]
+    for name in names:
+        lines.append('{:<16} {:>10.3f} {:>10.3f} {:>8}'.format(name, *_phase_times[name]))
+    lines.append('{:<16} {:>10.3f} {:>10.3f}'.format('total', sum(times[0] for times in _phase_times.values()),
+                                                     sum(times[1] for times in _phase_times.values())))
+
+    lines += [''] + ['{:<18} {:>16}'.format(counter, _counters.get(counter, 0)) for counter in COUNTERS]
+
+    return '\n'.join(lines)
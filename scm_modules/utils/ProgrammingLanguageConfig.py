@@ -70,3 +70,10 @@ def get_prefix_standard_include_identifier():
         return ProgrammingLanguageConstants.CPP_PREFIX_STD_INCLUDE
     else:
         raise LanguageOptionError("Programming language '{}' is currently not supported!".format(PROGRAMMING_LANGUAGE))
+
+
+def get_include_pattern():
+    if PROGRAMMING_LANGUAGE == 'c++':
+        return ProgrammingLanguageConstants.CPP_INCLUDE_PATTERN
+    else:
+        raise LanguageOptionError("Programming language '{}' is currently not supported!".format(PROGRAMMING_LANGUAGE))
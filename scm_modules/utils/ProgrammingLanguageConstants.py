@@ -32,3 +32,7 @@ CPP_ALLOWED_FILE_EXTENSIONS_IM = ['cpp', 'hpp', 'c', 'h']
 # includes-libraries (user/std) in C++ files
 CPP_PREFIX_STD_INCLUDE = '#include <'
 CPP_PREFIX_USER_INCLUDE = '#include "'
+
+# includes-libraries as a bytes pattern to scan a whole file at once: the group "user" contains user-includes
+# (#include "..."), the group "stl" std-includes (#include <...>), whitespace around # and include is allowed
+CPP_INCLUDE_PATTERN = rb'^[ \t]*#[ \t]*include[ \t]*(?:"(?P<user>[^"\r\n]+)"|<(?P<stl>[^>\r\n]+)>)'
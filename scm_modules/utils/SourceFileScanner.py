@@ -0,0 +1,442 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
+import json
+import os
+import posixpath
+from pathlib import Path
+import warnings
+
+from scm_modules.utils import AnalysisConfig, CompilationDatabase, FileUtility, GitUtility, LanguageProfile, ParseCache, \
+    Profiler, ProgrammingLanguageConfig
+
+
+# upper bound of files handed to a worker process at once
+MAX_CHUNK_SIZE = 256
+
+# everything the instability and the abstractness metric need to know about a single code file
+FileRecord = namedtuple('FileRecord', ['file_path', 'user_includes', 'stl_includes', 'nb_interfaces', 'nb_classes'])
+
+# file records of a run and the state of the working tree they were scanned from: the commit checked out (HEAD) and
+# the files with uncommitted changes at that time
+Snapshot = namedtuple('Snapshot', ['commit', 'uncommitted_files', 'file_records'])
+
+
+class _ClassCounter:
+    ''' count the classes and interfaces/abstract classes of a file, which is fed line by line '''
+    def __init__(self, language_profile):
+        self.nb_interfaces = 0
+        self.nb_classes = 0
+        self.nb_lines = 0
+        self._language_profile = language_profile
+        self._class_definition_found = False
+        self._counter_namespaces = 0
+        self._counter_curly_braces = 0
+
+    def process_line(self, line):
+        self.nb_lines += 1
+
+        # increment / decrement counter for curly braces
+        if '{' in line:
+            self._counter_curly_braces += 1
+
+        if '}' in line:
+            self._counter_curly_braces -= 1
+            # check for end of class and reset flag
+            if self._counter_curly_braces == self._counter_namespaces:
+                self._class_definition_found = False
+
+        # find namespace, class or abstract method with a single match
+        matched_definition = self._language_profile.match_class_definition(line)
+
+        if matched_definition == LanguageProfile.NAMESPACE_GROUP:
+            self._counter_namespaces += 1
+
+        elif matched_definition == LanguageProfile.CLASS_GROUP:
+            # indicate inside class definition
+            self._class_definition_found = True
+            self.nb_classes += 1
+
+        # find one abstract method
+        elif matched_definition == LanguageProfile.ABSTRACT_METHOD_GROUP and self._class_definition_found:
+            # one virtual = 0 method is sufficient for an abstract class
+            self.nb_interfaces += 1
+            self._class_definition_found = False
+
+
+def _get_include_name(include):
+    ''' decode an included file found by the include pattern, invalid UTF-8 bytes are replaced. The included path is
+    kept (e.g. domain/namespace/header.hpp), normalized and with '/' as separator '''
+    include_path = include.decode('utf-8', errors='replace').strip().replace('\\', '/')
+
+    return posixpath.normpath(include_path)
+
+
+def _count_classes(content, class_counter):
+    ''' feed the given file content line by line to the class counter. Like reading in text mode, line endings
+    are translated to \\n and invalid UTF-8 bytes are replaced '''
+    with io.TextIOWrapper(io.BytesIO(content), encoding='utf-8', errors='replace') as lines:
+        for line in lines:
+            class_counter.process_line(line)
+
+
+def _count_scanned_file(content, nb_includes, nb_matched_lines):
+    ''' count the work of scanning a file (see Profiler). The regex evaluations are the searches of the include
+    pattern done by finditer (one per include, each include found is kept, and a last one finding no more include) and
+    the matches of the class definition pattern (one per line fed to the class counter) '''
+    Profiler.count(Profiler.FILES_READ)
+    Profiler.count(Profiler.BYTES_READ, len(content))
+    Profiler.count(Profiler.LINES_READ, content.count(b'\n') + (not content.endswith(b'\n') and len(content) > 0))
+    Profiler.count(Profiler.REGEX_EVALUATIONS, nb_includes + 1 + nb_matched_lines)
+
+
+def scan_file(file_path, count_classes=True, language_profile=None, content=None):
+    ''' read the given file exactly once (as one bytes buffer) and return its FileRecord, containing the
+    user-includes (#include "..."), the stl-includes (#include <...>) and, if desired, the number of interfaces and
+    classes. Includes are found by a single scan over the whole buffer. If no LanguageProfile is given, it is created
+    for the configured programming language. If the content of the file is given (e.g. already read by the parse
+    cache), the file is not read '''
+    user_include_list = []
+    stl_include_list = []
+    nb_interfaces = 0
+    nb_classes = 0
+    nb_matched_lines = 0
+
+    try:
+        if language_profile is None:
+            language_profile = LanguageProfile.create_language_profile()
+
+        if content is None:
+            with open(file_path, 'rb') as file:
+                content = file.read()
+
+        user_includes, stl_includes = language_profile.find_includes(content)
+        user_include_list = [_get_include_name(include) for include in user_includes]
+        stl_include_list = [_get_include_name(include) for include in stl_includes]
+
+        if count_classes:
+            class_counter = _ClassCounter(language_profile)
+            _count_classes(content, class_counter)
+            nb_interfaces = class_counter.nb_interfaces
+            nb_classes = class_counter.nb_classes
+            nb_matched_lines = class_counter.nb_lines
+
+        if AnalysisConfig.PROFILE:
+            _count_scanned_file(content, len(user_include_list) + len(stl_include_list), nb_matched_lines)
+
+    except FileNotFoundError as ex:
+        warnings.warn('{} ...returning default values'.format(ex))
+    except ProgrammingLanguageConfig.LanguageOptionError as ex:
+        warnings.warn(ex.args)
+
+    return FileRecord(file_path, user_include_list, stl_include_list, nb_interfaces, nb_classes)
+
+
+def get_file_extensions():
+    ''' return the file extensions relevant for any of the metrics (instability and abstractness) '''
+    file_extensions = []
+    for get_extensions in (ProgrammingLanguageConfig.get_file_extensions_im,
+                           ProgrammingLanguageConfig.get_file_extensions_am):
+        try:
+            file_extensions += [ext for ext in get_extensions() if ext not in file_extensions]
+        except ProgrammingLanguageConfig.LanguageOptionError as ex:
+            warnings.warn(ex.args)
+
+    return file_extensions
+
+
+# LanguageProfile of a worker process, set by _init_worker
+_worker_language_profile = None
+
+
+def _init_worker(programming_language, language_profile, profile):
+    ''' worker processes might not share the module state (spawn), hence the programming language is set again '''
+    global _worker_language_profile
+    ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE = programming_language
+    AnalysisConfig.PROFILE = profile
+    _worker_language_profile = language_profile
+
+
+def _read_file(file_path):
+    ''' return the content of the given file, None if it cannot be read (scan_file warns then) '''
+    try:
+        with open(file_path, 'rb') as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def _scan_task(scan_task, language_profile):
+    ''' scan the file of the given task, return its FileRecord and, if desired, the hash of its content (None if it
+    cannot be read), hence the file is read once to scan and hash it '''
+    file_path, count_classes, content, hash_content = scan_task
+    if not hash_content:
+        return scan_file(file_path, count_classes, language_profile=language_profile, content=content)
+
+    if content is None:
+        content = _read_file(file_path)
+    file_record = scan_file(file_path, count_classes, language_profile=language_profile, content=content)
+
+    return file_record, None if content is None else ParseCache.get_content_hash(content)
+
+
+def _scan_file_of_task(scan_task):
+    return _scan_task(scan_task, _worker_language_profile)
+
+
+def _scan_file_of_task_profiled(scan_task):
+    ''' return the FileRecord and the counters of scanning the file, which are added by the main process '''
+    return _scan_file_of_task(scan_task), Profiler.pop_counters()
+
+
+def _try_create_language_profile():
+    ''' return the LanguageProfile of the configured language or None, then scan_file warns for every file '''
+    try:
+        return LanguageProfile.create_language_profile()
+    except ProgrammingLanguageConfig.LanguageOptionError:
+        return None
+
+
+def iterate_scanned_files(file_paths, count_classes_flags, jobs=1, language_profile=None, contents=None,
+                          hash_contents=False):
+    ''' lazily scan the given files (classes are counted if the respective flag is set) and yield their FileRecords in
+    the same order, each as soon as it (and the files before it) is scanned. If more than one job is given, the files
+    are scanned in chunks by a pool of worker processes, 0 jobs use all available cores. The LanguageProfile is
+    created once for all files if not given. Contents already read can be given per file (None: the file is read).
+    If desired, pairs of the FileRecord and the hash of the scanned content are yielded (see ParseCache) '''
+    if contents is None:
+        contents = [None] * len(file_paths)
+    scan_tasks = [(file_path, count_classes, content, hash_contents)
+                  for file_path, count_classes, content in zip(file_paths, count_classes_flags, contents)]
+    if language_profile is None:
+        language_profile = _try_create_language_profile()
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    if jobs <= 1 or len(scan_tasks) < 2:
+        for scan_task in scan_tasks:
+            yield _scan_task(scan_task, language_profile)
+        return
+
+    # several chunks per worker to balance the load, map() returns the results in order of the tasks
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(scan_tasks) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE, language_profile,
+                                       AnalysisConfig.PROFILE)) as executor:
+        if not AnalysisConfig.PROFILE:
+            yield from executor.map(_scan_file_of_task, scan_tasks, chunksize=chunk_size)
+            return
+
+        for result, counters in executor.map(_scan_file_of_task_profiled, scan_tasks, chunksize=chunk_size):
+            Profiler.add_counters(counters)
+            yield result
+
+
+def scan_files(file_paths, count_classes_flags, jobs=1, language_profile=None):
+    ''' scan the given files and return their FileRecords in the same order (see iterate_scanned_files) '''
+    return list(iterate_scanned_files(file_paths, count_classes_flags, jobs, language_profile))
+
+
+def _iterate_scanned_files_cached(file_paths, count_classes_flags, jobs, parse_cache):
+    ''' take unchanged files from the parse cache, scan and cache the remaining ones. The FileRecords are yielded in
+    order of the files, a cached file as soon as the files before it are scanned '''
+    parsed_files = [parse_cache.get_parsed_file(file_path, count_classes)
+                    for file_path, count_classes in zip(file_paths, count_classes_flags)]
+    indices_to_scan = [index for index, parsed_file in enumerate(parsed_files) if parsed_file is None]
+
+    # files read by the parse cache to compare their content are not read again, the content hash to cache is
+    # computed from the scanned content
+    scanned_files = iterate_scanned_files([file_paths[index] for index in indices_to_scan],
+                                          [count_classes_flags[index] for index in indices_to_scan], jobs,
+                                          contents=[parse_cache.pop_read_content(file_paths[index])
+                                                    for index in indices_to_scan], hash_contents=True)
+
+    for file_path, count_classes, parsed_file in zip(file_paths, count_classes_flags, parsed_files):
+        if parsed_file is not None:
+            yield FileRecord(file_path, *parsed_file)
+            continue
+
+        file_record, content_hash = next(scanned_files)
+        if content_hash is not None:
+            parse_cache.store_parsed_file(file_record.file_path, count_classes, file_record[1:], content_hash)
+        yield file_record
+
+
+def _get_file_extensions_am():
+    try:
+        return ProgrammingLanguageConfig.get_file_extensions_am()
+    except ProgrammingLanguageConfig.LanguageOptionError:
+        return []
+
+
+def _select_translation_units(code_files, file_extensions_am):
+    ''' return the code files to scan: if a compilation database is used, the headers (files considered by the
+    abstractness metric) and only the translation units listed in the database, all code files otw. '''
+    compilation_database = CompilationDatabase.get_compilation_database()
+    if compilation_database is None:
+        return list(code_files)
+
+    return [file_path for file_path in code_files if FileUtility.has_file_extension(file_path, file_extensions_am) or
+            os.path.abspath(file_path) in compilation_database]
+
+
+def _iterate_all_code_files(directory_path, cache_directory, jobs):
+    ''' walk the given directory once and lazily scan every code file, use the parse cache if a directory is given '''
+    file_extensions_am = _get_file_extensions_am()
+    with Profiler.phase(Profiler.DISCOVERY):
+        code_files = _select_translation_units(FileUtility.iterate_code_files(directory_path, get_file_extensions()),
+                                               file_extensions_am)
+    count_classes_flags = [FileUtility.has_file_extension(file_path, file_extensions_am) for file_path in code_files]
+
+    if cache_directory is None:
+        yield from iterate_scanned_files(code_files, count_classes_flags, jobs)
+        return
+
+    with ParseCache.ParseCache(cache_directory) as parse_cache:
+        yield from _iterate_scanned_files_cached(code_files, count_classes_flags, jobs, parse_cache)
+
+
+def _is_code_file(file_path, directory_path, file_extensions):
+    ''' return True if the file exists and would have been found by FileUtility.iterate_code_files '''
+    relative_parts = Path(os.path.relpath(file_path, directory_path if directory_path != '' else '.')).parts
+    if any(part.startswith('.') for part in relative_parts):
+        return False
+
+    return FileUtility.has_file_extension(file_path, file_extensions) and os.path.isfile(file_path)
+
+
+def _rescan_changed_code_files(directory_path, cache_directory, since_revision, jobs):
+    ''' patch the file records of the previous run (snapshot) by scanning only the files which changed since the
+    given revision, which has to be the commit the snapshot was taken at. Files with uncommitted changes at that time
+    are scanned again as well (e.g. their changes might have been reverted since). Return None if there is no
+    snapshot of the given revision or the changes cannot be determined '''
+    try:
+        since_commit = GitUtility.get_commit(directory_path, since_revision)
+        changed_files, deleted_files = GitUtility.get_changed_files(directory_path, since_revision)
+    except GitUtility.GitError as ex:
+        warnings.warn('{} ...scanning all files'.format(ex))
+        return None
+
+    snapshot = None if cache_directory is None else load_snapshot(get_snapshot_file(cache_directory, directory_path))
+    if snapshot is None:
+        warnings.warn('No snapshot of a previous run found ...scanning all files')
+        return None
+    if snapshot.commit != since_commit:
+        warnings.warn('The snapshot of the previous run was taken at commit {}, not at "{}" ...scanning all files'.format(
+            snapshot.commit, since_revision))
+        return None
+
+    file_records = {file_record.file_path: file_record for file_record in snapshot.file_records}
+    for file_path in deleted_files:
+        file_records.pop(file_path, None)
+    update_file_records(file_records, list(dict.fromkeys(changed_files + snapshot.uncommitted_files)),
+                        directory_path, jobs)
+
+    return list(file_records.values())
+
+
+def update_file_records(file_records, changed_files, directory_path, jobs=None):
+    ''' patch the given dictionary (file path -> FileRecord) of a directory: the changed files are scanned again
+    if they still are code files of the directory and their records are replaced in place (new files are added at the
+    end), otherwise their records are removed '''
+    if jobs is None:
+        jobs = AnalysisConfig.NUMBER_OF_JOBS
+
+    file_extensions_am = _get_file_extensions_am()
+    file_extensions = get_file_extensions()
+    files_to_scan = _select_translation_units([file_path for file_path in changed_files
+                                               if _is_code_file(file_path, directory_path, file_extensions)],
+                                              file_extensions_am)
+    count_classes_flags = [FileUtility.has_file_extension(file_path, file_extensions_am) for file_path in files_to_scan]
+
+    scanned_files = set(files_to_scan)
+    for file_path in changed_files:
+        if file_path not in scanned_files:
+            file_records.pop(file_path, None)
+
+    for file_record in scan_files(files_to_scan, count_classes_flags, jobs):
+        file_records[file_record.file_path] = file_record
+
+
+def _get_working_tree_state(directory_path):
+    ''' return the commit checked out in the given directory and its files with uncommitted changes, None if they
+    cannot be determined (e.g. no git repository) '''
+    try:
+        return GitUtility.get_commit(directory_path), GitUtility.get_uncommitted_files(directory_path)
+    except GitUtility.GitError:
+        return None
+
+
+def get_snapshot_file(cache_directory, directory_path):
+    ''' return the path of the snapshot file of given directory (one snapshot per directory and language) '''
+    snapshot_id = '{}:{}:{}'.format(os.path.abspath(directory_path), ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE,
+                                    ParseCache.CACHE_FORMAT_VERSION)
+    snapshot_hash = hashlib.blake2b(snapshot_id.encode('utf-8', errors='surrogateescape'), digest_size=8).hexdigest()
+
+    return Path(cache_directory, ParseCache.SNAPSHOT_FILENAME.format(snapshot_hash))
+
+
+def save_snapshot(snapshot, snapshot_file):
+    ''' save the file records of a run and the state of the working tree they were scanned from (Snapshot), a later
+    run can patch them using only the files changed since then '''
+    Path(snapshot_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(snapshot_file, 'w') as file:
+        json.dump({'commit': snapshot.commit, 'uncommitted_files': snapshot.uncommitted_files,
+                   'file_records': [list(file_record) for file_record in snapshot.file_records]}, file)
+
+
+def load_snapshot(snapshot_file):
+    ''' return the Snapshot saved by save_snapshot or None if there is no (valid) snapshot '''
+    try:
+        with open(snapshot_file, 'r') as file:
+            snapshot = json.load(file)
+
+        return Snapshot(snapshot['commit'], list(snapshot['uncommitted_files']),
+                        [FileRecord(*file_record) for file_record in snapshot['file_records']])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def iterate_code_file_records(directory_path, cache_directory=None, since_revision=None, jobs=None):
+    ''' scan every code file of the given directory exactly once and yield its FileRecord as soon as it is scanned
+    (e.g. to report the files while scanning a large directory). Classes are only counted in files considered by the
+    abstractness metric. If a cache directory is given (or configured in AnalysisConfig), unchanged files are taken
+    from the persistent parse cache. If additionally a git revision is given, the snapshot of the previous run at that
+    revision is patched by scanning only the files changed since then and the patched records are yielded, all files
+    are scanned if there is no such snapshot. The file records and the state of the git working tree are saved as
+    snapshot for the next run after the last file. Files are scanned by the given number of jobs (see
+    iterate_scanned_files) '''
+    if cache_directory is None:
+        cache_directory = AnalysisConfig.PARSE_CACHE_DIRECTORY
+    if since_revision is None:
+        since_revision = AnalysisConfig.SINCE_REVISION
+    if jobs is None:
+        jobs = AnalysisConfig.NUMBER_OF_JOBS
+
+    # the snapshot is only needed to patch it by the next run, the state of the working tree is taken before
+    # scanning, files changed while scanning count as changed later
+    working_tree_state = None
+    if cache_directory is not None and since_revision is not None:
+        working_tree_state = _get_working_tree_state(directory_path)
+
+    file_records = None
+    if since_revision is not None:
+        file_records = _rescan_changed_code_files(directory_path, cache_directory, since_revision, jobs)
+        if file_records is not None:
+            yield from file_records
+    if file_records is None:
+        file_records = []
+        for file_record in _iterate_all_code_files(directory_path, cache_directory, jobs):
+            file_records.append(file_record)
+            yield file_record
+
+    if working_tree_state is not None:
+        save_snapshot(Snapshot(*working_tree_state, file_records), get_snapshot_file(cache_directory, directory_path))
+
+
+def scan_code_files(directory_path, cache_directory=None, since_revision=None, jobs=None):
+    ''' scan every code file of the given directory exactly once and return a list of FileRecords (see
+    iterate_code_file_records) '''
+    with Profiler.phase(Profiler.PARSING):
+        return list(iterate_code_file_records(directory_path, cache_directory, since_revision, jobs))
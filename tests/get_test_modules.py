@@ -93,6 +93,7 @@ def _edit_file(file_in, file_out):
         from instability_metric import InstabilityMetric
     '''
     sys_already_added = False
+    added_import_paths = []
 
     with open(file_in, 'r') as f_in:
         with open(file_out, 'w') as f_out:
@@ -104,14 +105,19 @@ def _edit_file(file_in, file_out):
 
                     # create altered import statements
                     altered_imports = _get_lines_to_add(import_path, import_module, modules)
+                    import_sys, append_import_path, import_modules = altered_imports.split('\n', 2)
 
-                    # do not add import sys and sys.path.append() twice
-                    if sys_already_added:
-                        f_out.write(altered_imports.split('\n')[-2])
-                    else:
-                        f_out.write(altered_imports)
+                    # do not add import sys and the same sys.path.append() twice
+                    if not sys_already_added:
+                        f_out.write(import_sys + '\n')
                         sys_already_added = True
 
+                    if import_path not in added_import_paths:
+                        f_out.write(append_import_path + '\n')
+                        added_import_paths.append(import_path)
+
+                    f_out.write(import_modules)
+
                 else:
                     f_out.write(line)
 
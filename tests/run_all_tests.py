@@ -4,7 +4,30 @@ import sys
 sys.path.append('tests/test_utils/')
 import Test_FileUtility as t_fu
 import Test_DataSeriesUtility as t_dsu
+import Test_MetricsFrame as t_mf
+import Test_FileMetrics as t_fm
+import Test_PointIndex as t_pi
 import Test_ProgrammingLanguageConfig as t_plc
+import Test_SourceFileScanner as t_sfs
+import Test_IncludeGraph as t_ig
+import Test_IncludeResolver as t_ir
+import Test_IncludeCycles as t_ic
+import Test_CompilationDatabase as t_cdb
+import Test_ComponentMapping as t_cm
+import Test_ComponentMetrics as t_cmet
+import Test_MetricKernels as t_mk
+import Test_ParseCache as t_pc
+import Test_GitUtility as t_gu
+import Test_LanguageProfile as t_lp
+import Test_FileWatcher as t_fw
+import Test_AnalysisSession as t_as
+import Test_MetricsIndex as t_mi
+import Test_MetricsServer as t_msrv
+import Test_MetricsStream as t_mst
+import Test_Profiler as t_prf
+
+sys.path.append('tests/test_benchmarks/')
+import Test_CorpusGenerator as t_cg
 
 sys.path.append('tests/test_metrics')
 import Test_AbstractnessMetric as t_am
@@ -22,17 +45,109 @@ suite = unittest.TestSuite()
 
 # FileUtility
 suite.addTests(unittest.makeSuite(t_fu.TestFileUtilityGetAllCodeFiles))
+suite.addTests(unittest.makeSuite(t_fu.TestFileUtilityIterateCodeFiles))
+suite.addTests(unittest.makeSuite(t_fu.TestFileUtilityScanDirectory))
 suite.addTests(unittest.makeSuite(t_fu.TestFileUtilityExtractFileName))
+suite.addTests(unittest.makeSuite(t_fu.TestFileUtilityGetRelativePath))
 suite.addTests(unittest.makeSuite(t_fu.TestFileUtilitySaveMetricToFile))
+suite.addTests(unittest.makeSuite(t_fu.TestFileUtilitySaveMetricsFrameToFile))
 
 # DataSeriesUtility
 suite.addTests(unittest.makeSuite(t_dsu.TestDataSeriesUtilityGetInstabilityAndAbstractnessMetric))
-suite.addTests(unittest.makeSuite(t_dsu.TestDataSeriesUtilityPadDataSeriesWithDefaultValues))
-suite.addTests(unittest.makeSuite(t_dsu.TestDataSeriesReorderDataSeriesElements))
+suite.addTests(unittest.makeSuite(t_dsu.TestDataSeriesUtilityGetMetricsFrame))
+
+# MetricsFrame
+suite.addTests(unittest.makeSuite(t_mf.TestMetricsFrameCreateMetricsFrameFromColumns))
+
+# FileMetrics
+suite.addTests(unittest.makeSuite(t_fm.TestFileMetricsComputeFileMetrics))
+
+# PointIndex
+suite.addTests(unittest.makeSuite(t_pi.TestPointIndexQuery))
 
 # ProgrammingLanguageConfig
 suite.addTests(unittest.makeSuite(t_plc.TestProgrammingLanguageConfigAllGetterMethodsCPP))
 
+# LanguageProfile
+suite.addTests(unittest.makeSuite(t_lp.TestLanguageProfileCreate))
+suite.addTests(unittest.makeSuite(t_lp.TestLanguageProfileFindIncludes))
+suite.addTests(unittest.makeSuite(t_lp.TestLanguageProfileMatchClassDefinition))
+
+# SourceFileScanner
+suite.addTests(unittest.makeSuite(t_sfs.TestSourceFileScannerScanFile))
+suite.addTests(unittest.makeSuite(t_sfs.TestSourceFileScannerScanCodeFiles))
+suite.addTests(unittest.makeSuite(t_sfs.TestSourceFileScannerScanFiles))
+suite.addTests(unittest.makeSuite(t_sfs.TestSourceFileScannerUpdateFileRecords))
+suite.addTests(unittest.makeSuite(t_sfs.TestSourceFileScannerCompilationDatabase))
+
+# IncludeGraph
+suite.addTests(unittest.makeSuite(t_ig.TestIncludeGraphNodes))
+suite.addTests(unittest.makeSuite(t_ig.TestIncludeGraphEdges))
+
+# IncludeResolver
+suite.addTests(unittest.makeSuite(t_ir.TestIncludeResolverResolve))
+suite.addTests(unittest.makeSuite(t_ir.TestIncludeResolverCreateIncludeResolver))
+
+# IncludeCycles
+suite.addTests(unittest.makeSuite(t_ic.TestIncludeCyclesFindStronglyConnectedComponents))
+suite.addTests(unittest.makeSuite(t_ic.TestIncludeCyclesGetCycleIds))
+suite.addTests(unittest.makeSuite(t_ic.TestIncludeCyclesSaveCondensation))
+
+# ComponentMapping
+suite.addTests(unittest.makeSuite(t_cm.TestComponentMappingDirectoryComponents))
+suite.addTests(unittest.makeSuite(t_cm.TestComponentMappingRuleComponents))
+suite.addTests(unittest.makeSuite(t_cm.TestComponentMappingFileComponents))
+
+# ComponentMetrics
+suite.addTests(unittest.makeSuite(t_cmet.TestComponentMetricsAggregateIncludeGraph))
+suite.addTests(unittest.makeSuite(t_cmet.TestComponentMetricsCreateComponentMetricsFrame))
+
+# CompilationDatabase
+suite.addTests(unittest.makeSuite(t_cdb.TestCompilationDatabaseGetIncludeDirectories))
+suite.addTests(unittest.makeSuite(t_cdb.TestCompilationDatabaseLoadCompilationDatabase))
+
+# MetricKernels
+suite.addTests(unittest.makeSuite(t_mk.TestMetricKernelsComputeInstability))
+suite.addTests(unittest.makeSuite(t_mk.TestMetricKernelsComputeAbstractness))
+suite.addTests(unittest.makeSuite(t_mk.TestMetricKernelsComputeDistance))
+suite.addTests(unittest.makeSuite(t_mk.TestMetricKernelsGetTopIndices))
+suite.addTests(unittest.makeSuite(t_mk.TestMetricKernelsComputeGroupQuantiles))
+
+# ParseCache
+suite.addTests(unittest.makeSuite(t_pc.TestParseCacheGetParsedFile))
+suite.addTests(unittest.makeSuite(t_pc.TestParseCacheEviction))
+suite.addTests(unittest.makeSuite(t_pc.TestParseCacheScanCodeFiles))
+
+# GitUtility
+suite.addTests(unittest.makeSuite(t_gu.TestGitUtilityParseNameStatus))
+suite.addTests(unittest.makeSuite(t_gu.TestGitUtilityGetChangedFiles))
+
+# FileWatcher
+suite.addTests(unittest.makeSuite(t_fw.TestFileWatcherPolling))
+suite.addTests(unittest.makeSuite(t_fw.TestFileWatcherInotify))
+
+# AnalysisSession
+suite.addTests(unittest.makeSuite(t_as.TestAnalysisSessionUpdateFiles))
+
+# MetricsIndex
+suite.addTests(unittest.makeSuite(t_mi.TestMetricsIndexGetFileMetrics))
+suite.addTests(unittest.makeSuite(t_mi.TestMetricsIndexGetComponentMetrics))
+suite.addTests(unittest.makeSuite(t_mi.TestMetricsIndexGetTopFiles))
+
+# MetricsServer
+suite.addTests(unittest.makeSuite(t_msrv.TestMetricsServerRequests))
+
+# MetricsStream
+suite.addTests(unittest.makeSuite(t_mst.TestMetricsStreamStreamMetrics))
+suite.addTests(unittest.makeSuite(t_mst.TestMetricsStreamImports))
+
+# CorpusGenerator
+suite.addTests(unittest.makeSuite(t_cg.TestCorpusGeneratorGenerateCorpus))
+
+# Profiler
+suite.addTests(unittest.makeSuite(t_prf.TestProfilerPhase))
+suite.addTests(unittest.makeSuite(t_prf.TestProfilerScanCounters))
+
 # AbstractnessMetric
 suite.addTests(unittest.makeSuite(t_am.TestAbstractnessMetricGetNumberOfInterfacesAndClassesOfFile))
 suite.addTests(unittest.makeSuite(t_am.TestAbstractnessMetricCalculateAbstractnessForEachFile))
@@ -41,9 +156,7 @@ suite.addTests(unittest.makeSuite(t_am.TestAbstractnessMetricComputeAbstractness
 
 # InstabilityMetric
 suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricGetIncludesOfFile))
-suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricCreateUserIncludeMatrix))
-suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricFillIncludeMatrix))
-suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricAddStlIncludes))
+suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricCreateIncludeGraph))
 suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricGetAllFanIn))
 suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricGetAllFanOut))
 suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricCalculateInstabilityForEachFile))
@@ -52,6 +165,10 @@ suite.addTests(unittest.makeSuite(t_im.TestInstabilityMetricComputeInstability))
 # DistanceIA
 suite.addTests(unittest.makeSuite(t_dia.TestDistanceIACalculateDistance))
 suite.addTests(unittest.makeSuite(t_dia.TestDistanceIAPlotDistance))
+suite.addTests(unittest.makeSuite(t_dia.TestDistanceIARedrawDistance))
+suite.addTests(unittest.makeSuite(t_dia.TestDistanceIASavePlot))
+suite.addTests(unittest.makeSuite(t_dia.TestDistanceIAImports))
+suite.addTests(unittest.makeSuite(t_dia.TestDistanceIAViews))
 suite.addTests(unittest.makeSuite(t_dia.TestDistanceIASaveMetrics))
 
 # MainSequence
@@ -59,7 +176,11 @@ suite.addTests(unittest.makeSuite(t_ms.TestMainSequenceAnnotatePoint))
 suite.addTests(unittest.makeSuite(t_ms.TestMainSequenceLayoutAx))
 suite.addTests(unittest.makeSuite(t_ms.TestMainSequenceDefineMotionAnnotationCallback))
 suite.addTests(unittest.makeSuite(t_ms.TestMainSequencePlotMetrics))
+suite.addTests(unittest.makeSuite(t_ms.TestMainSequenceRedrawMetrics))
+suite.addTests(unittest.makeSuite(t_ms.TestMainSequenceSavePlot))
+suite.addTests(unittest.makeSuite(t_ms.TestMainSequenceImports))
 suite.addTests(unittest.makeSuite(t_ms.TestMainSequenceSaveMetrics))
+suite.addTests(unittest.makeSuite(t_ms.TestMainSequenceExportMetrics))
 
 # run TestSuite
 result = unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+import sys
+
+sys.path.append('benchmarks/')
+import corpus_generator as cg
+
+sys.path.append('tests/modules_under_test/utils/')
+import SourceFileScanner as sfs
+
+
+class TestCorpusGeneratorGenerateCorpus(unittest.TestCase):
+    def _readCorpus(self, dir_path, corpus):
+        contents = []
+        for file_path in corpus.file_paths:
+            with open(os.path.join(dir_path, file_path), 'rb') as file:
+                contents.append(file.read())
+
+        return contents
+
+    def testSameOptionsGenerateSameFiles(self):
+        '''
+        Test that the corpus is deterministic, i.e. the same options generate the same files
+        '''
+        options = cg.CorpusOptions(nb_files=60, seed=3)
+        with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+            first_corpus = cg.generate_corpus(first_dir, options)
+            second_corpus = cg.generate_corpus(second_dir, options)
+
+            self.assertEqual(first_corpus, second_corpus)
+            self.assertEqual(self._readCorpus(first_dir, first_corpus), self._readCorpus(second_dir, second_corpus))
+            self.assertEqual(sum(len(content) for content in self._readCorpus(first_dir, first_corpus)),
+                             first_corpus.nb_bytes)
+
+    def testScannedClassesAndIncludes(self):
+        '''
+        Test that the scanner finds the generated classes, interfaces and includes
+        '''
+        options = cg.CorpusOptions(nb_files=40, mean_includes=3, include_distribution=cg.FIXED_DISTRIBUTION,
+                                   mean_classes=2, abstract_ratio=.5)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            corpus = cg.generate_corpus(tmp_dir, options)
+            file_records = sfs.scan_code_files(tmp_dir)
+
+        self.assertEqual(len(file_records), 40)
+        self.assertEqual(sum(record.nb_classes for record in file_records), corpus.nb_classes)
+        self.assertEqual(sum(record.nb_interfaces for record in file_records), corpus.nb_interfaces)
+        self.assertGreater(corpus.nb_interfaces, 0)
+        for record in file_records:
+            self.assertEqual(len(record.user_includes) + len(record.stl_includes), 3)
+
+    def testLineLength(self):
+        '''
+        Test that the lines of the bodies have the given length
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            corpus = cg.generate_corpus(tmp_dir, cg.CorpusOptions(nb_files=5, line_length=100))
+            with open(os.path.join(tmp_dir, corpus.file_paths[0])) as file:
+                body_lines = [line for line in file.read().splitlines() if 'member' in line]
+
+        self.assertTrue(body_lines)
+        self.assertEqual({len(line) for line in body_lines}, {100})
+
+    def testUnknownIncludeDistribution(self):
+        '''
+        Test that an error is raised if the include distribution is unknown
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(cg.CorpusOptionError):
+                cg.generate_corpus(tmp_dir, cg.CorpusOptions(nb_files=5, include_distribution='normal'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ import warnings
 
 import utils.FileUtility as fut
 import utils.ProgrammingLanguageConfig as plc
+import utils.SourceFileScanner as sfs
 
 from metrics.abstractness_metric import AbstractnessMetric
 
@@ -67,6 +68,26 @@ class TestAbstractnessMetricGetNumberOfInterfacesAndClassesOfFile(unittest.TestC
         self.assertEqual(returned_nb_interfaces, 0)
         self.assertEqual(returned_nb_classes, 1)
 
+    @patch('utils.SourceFileScanner.scan_file')
+    def testProvidedFileRecordsAreUsed(self, mocked_sfs_func):
+        '''
+        Test that already scanned files (provided file records) are not read again
+        '''
+        # assert mock
+        self.assertIs(sfs.scan_file, mocked_sfs_func)
+
+        file_records = [sfs.FileRecord(ABSTRACT_CLASS_FILE, [], [], 2, 3)]
+
+        # create object and call function to test
+        abstractness_metric = AbstractnessMetric('', file_records)
+        returned_nb_interfaces, returned_nb_classes = \
+            abstractness_metric._get_number_of_interfaces_and_classes_of_file(ABSTRACT_CLASS_FILE)
+
+        # assert no scan and correct result
+        mocked_sfs_func.assert_not_called()
+        self.assertEqual(returned_nb_interfaces, 2)
+        self.assertEqual(returned_nb_classes, 3)
+
 
 class TestAbstractnessMetricSearchFilesForInterfaces(unittest.TestCase):
     @patch('metrics.abstractness_metric.AbstractnessMetric._get_number_of_interfaces_and_classes_of_file')
@@ -90,13 +111,13 @@ class TestAbstractnessMetricSearchFilesForInterfaces(unittest.TestCase):
             self.assertEqual(mocked_a_get_func.call_count, expected_nb_method_calls)
 
     @patch('metrics.abstractness_metric.AbstractnessMetric._get_number_of_interfaces_and_classes_of_file')
-    @patch('utils.FileUtility.extract_filename')
+    @patch('utils.FileUtility.get_relative_path')
     def testCorrectSettingOfCellsInMatrix(self, mocked_fut_func, mocked_a_get_func):
         '''
         Test that a correct cell is set in the member-matrix
         '''
         # assert mocks
-        self.assertIs(fut.extract_filename, mocked_fut_func)
+        self.assertIs(fut.get_relative_path, mocked_fut_func)
         self.assertIs(AbstractnessMetric._get_number_of_interfaces_and_classes_of_file, mocked_a_get_func)
 
         # set dummy return values of mocked function
@@ -114,6 +135,35 @@ class TestAbstractnessMetricSearchFilesForInterfaces(unittest.TestCase):
             self.assertEqual(abstractness_metric._interface_class_matrix['row2']['N_a'], 2)
             self.assertEqual(abstractness_metric._interface_class_matrix['row2']['N_c'], 3)
 
+    @patch('metrics.abstractness_metric.AbstractnessMetric._get_number_of_interfaces_and_classes_of_file')
+    @patch('utils.FileUtility.get_relative_path')
+    def testSameFilenameTwice(self, mocked_fut_func, mocked_a_get_func):
+        '''
+        Test that a file appearing twice keeps its first position and gets the last values
+        '''
+        # set dummy return values of mocked function
+        mocked_fut_func.side_effect = ['row1', 'row2', 'row1']
+        mocked_a_get_func.side_effect = [(0, 1), (2, 3), (4, 5)]
+
+        # create object and call function to test
+        abstractness_metric = createUUT(TEST_CODE_FILES)
+        with patch.object(abstractness_metric, '_list_of_files', ['a', 'b', 'c']):
+            abstractness_metric._search_files_for_interfaces()
+
+            # assert correct setting of matrix
+            self.assertEqual(list(abstractness_metric._interface_class_matrix.columns), ['row1', 'row2'])
+            self.assertEqual(list(abstractness_metric._interface_class_matrix['row1']), [4, 5])
+
+    def testNoFiles(self):
+        '''
+        Test that an empty matrix with the rows N_a and N_c is built if there are no files
+        '''
+        abstractness_metric = createUUT()
+        abstractness_metric._search_files_for_interfaces()
+
+        self.assertEqual(list(abstractness_metric._interface_class_matrix.index), ['N_a', 'N_c'])
+        self.assertEqual(abstractness_metric._interface_class_matrix.shape, (2, 0))
+
 
 class TestAbstractnessMetricCalculateAbstractnessForEachFile(unittest.TestCase):
     def testCorrectCalculation(self):
@@ -179,3 +229,14 @@ class TestAbstractnessMetricComputeAbstractness(unittest.TestCase):
         mocked_fut_get_func.assert_called_once_with(TEST_CODE_FILES, plc.get_file_extensions_am())
         mocked_a_search_func.assert_called_once()
         mocked_a_calc_func.assert_called_once()
+
+    def testFilesScannedInParallel(self):
+        '''
+        Test that the files are scanned by the given number of jobs at once and that the result does not depend on it
+        '''
+        with patch('utils.SourceFileScanner.iterate_scanned_files', wraps=sfs.iterate_scanned_files) as mocked_func:
+            returned_metric = AbstractnessMetric(TEST_CODE_FILES, jobs=2).compute_abstractness()
+
+        mocked_func.assert_called_once()
+        self.assertEqual(mocked_func.call_args[1]['jobs'], 2)
+        self.assertTrue(returned_metric.equals(createUUT(TEST_CODE_FILES).compute_abstractness()))
@@ -1,13 +1,21 @@
+import matplotlib.axes as axs
 import matplotlib.pyplot as plt
 import numpy as np
+import os
 import pandas as pd
+import subprocess
+import sys
+import tempfile
 import unittest
 from unittest.mock import patch
 
 import utils.DataSeriesUtility as dsu
 import utils.FileUtility as fut
+import utils.IncludeCycles as ic
+import utils.MetricsFrame as mf
 
-from metrics.distance_ia import DistanceIA
+from metrics.distance_ia import COMPONENTS_VIEW, FILES_VIEW, HISTOGRAM_VIEW, HISTOGRAM_BINS, MAX_LABELED_FILES, TOP_VIEW, \
+    DistanceIA
 
 
 def createUUT():
@@ -17,6 +25,17 @@ def createUUT():
     return DistanceIA('')
 
 
+def createMetricsFrame(i_metric, a_metric):
+    '''
+    Returns a metrics frame of the given instability and abstractness metric (without any dependencies or classes)
+    '''
+    zeros = np.zeros(len(i_metric), dtype=int)
+    return mf.create_metrics_frame_from_columns(list(i_metric.index), {
+        mf.INSTABILITY: i_metric.values, mf.ABSTRACTNESS: a_metric.values,
+        mf.DISTANCE: abs(a_metric.values + i_metric.values - 1), mf.FAN_IN: zeros, mf.FAN_OUT: zeros,
+        mf.NB_INTERFACES: zeros, mf.NB_CLASSES: zeros, mf.CYCLE: zeros + ic.NO_CYCLE})
+
+
 class TestDistanceIACalculateDistance(unittest.TestCase):
     def testCorrectReturnValue(self):
         '''
@@ -28,19 +47,19 @@ class TestDistanceIACalculateDistance(unittest.TestCase):
 
         # create object and call function to test
         distance_ia = createUUT()
-        with patch.object(distance_ia, '_instability_metric', mocked_i_metric):
-            with patch.object(distance_ia, '_abstractness_metric', mocked_a_metric):
-                distance_ia._calculate_distance()
+        with patch.object(distance_ia, '_metrics_frame', createMetricsFrame(mocked_i_metric, mocked_a_metric)):
+            distance_ia._calculate_distance()
 
-                self.assertTrue(distance_ia._distance.equals(expected_calc_distance))
+            self.assertTrue(np.allclose(distance_ia._distance, expected_calc_distance))
+            self.assertEqual(distance_ia._distance.name, 'Distance_IA')
 
 
 class TestDistanceIAPlotDistance(unittest.TestCase):
-    @patch('matplotlib.pyplot.ylabel')
-    @patch('matplotlib.pyplot.xticks')
-    @patch('matplotlib.pyplot.plot')
+    @patch('matplotlib.axes.Axes.set_ylabel')
+    @patch('matplotlib.axes.Axes.set_xticklabels')
+    @patch('matplotlib.axes.Axes.plot')
     @patch('matplotlib.pyplot.show')
-    @patch('utils.DataSeriesUtility.get_instability_and_abstractness_metric')
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
     @patch('metrics.distance_ia.DistanceIA._calculate_distance')
     def testCorrectFunctionCalls(self, mocked_d_func, mocked_dsu_func, mocked_show_func, mocked_plot_func,
                                  mocked_xticks_func, mocked_ylabel_func):
@@ -49,17 +68,17 @@ class TestDistanceIAPlotDistance(unittest.TestCase):
         '''
         # assert mocks
         self.assertIs(DistanceIA._calculate_distance, mocked_d_func)
-        self.assertIs(dsu.get_instability_and_abstractness_metric, mocked_dsu_func)
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
         self.assertIs(plt.show, mocked_show_func)  # mock this function to no show the plotted window
-        self.assertIs(plt.plot, mocked_plot_func)
-        self.assertIs(plt.xticks, mocked_xticks_func)
-        self.assertIs(plt.ylabel, mocked_ylabel_func)
+        self.assertIs(axs.Axes.plot, mocked_plot_func)
+        self.assertIs(axs.Axes.set_xticklabels, mocked_xticks_func)
+        self.assertIs(axs.Axes.set_ylabel, mocked_ylabel_func)
 
         # create return values for mocked functions
         mocked_i_metric = pd.Series(np.array([.6, .0, .1, 1., .0, .5]))
         mocked_a_metric = pd.Series(np.array([.3, 1., .0, 1., .8, .2]))
         mocked_distance = abs(mocked_i_metric + mocked_a_metric - 1)
-        mocked_dsu_func.return_value = mocked_i_metric, mocked_a_metric
+        mocked_dsu_func.return_value = createMetricsFrame(mocked_i_metric, mocked_a_metric)
         mocked_d_func.return_value = mocked_distance
 
         # create object and call function to test
@@ -75,11 +94,11 @@ class TestDistanceIAPlotDistance(unittest.TestCase):
             mocked_ylabel_func.assert_called_once()
             mocked_show_func.assert_called_once()
 
-    @patch('matplotlib.pyplot.ylabel')
-    @patch('matplotlib.pyplot.xticks')
-    @patch('matplotlib.pyplot.plot')
+    @patch('matplotlib.axes.Axes.set_ylabel')
+    @patch('matplotlib.axes.Axes.set_xticklabels')
+    @patch('matplotlib.axes.Axes.plot')
     @patch('matplotlib.pyplot.show')
-    @patch('utils.DataSeriesUtility.get_instability_and_abstractness_metric')
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
     @patch('metrics.distance_ia.DistanceIA._calculate_distance')
     def testCorrectFunctionCallArguments(self, mocked_d_func, mocked_dsu_func, mocked_show_func,
                                          mocked_plot_func, mocked_xticks_func, mocked_ylabel_func):
@@ -88,18 +107,18 @@ class TestDistanceIAPlotDistance(unittest.TestCase):
         '''
         # assert mocks
         self.assertIs(DistanceIA._calculate_distance, mocked_d_func)
-        self.assertIs(dsu.get_instability_and_abstractness_metric, mocked_dsu_func)
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
         self.assertIs(plt.show, mocked_show_func)  # mock this function to no show the plotted window
-        self.assertIs(plt.plot, mocked_plot_func)
-        self.assertIs(plt.xticks, mocked_xticks_func)
-        self.assertIs(plt.ylabel, mocked_ylabel_func)
+        self.assertIs(axs.Axes.plot, mocked_plot_func)
+        self.assertIs(axs.Axes.set_xticklabels, mocked_xticks_func)
+        self.assertIs(axs.Axes.set_ylabel, mocked_ylabel_func)
 
         # create return values for mocked functions
         expected_i_index = ['a', 'b', 'c', 'd', 'e', 'f']
         mocked_i_metric = pd.Series(np.array([.6, .0, .1, 1., .0, .5]), index=expected_i_index)
-        mocked_a_metric = pd.Series(np.array([.3, 1., .0, 1., .8, .2]))
+        mocked_a_metric = pd.Series(np.array([.3, 1., .0, 1., .8, .2]), index=expected_i_index)
         mocked_distance = abs(mocked_i_metric + mocked_a_metric - 1)
-        mocked_dsu_func.return_value = mocked_i_metric, mocked_a_metric
+        mocked_dsu_func.return_value = createMetricsFrame(mocked_i_metric, mocked_a_metric)
         mocked_d_func.return_value = mocked_distance
         expected_ind = np.arange(mocked_distance.size)
 
@@ -108,25 +127,211 @@ class TestDistanceIAPlotDistance(unittest.TestCase):
         with patch.object(distance_ia, '_distance', mocked_distance):
             distance_ia.plot_distance()
 
-            # assert call-arguments (plt.plot)
+            # assert call-arguments (ax.plot)
             (call_ind, call_dist), call_kwords = mocked_plot_func.call_args
             self.assertTrue(np.all(expected_ind == call_ind))
             self.assertTrue(mocked_distance.equals(call_dist))
             self.assertEqual('x', call_kwords['marker'])
             self.assertEqual('None', call_kwords['linestyle'])
 
-            # assert call-arguments (plt.xticks)
-            (call_ind, call_i_index), call_kwords = mocked_xticks_func.call_args
-            self.assertTrue(np.all(expected_ind == call_ind))
+            # assert call-arguments (ax.set_xticklabels)
+            (call_i_index,), call_kwords = mocked_xticks_func.call_args
+            self.assertTrue(np.all(expected_ind == plt.gca().get_xticks()))
             self.assertTrue(np.all(expected_i_index == call_i_index))
             self.assertEqual(45, call_kwords['rotation'])
             self.assertEqual('right', call_kwords['ha'])
 
-            # assert call-arguments (plt.ylabel)
+            # assert call-arguments (ax.set_ylabel)
             call_args, call_kwords = mocked_ylabel_func.call_args
             self.assertEqual('[D]istance', call_args[0])
             self.assertEqual(18, call_kwords['fontsize'])
 
+    @patch('matplotlib.pyplot.show')
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
+    def testGivenMetricsFramePlotted(self, mocked_dsu_func, mocked_show_func):
+        '''
+        Test that the distance of the metrics frame given to the constructor is plotted without analyzing the
+        directory again
+        '''
+        # assert mocks
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
+        self.assertIs(plt.show, mocked_show_func)
+
+        metrics_frame = createMetricsFrame(pd.Series([.6, .0], index=['a.h', 'b.h']),
+                                           pd.Series([.3, 1.], index=['a.h', 'b.h']))
+
+        # create object and call function to test
+        plt.figure()
+        distance_ia = DistanceIA('', metrics_frame=metrics_frame)
+        distance_ia.plot_distance()
+
+        # assert distance of the given metrics plotted
+        mocked_dsu_func.assert_not_called()
+        mocked_show_func.assert_called_once()
+        self.assertTrue(np.allclose(plt.gca().lines[0].get_ydata(), [.1, 0.]))
+        plt.close('all')
+
+
+class TestDistanceIAImports(unittest.TestCase):
+    def testSavePlotWithoutPyplot(self):
+        '''
+        Test that importing the module and saving the diagram does not import pyplot
+        '''
+        code = ('import os, sys, tempfile\n'
+                'sys.path.append("tests/modules_under_test/")\n'
+                'from utils import MetricsFrame\n'
+                'from metrics.distance_ia import DistanceIA\n'
+                'metrics_frame = MetricsFrame.create_metrics_frame_from_columns(\n'
+                '    ["a.h"], {column: [0] for column in MetricsFrame.COLUMNS})\n'
+                'with tempfile.TemporaryDirectory() as tmp_dir:\n'
+                '    DistanceIA("", metrics_frame=metrics_frame).save_plot(os.path.join(tmp_dir, "distance.png"))\n'
+                'print("matplotlib.pyplot" in sys.modules)')
+
+        output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True,
+                                universal_newlines=True).stdout.split()
+
+        self.assertEqual(output, ['False'])
+
+
+class TestDistanceIARedrawDistance(unittest.TestCase):
+    def testPreviousDiagramReplaced(self):
+        '''
+        Test that redrawing computes the distance of the given metrics and replaces the previous diagram
+        '''
+        i_metric = pd.Series([.6, .0], index=['a.h', 'b.h'])
+        a_metric = pd.Series([.3, 1.], index=['a.h', 'b.h'])
+
+        # create object and call function to test twice
+        distance_ia = createUUT()
+        distance_ia.redraw_distance(createMetricsFrame(i_metric, a_metric))
+        distance_ia.redraw_distance(createMetricsFrame(i_metric[:1], a_metric[:1]))
+
+        # assert single diagram containing the new distance
+        self.assertEqual(len(plt.gcf().axes), 1)
+        self.assertEqual(len(plt.gca().lines), 1)
+        self.assertAlmostEqual(distance_ia._distance['a.h'], .1)
+        plt.close('all')
+
+
+class TestDistanceIASavePlot(unittest.TestCase):
+    @patch('matplotlib.pyplot.show')
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
+    def testPlotSavedWithoutDisplay(self, mocked_dsu_func, mocked_show_func):
+        '''
+        Test that the diagram is rendered to the given files without displaying it
+        '''
+        # assert mocks
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
+        self.assertIs(plt.show, mocked_show_func)
+
+        i_metric = pd.Series([.6, .0], index=['a.h', 'b.h'])
+        a_metric = pd.Series([.3, 1.], index=['a.h', 'b.h'])
+        mocked_dsu_func.return_value = createMetricsFrame(i_metric, a_metric)
+
+        # create object and call function to test for several formats
+        distance_ia = createUUT()
+        figure_numbers = plt.get_fignums()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for filename in ['distance.png', 'plots/distance.svg', 'distance.pdf']:
+                distance_ia.save_plot(os.path.join(tmp_dir, filename))
+                self.assertGreater(os.path.getsize(os.path.join(tmp_dir, filename)), 0)
+
+        # assert single analysis and no displayed figure
+        mocked_dsu_func.assert_called_once_with('')
+        mocked_show_func.assert_not_called()
+        self.assertEqual(plt.get_fignums(), figure_numbers)
+
+
+class TestDistanceIAViews(unittest.TestCase):
+    def _drawView(self, view, i_metric, a_metric, component_mapping=None):
+        '''
+        Returns the axes the given view of the distance of the given metrics is drawn into
+        '''
+        distance_ia = DistanceIA('', view, 2, component_mapping)
+        distance_ia._metrics_frame = createMetricsFrame(i_metric, a_metric)
+        distance_ia._calculate_distance()
+
+        ax = plt.figure().gca()
+        distance_ia._draw_distance(ax)
+
+        return ax
+
+    def tearDown(self):
+        plt.close('all')
+
+    def testTopView(self):
+        '''
+        Test that the top view shows the files with the largest distance, the largest on top
+        '''
+        names = ['a.h', 'b.h', 'c.h', 'd.h']
+        ax = self._drawView(TOP_VIEW, pd.Series([.0, .5, 1., .2], index=names), pd.Series([.0, .5, 1., .2], index=names))
+
+        self.assertEqual(len(ax.patches), 2)
+        labels_by_position = dict(zip(ax.get_yticks(), [label.get_text() for label in ax.get_yticklabels()]))
+        self.assertEqual(labels_by_position, {1: 'a.h', 0: 'c.h'})
+        self.assertEqual([bar.get_width() for bar in ax.patches], [1., 1.])
+
+    def testHistogramView(self):
+        '''
+        Test that the histogram view shows the number of files per range of the distance
+        '''
+        ax = self._drawView(HISTOGRAM_VIEW, pd.Series([.0, .5, 1., .5]), pd.Series([.0, .5, 1., .48]))
+
+        heights = [bar.get_height() for bar in ax.patches]
+        self.assertEqual(len(heights), HISTOGRAM_BINS)
+        self.assertEqual(heights[0], 2)
+        self.assertEqual(heights[-1], 2)
+        self.assertEqual(sum(heights), 4)
+
+    @patch('matplotlib.axes.Axes.bxp')
+    def testComponentsView(self, mocked_bxp_func):
+        '''
+        Test that the components view shows the distribution of the distance of the components with the largest
+        median distance
+        '''
+        # assert mocks
+        self.assertIs(axs.Axes.bxp, mocked_bxp_func)
+
+        names = ['core/a.h', 'core/b.h', 'gui/c.h', 'io/d.h', 'io/e.h', 'main.cpp']
+        self._drawView(COMPONENTS_VIEW, pd.Series([.0, .5, .5, .0, .1, .5], index=names),
+                       pd.Series([.0, .0, .5, .0, .1, .5], index=names))
+
+        # the files of the analyzed directory (main.cpp) belong to component "."
+        (statistics,), call_kwords = mocked_bxp_func.call_args
+        self.assertEqual([component['label'] for component in statistics], ['io', 'core'])
+        self.assertTrue(np.allclose([component['med'] for component in statistics], [.9, .75]))
+        self.assertTrue(np.allclose([component['whislo'] for component in statistics], [.8, .5]))
+        self.assertFalse(call_kwords['showfliers'])
+
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
+    def testComponentsViewOfFileMetrics(self, mocked_dsu_func):
+        '''
+        Test that the components view analyzes the directory per file, whatever component mapping is configured
+        '''
+        # assert mocks
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
+
+        names = ['core/a.h', 'gui/c.h']
+        mocked_dsu_func.return_value = createMetricsFrame(pd.Series([.0, .5], index=names),
+                                                          pd.Series([.0, .5], index=names))
+
+        DistanceIA('', COMPONENTS_VIEW)._compute_missing_distance()
+        DistanceIA('', FILES_VIEW)._compute_missing_distance()
+
+        self.assertEqual(mocked_dsu_func.call_args_list[0], ((('',), {'component_mapping': None})))
+        self.assertEqual(mocked_dsu_func.call_args_list[1], ((('',), {})))
+
+    def testFilesViewWithoutLabels(self):
+        '''
+        Test that the files view labels the files by their position if there are too many of them
+        '''
+        i_metric = pd.Series(np.linspace(0, 1, MAX_LABELED_FILES + 1))
+        i_metric.index = ['{}.h'.format(number) for number in i_metric.index]
+
+        ax = self._drawView(FILES_VIEW, i_metric, i_metric)
+
+        self.assertNotIn('0.h', [label.get_text() for label in ax.get_xticklabels()])
+
 
 class TestDistanceIASaveMetrics(unittest.TestCase):
     @patch('utils.FileUtility.save_metric_to_file')
@@ -137,27 +342,31 @@ class TestDistanceIASaveMetrics(unittest.TestCase):
         # assert mocks
         self.assertIs(fut.save_metric_to_file, mocked_fut_save_func)
 
-        # create mock value
-        mocked_dist_metric = pd.Series([.5], dtype=float)
-
-        # create object to test
+        # create object to test, whose distance is already computed
         distance_ia = createUUT()
-        with patch.object(distance_ia, '_distance', mocked_dist_metric):
-            # call function to test
-            distance_ia.save_metric('')
+        distance_ia._metrics_frame = createMetricsFrame(pd.Series([.5], index=['a.h']), pd.Series([.0], index=['a.h']))
+        distance_ia._calculate_distance()
 
-            # assert call
-            mocked_fut_save_func.assert_called_once()
+        # call function to test
+        distance_ia.save_metric('')
 
+        # assert call with the cycle membership of the files
+        mocked_fut_save_func.assert_called_once()
+        (call_distance, call_dir_path), call_kwords = mocked_fut_save_func.call_args
+        self.assertIs(call_distance, distance_ia._distance)
+        self.assertEqual(list(call_kwords['additional_columns']), [-1])
+
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
     @patch('utils.FileUtility.save_metric_to_file')
     @patch('metrics.distance_ia.DistanceIA._calculate_distance')
-    def testCorrectFunctionCallsIfMetricNotExisting(self, mocked_d_calc_func, mocked_fut_save_func):
+    def testCorrectFunctionCallsIfMetricNotExisting(self, mocked_d_calc_func, mocked_fut_save_func, mocked_dsu_func):
         '''
         Test that correct functions are invoked if metrics is not existing
         '''
         # assert mocks
         self.assertIs(DistanceIA._calculate_distance, mocked_d_calc_func)
         self.assertIs(fut.save_metric_to_file, mocked_fut_save_func)
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
 
         # create mock values
         mocked_dist_metric = None
@@ -170,5 +379,6 @@ class TestDistanceIASaveMetrics(unittest.TestCase):
             distance_ia.save_metric()
 
             # assert calls and function arguments
+            mocked_dsu_func.assert_called_once_with('')
             mocked_d_calc_func.assert_called_once()
             mocked_fut_save_func.assert_called_once()
@@ -6,8 +6,10 @@ from unittest.mock import patch
 import warnings
 
 import utils.FileUtility as fut
+import utils.SourceFileScanner as sfs
 
 from metrics.instability_metric import InstabilityMetric
+from utils.IncludeGraph import IncludeGraph
 
 # constants
 TEST_CODE_FILES = 'tests/files/instability_metric_test_files/'
@@ -78,205 +80,190 @@ class TestInstabilityMetricGetIncludesOfFile(unittest.TestCase):
         self.assertEqual(len(returned_user_include_list), 2)
         self.assertEqual(len(returned_stl_include_list), 1)
 
-
-class TestInstabilityMetricCreateUserIncludeMatrix(unittest.TestCase):
-    @patch('utils.FileUtility.extract_filename')
-    def testCorrectSizeOfMatrix(self, mocked_fut_func):
+    @patch('utils.SourceFileScanner.scan_file')
+    def testFileScannedOnlyOnce(self, mocked_sfs_func):
         '''
-        Test that the size of the returned matrix is correct
+        Test that a file is read only once, although its includes are requested several times
         '''
         # assert mock
-        self.assertIs(fut.extract_filename, mocked_fut_func)
+        self.assertIs(sfs.scan_file, mocked_sfs_func)
 
-        # define dummy return value
-        mocked_fut_func.return_value = "test"
+        mocked_sfs_func.return_value = sfs.FileRecord(SOURCE_FILE, ['lib1.hpp'], ['stdout'], 0, 0)
 
-        # create object and call function to test
-        instability_metric = createUUT(TEST_CODE_FILES)
-        with patch.object(instability_metric, '_list_of_user_files', os.listdir(TEST_CODE_FILES)):
-            instability_metric._create_user_include_matrix()
+        # create object and call function to test twice
+        instability_metric = createUUT()
+        instability_metric._get_includes_of_file(SOURCE_FILE)
+        returned_user_include_list, returned_stl_include_list = instability_metric._get_includes_of_file(SOURCE_FILE)
 
-            # assert correct size of matrix
-            self.assertEqual(instability_metric._include_matrix.shape, instability_metric._include_matrix.shape)
+        # assert single scan and correct result
+        mocked_sfs_func.assert_called_once()
+        self.assertEqual(returned_user_include_list, ['lib1.hpp'])
+        self.assertEqual(returned_stl_include_list, ['stdout'])
 
-    @patch('utils.FileUtility.extract_filename')
-    def testCorrectIndexAndColumnLabelsOfMatrix(self, mocked_fut_func):
+    @patch('utils.SourceFileScanner.scan_file')
+    def testProvidedFileRecordsAreUsed(self, mocked_sfs_func):
         '''
-        Test that the rows and columns are labeled correctly depending on the filenames
+        Test that already scanned files (provided file records) are not read again
         '''
         # assert mock
-        self.assertIs(fut.extract_filename, mocked_fut_func)
+        self.assertIs(sfs.scan_file, mocked_sfs_func)
 
-        # define dummy return values (a different one for each call to this mock)
-        expected_filenames = ['file{}'.format(i) for i in range(len(os.listdir(TEST_CODE_FILES)))]
-        mocked_fut_func.side_effect = expected_filenames
+        file_records = [sfs.FileRecord(SOURCE_FILE, ['lib2.hpp'], [], 0, 0)]
 
         # create object and call function to test
-        instability_metric = createUUT(TEST_CODE_FILES)
-        with patch.object(instability_metric, '_list_of_user_files', os.listdir(TEST_CODE_FILES)):
-            instability_metric._create_user_include_matrix()
+        instability_metric = InstabilityMetric('', file_records)
+        returned_user_include_list, returned_stl_include_list = instability_metric._get_includes_of_file(SOURCE_FILE)
 
-            # assert correct labeling
-            for i, row_label in enumerate(instability_metric._include_matrix.index):
-                self.assertEqual(row_label, expected_filenames[i])
-            for i, column_label in enumerate(instability_metric._include_matrix.columns):
-                self.assertEqual(column_label, expected_filenames[i])
+        # assert no scan and correct result
+        mocked_sfs_func.assert_not_called()
+        self.assertEqual(returned_user_include_list, ['lib2.hpp'])
+        self.assertEqual(returned_stl_include_list, [])
 
 
-class TestInstabilityMetricFillIncludeMatrix(unittest.TestCase):
-    @patch('utils.FileUtility.extract_filename')
-    @patch('metrics.instability_metric.InstabilityMetric._get_includes_of_file')
-    def testCheckMatrixIfNoIncludes(self, mocked_i_func, mocked_fut_func):
+class TestInstabilityMetricCreateIncludeGraph(unittest.TestCase):
+    @patch('utils.FileUtility.get_relative_path')
+    @patch('metrics.instability_metric.InstabilityMetric._get_includes_of_file', return_value=([], []))
+    def testCorrectNumberOfNodes(self, mocked_i_func, mocked_fut_func):
         '''
-        Test that the member-matrix remains unchanged (only 0s), if no include files are found
+        Test that one node is created for each user-file
         '''
-        # assert mocks
-        self.assertIs(fut.extract_filename, mocked_fut_func)
-        self.assertIs(InstabilityMetric._get_includes_of_file, mocked_i_func)
+        # assert mock
+        self.assertIs(fut.get_relative_path, mocked_fut_func)
 
         # define dummy return values (a different one for each call to this mock)
-        expected_filenames = ['file{}'.format(i) for i in range(len(os.listdir(TEST_CODE_FILES)))]
-        mocked_fut_func.side_effect = expected_filenames
+        mocked_fut_func.side_effect = ['file{}'.format(i) for i in range(len(os.listdir(TEST_CODE_FILES)))]
 
-        empty_user_include_list, empty_std_include_list = [], []
-        mocked_i_func.return_value = empty_user_include_list, empty_std_include_list
-
-        mocked_include_matrix = pd.DataFrame(np.zeros((3, 3)), dtype=int)
-        expected_include_matrix = pd.DataFrame(np.zeros((3, 3)), dtype=int)
-
-        # create object and call function to test, member-variable is empty
-        instability_metric = createUUT()
+        # create object and call function to test
+        instability_metric = createUUT(TEST_CODE_FILES)
         with patch.object(instability_metric, '_list_of_user_files', os.listdir(TEST_CODE_FILES)):
-            with patch.object(instability_metric, '_include_matrix', mocked_include_matrix):
-                instability_metric._fill_include_matrix()
+            instability_metric._create_include_graph()
 
-                # assert that mocks are called and the matrix contains 0s only
-                mocked_fut_func.assert_called()
-                mocked_i_func.assert_called()
-                self.assertTrue(instability_metric._include_matrix.equals(expected_include_matrix))
+            # assert correct number of nodes and no edges
+            self.assertEqual(instability_metric._include_graph.get_number_of_nodes(), len(os.listdir(TEST_CODE_FILES)))
+            self.assertEqual(instability_metric._nb_user_file_nodes, len(os.listdir(TEST_CODE_FILES)))
+            self.assertEqual(instability_metric._include_graph.get_number_of_edges(), 0)
 
-    @patch('utils.FileUtility.extract_filename')
-    @patch('metrics.instability_metric.InstabilityMetric._get_includes_of_file')
-    def testCheckMatrixIfIncludes(self, mocked_i_func, mocked_fut_func):
+    @patch('utils.FileUtility.get_relative_path')
+    @patch('metrics.instability_metric.InstabilityMetric._get_includes_of_file', return_value=([], []))
+    def testCorrectNodeNames(self, mocked_i_func, mocked_fut_func):
         '''
-        Test that the correct member-matrix is returned, if include files are found
+        Test that the nodes are named correctly depending on the filenames
         '''
-        # assert mocks
-        self.assertIs(fut.extract_filename, mocked_fut_func)
-        self.assertIs(InstabilityMetric._get_includes_of_file, mocked_i_func)
+        # assert mock
+        self.assertIs(fut.get_relative_path, mocked_fut_func)
 
-        # define dummy return values (a different one for each call to the mocks)
+        # define dummy return values (a different one for each call to this mock)
         expected_filenames = ['file{}'.format(i) for i in range(len(os.listdir(TEST_CODE_FILES)))]
         mocked_fut_func.side_effect = expected_filenames
-        # each pair defines the respective user or std-lib included files returned by mock
-        user_and_std_include_list = [([], ['std_lib']), (['file1'], []), (['file1', 'file2'], ['std_out'])]
-        mocked_i_func.side_effect = user_and_std_include_list
-
-        # matrix of shape (m x n), with m being #user-includes and n being (#user-includes + +std-includes)
-        expected_std_includes = ['std_lib', 'std_out']
-        mocked_include_matrix = pd.DataFrame(np.zeros((3, 5)), index=expected_filenames, columns=expected_filenames +
-                                             expected_std_includes, dtype=int)
-        initial_include_matrix = pd.DataFrame(np.zeros((3, 5)), index=expected_filenames, columns=expected_filenames +
-                                              expected_std_includes, dtype=int)
 
-        # create object and call function to test, member-variable is empty
-        instability_metric = createUUT()
+        # create object and call function to test
+        instability_metric = createUUT(TEST_CODE_FILES)
         with patch.object(instability_metric, '_list_of_user_files', os.listdir(TEST_CODE_FILES)):
-            with patch.object(instability_metric, '_include_matrix', mocked_include_matrix):
-                instability_metric._fill_include_matrix()
-
-                # assert that mocks are called and the matrix contains 0s only
-                mocked_fut_func.assert_called()
-                mocked_i_func.assert_called()
-                self.assertFalse(instability_metric._include_matrix.equals(initial_include_matrix))
+            instability_metric._create_include_graph()
 
-                # iterate through matrix and check for 1s and 0s
-                for i, row_label in enumerate(instability_metric._include_matrix.index):
-                    for column_label in instability_metric._include_matrix.columns:
-                        # matrix[i][j] should contain 1 iff j is contained in i-th tuple of 'user_and_std_include_list' above
-                        expected_entry = 0
-                        if column_label in user_and_std_include_list[i][0] or column_label in user_and_std_include_list[i][1]:
-                            expected_entry = 1
+            # assert correct naming (ids are given in order of the user-files)
+            self.assertEqual(instability_metric._include_graph.get_node_names(), expected_filenames)
 
-                        self.assertEqual(instability_metric._include_matrix.loc[row_label, column_label], expected_entry)
-
-
-class TestInstabilityMetricAddStlIncludes(unittest.TestCase):
+    @patch('utils.FileUtility.get_relative_path')
     @patch('metrics.instability_metric.InstabilityMetric._get_includes_of_file')
-    def testEmtpyStlIncludes(self, mocked_i_func):
+    def testCheckGraphIfNoIncludes(self, mocked_i_func, mocked_fut_func):
         '''
-        Test that no column is added to existing matrix if no STL includes are found
+        Test that the graph remains without edges, if no include files are found
         '''
-        # assert mock
+        # assert mocks
+        self.assertIs(fut.get_relative_path, mocked_fut_func)
         self.assertIs(InstabilityMetric._get_includes_of_file, mocked_i_func)
 
-        # each pair defines the respective user or std-lib included files returned by mock
-        empty_user_and_std_include_list = [([], []) for i in range(3)]
-        mocked_i_func.side_effect = empty_user_and_std_include_list
+        # define dummy return values (a different one for each call to this mock)
+        expected_filenames = ['file{}'.format(i) for i in range(len(os.listdir(TEST_CODE_FILES)))]
+        mocked_fut_func.side_effect = expected_filenames + expected_filenames
 
-        mocked_include_matrix = pd.DataFrame(np.zeros((3, 3)), dtype=int)
-        expected_include_matrix = pd.DataFrame(np.zeros((3, 3)), dtype=int)
+        empty_user_include_list, empty_std_include_list = [], []
+        mocked_i_func.return_value = empty_user_include_list, empty_std_include_list
 
-        # create object and call function to test, member-variable is empty
+        # create object and call function to test
         instability_metric = createUUT()
         with patch.object(instability_metric, '_list_of_user_files', os.listdir(TEST_CODE_FILES)):
-            with patch.object(instability_metric, '_include_matrix', mocked_include_matrix):
-                instability_metric._add_stl_includes()
+            instability_metric._create_include_graph()
 
-                # assert that mocks are called and the matrix was not extended
-                mocked_i_func.assert_called()
-                self.assertTrue(instability_metric._include_matrix.equals(expected_include_matrix))
-                self.assertEqual(instability_metric._include_matrix.shape, expected_include_matrix.shape)
+            # assert that mocks are called and the graph does not contain any edge
+            mocked_fut_func.assert_called()
+            mocked_i_func.assert_called()
+            self.assertEqual(instability_metric._include_graph.get_number_of_nodes(), len(expected_filenames))
+            self.assertEqual(instability_metric._include_graph.get_number_of_edges(), 0)
 
+    @patch('utils.FileUtility.get_relative_path')
     @patch('metrics.instability_metric.InstabilityMetric._get_includes_of_file')
-    def testNonEmtpyStlIncludes(self, mocked_i_func):
+    def testCheckGraphIfIncludes(self, mocked_i_func, mocked_fut_func):
         '''
-        Test that columns are added to existing matrix if STL includes are found
+        Test that the correct edges are added, if include files are found
         '''
-        # assert mock
+        # assert mocks
+        self.assertIs(fut.get_relative_path, mocked_fut_func)
         self.assertIs(InstabilityMetric._get_includes_of_file, mocked_i_func)
 
+        # define dummy return values (a different one for each call to the mocks)
+        expected_filenames = ['file{}'.format(i) for i in range(len(os.listdir(TEST_CODE_FILES)))]
+        mocked_fut_func.side_effect = expected_filenames + expected_filenames
         # each pair defines the respective user or std-lib included files returned by mock
         user_and_std_include_list = [([], ['std_lib']), (['file1'], []), (['file1', 'file2'], ['std_out'])]
         mocked_i_func.side_effect = user_and_std_include_list
 
-        mocked_include_matrix = pd.DataFrame(np.zeros((3, 3)), dtype=int)
-        expected_include_matrix_shape = (3, 5)
-
         # create object and call function to test
         instability_metric = createUUT()
         with patch.object(instability_metric, '_list_of_user_files', os.listdir(TEST_CODE_FILES)):
-            with patch.object(instability_metric, '_include_matrix', mocked_include_matrix):
-                instability_metric._add_stl_includes()
+            instability_metric._create_include_graph()
 
-                # assert that mocks are called and the matrix was extended by two columns
-                mocked_i_func.assert_called()
-                self.assertEqual(instability_metric._include_matrix.shape, expected_include_matrix_shape)
+            # assert that mocks are called and stl-libs are added as nodes
+            mocked_fut_func.assert_called()
+            mocked_i_func.assert_called()
+            include_graph = instability_metric._include_graph
+            self.assertEqual(include_graph.get_node_names(), expected_filenames + ['std_lib', 'std_out'])
 
+            # node i should include node j iff j is contained in i-th tuple of 'user_and_std_include_list' above
+            indptr, indices = include_graph.get_csr()
+            for i, (user_includes, std_includes) in enumerate(user_and_std_include_list):
+                included_names = [include_graph.get_node_names()[j] for j in indices[indptr[i]:indptr[i + 1]]]
+                self.assertEqual(sorted(included_names), sorted(user_includes + std_includes))
+
+    @patch('utils.FileUtility.get_relative_path')
     @patch('metrics.instability_metric.InstabilityMetric._get_includes_of_file')
-    def testNoDuplicatedStlIncludes(self, mocked_i_func):
+    def testNoDuplicatedStlIncludes(self, mocked_i_func, mocked_fut_func):
         '''
-        Test that duplicated stl-includes are added as a single column
+        Test that duplicated stl-includes are added as a single node
         '''
         # assert mocks
+        self.assertIs(fut.get_relative_path, mocked_fut_func)
         self.assertIs(InstabilityMetric._get_includes_of_file, mocked_i_func)
 
-        # each pair defines the respective user or std-lib included files returned by mock
+        # define dummy return values (a different one for each call to the mocks)
+        expected_filenames = ['file{}'.format(i) for i in range(len(os.listdir(TEST_CODE_FILES)))]
+        mocked_fut_func.side_effect = expected_filenames + expected_filenames
         user_and_std_include_list = [([], ['std_lib']), (['file1'], []), (['file1', 'file2'], ['std_lib'])]
         mocked_i_func.side_effect = user_and_std_include_list
 
-        mocked_include_matrix = pd.DataFrame(np.zeros((3, 3)), dtype=int)
-        expected_include_matrix_shape = (3, 4)
-
         # create object and call function to test
         instability_metric = createUUT()
         with patch.object(instability_metric, '_list_of_user_files', os.listdir(TEST_CODE_FILES)):
-            with patch.object(instability_metric, '_include_matrix', mocked_include_matrix):
-                instability_metric._add_stl_includes()
+            instability_metric._create_include_graph()
 
-                # assert that mocks are called and the matrix was extended by 1 column only
-                mocked_i_func.assert_called()
-                self.assertEqual(instability_metric._include_matrix.shape, expected_include_matrix_shape)
+            # assert that the graph was extended by 1 node only
+            self.assertEqual(instability_metric._include_graph.get_number_of_nodes(), len(expected_filenames) + 1)
+
+
+def createIncludeGraph(include_matrix):
+    '''
+    Returns an include-graph equivalent to the given 0/1 include-matrix (rows are the user-files)
+    '''
+    include_graph = IncludeGraph()
+    for row_label in include_matrix.index:
+        include_graph.add_node(row_label)
+    for row_label in include_matrix.index:
+        for column_label in include_matrix.columns:
+            if include_matrix.loc[row_label, column_label] == 1:
+                include_graph.add_edge(row_label, column_label)
+
+    return include_graph
 
 
 class TestInstabilityMetricGetAllFanIn(unittest.TestCase):
@@ -284,15 +271,17 @@ class TestInstabilityMetricGetAllFanIn(unittest.TestCase):
         '''
         Test that the correct value is returned
         '''
-        mocked_include_matrix = pd.DataFrame([[0, 1, 0], [1, 1, 1], [0, 0, 0]], dtype=int)
+        include_matrix = pd.DataFrame([[0, 1, 0, 1], [1, 1, 1, 0], [0, 0, 0, 0]], index=['a', 'b', 'c'],
+                                      columns=['a', 'b', 'c', 'std_lib'], dtype=int)
 
         # create object and call function to test
         instability_metric = createUUT()
-        with patch.object(instability_metric, '_include_matrix', mocked_include_matrix):
-            returned_sum_matrix = instability_metric._get_all_fan_in()
+        with patch.object(instability_metric, '_include_graph', createIncludeGraph(include_matrix)):
+            with patch.object(instability_metric, '_nb_user_file_nodes', 3):
+                returned_sum_matrix = instability_metric._get_all_fan_in()
 
-            # assert correct return value
-            self.assertTrue(returned_sum_matrix.equals(np.sum(instability_metric._include_matrix, axis=1)))
+                # assert correct return value (#1's in row)
+                self.assertTrue(returned_sum_matrix.equals(np.sum(include_matrix, axis=1)))
 
 
 class TestInstabilityMetricGetAllFanOut(unittest.TestCase):
@@ -300,15 +289,17 @@ class TestInstabilityMetricGetAllFanOut(unittest.TestCase):
         '''
         Test that the correct value is returned
         '''
-        mocked_include_matrix = pd.DataFrame([[0, 1, 0], [1, 1, 1], [0, 0, 0]], dtype=int)
+        include_matrix = pd.DataFrame([[0, 1, 0, 1], [1, 1, 1, 0], [0, 0, 0, 0]], index=['a', 'b', 'c'],
+                                      columns=['a', 'b', 'c', 'std_lib'], dtype=int)
 
         # create object and call function to test
         instability_metric = createUUT()
-        with patch.object(instability_metric, '_include_matrix', mocked_include_matrix):
-            returned_sum_matrix = instability_metric._get_all_fan_out()
+        with patch.object(instability_metric, '_include_graph', createIncludeGraph(include_matrix)):
+            with patch.object(instability_metric, '_nb_user_file_nodes', 3):
+                returned_sum_matrix = instability_metric._get_all_fan_out()
 
-            # assert correct return value
-            self.assertTrue(returned_sum_matrix.equals(np.sum(instability_metric._include_matrix, axis=0)))
+                # assert correct return value (#1's in column)
+                self.assertTrue(returned_sum_matrix.equals(np.sum(include_matrix, axis=0)))
 
 
 class TestInstabilityMetricCalculateInstabilityForEachFile(unittest.TestCase):
@@ -354,20 +345,16 @@ class TestInstabilityMetricCalculateInstabilityForEachFile(unittest.TestCase):
 
 class TestInstabilityMetricComputeInstability(unittest.TestCase):
     @patch('utils.FileUtility.get_all_code_files')
-    @patch('metrics.instability_metric.InstabilityMetric._create_user_include_matrix')
-    @patch('metrics.instability_metric.InstabilityMetric._add_stl_includes')
-    @patch('metrics.instability_metric.InstabilityMetric._fill_include_matrix')
+    @patch('metrics.instability_metric.InstabilityMetric._create_include_graph')
     @patch('metrics.instability_metric.InstabilityMetric._calculate_instability_for_each_file')
-    def testCorrectFunctionCallsWithEmptyFilePath(self, mocked_i_calc_func, mocked_i_fill_func, mocked_i_add_func,
-                                                  mocked_i_create_func, mocked_fut_get_func):
+    def testCorrectFunctionCallsWithEmptyFilePath(self, mocked_i_calc_func, mocked_i_create_func,
+                                                  mocked_fut_get_func):
         '''
         Test that the correct functions are invoked when an empty filepath was provided
         '''
         # assert mocks
         self.assertIs(InstabilityMetric._calculate_instability_for_each_file, mocked_i_calc_func)
-        self.assertIs(InstabilityMetric._fill_include_matrix, mocked_i_fill_func)
-        self.assertIs(InstabilityMetric._add_stl_includes, mocked_i_add_func)
-        self.assertIs(InstabilityMetric._create_user_include_matrix, mocked_i_create_func)
+        self.assertIs(InstabilityMetric._create_include_graph, mocked_i_create_func)
         self.assertIs(fut.get_all_code_files, mocked_fut_get_func)
 
         # create object and call function to test
@@ -377,25 +364,19 @@ class TestInstabilityMetricComputeInstability(unittest.TestCase):
         # assert function calls
         mocked_fut_get_func.assert_called_once()
         mocked_i_create_func.assert_called_once()
-        mocked_i_add_func.assert_called_once()
-        mocked_i_fill_func.assert_called_once()
         mocked_i_calc_func.assert_called_once()
 
     @patch('utils.FileUtility.get_all_code_files')
-    @patch('metrics.instability_metric.InstabilityMetric._create_user_include_matrix')
-    @patch('metrics.instability_metric.InstabilityMetric._add_stl_includes')
-    @patch('metrics.instability_metric.InstabilityMetric._fill_include_matrix')
+    @patch('metrics.instability_metric.InstabilityMetric._create_include_graph')
     @patch('metrics.instability_metric.InstabilityMetric._calculate_instability_for_each_file')
-    def testCorrectFunctionCallsWithNonEmptyFilePath(self, mocked_i_calc_func, mocked_i_fill_func, mocked_i_add_func,
-                                                     mocked_i_create_func, mocked_fut_get_func):
+    def testCorrectFunctionCallsWithNonEmptyFilePath(self, mocked_i_calc_func, mocked_i_create_func,
+                                                     mocked_fut_get_func):
         '''
         Test that the correct functions are invoked when a correct filepath was provided
         '''
         # assert mocks
         self.assertIs(InstabilityMetric._calculate_instability_for_each_file, mocked_i_calc_func)
-        self.assertIs(InstabilityMetric._fill_include_matrix, mocked_i_fill_func)
-        self.assertIs(InstabilityMetric._add_stl_includes, mocked_i_add_func)
-        self.assertIs(InstabilityMetric._create_user_include_matrix, mocked_i_create_func)
+        self.assertIs(InstabilityMetric._create_include_graph, mocked_i_create_func)
         self.assertIs(fut.get_all_code_files, mocked_fut_get_func)
 
         # create object and call function to test
@@ -405,6 +386,41 @@ class TestInstabilityMetricComputeInstability(unittest.TestCase):
         # assert function calls
         mocked_fut_get_func.assert_called_once()
         mocked_i_create_func.assert_called_once()
-        mocked_i_add_func.assert_called_once()
-        mocked_i_fill_func.assert_called_once()
         mocked_i_calc_func.assert_called_once()
+
+    def testCorrectResult(self):
+        '''
+        Test the computed instability of the test-files (I = #files including it / (#included + #including))
+        '''
+        instability_metric = createUUT(TEST_CODE_FILES)
+        returned_metric = instability_metric.compute_instability()
+
+        self.assertEqual(returned_metric['lib1.hpp'], 2 / 3)
+        self.assertEqual(returned_metric['lib2.hpp'], 1 / 2)
+        self.assertEqual(returned_metric['source.cpp'], 0)
+
+    def testFilesScannedInParallel(self):
+        '''
+        Test that the files are scanned by the given number of jobs at once and that the result does not depend on it
+        '''
+        with patch('utils.SourceFileScanner.iterate_scanned_files', wraps=sfs.iterate_scanned_files) as mocked_func:
+            returned_metric = InstabilityMetric(TEST_CODE_FILES, jobs=2).compute_instability()
+
+        mocked_func.assert_called_once()
+        self.assertEqual(mocked_func.call_args[1]['jobs'], 2)
+        self.assertTrue(returned_metric.equals(createUUT(TEST_CODE_FILES).compute_instability()))
+
+    def testFilesOfSameNameAreDistinguished(self):
+        '''
+        Test that files of the same name in different directories are different nodes, identified by their path
+        '''
+        file_records = [sfs.FileRecord('src/core/utils.h', [], [], 0, 0),
+                        sfs.FileRecord('src/core/core.cpp', ['utils.h'], [], 0, 0),
+                        sfs.FileRecord('src/gui/utils.h', ['core/utils.h'], [], 0, 0),
+                        sfs.FileRecord('src/gui/gui.cpp', ['utils.h'], ['vector'], 0, 0)]
+
+        instability_metric = InstabilityMetric('src', file_records)
+        returned_metric = instability_metric.compute_instability()
+
+        self.assertEqual(list(returned_metric.index), ['core/utils.h', 'core/core.cpp', 'gui/utils.h', 'gui/gui.cpp'])
+        self.assertEqual(list(returned_metric), [1., 0., 1 / 2, 0.])
@@ -1,18 +1,22 @@
 import matplotlib.axes as axs
 import matplotlib.backend_bases as bb
-import matplotlib.collections as coll
 import matplotlib.pyplot as plt
-import matplotlib.text as txt
 import numpy as np
+import os
 import pandas as pd
+import subprocess
+import sys
+import tempfile
 import unittest
 from unittest.mock import patch
 import warnings
 
 import utils.DataSeriesUtility as dsu
 import utils.FileUtility as fut
+import utils.IncludeCycles as ic
+import utils.MetricsFrame as mf
 
-from metrics.main_sequence import MainSequence
+from metrics.main_sequence import DENSITY_THRESHOLD, MAX_ANNOTATED_NAMES, MainSequence
 
 
 def createUUT():
@@ -22,174 +26,133 @@ def createUUT():
     return MainSequence('')
 
 
+def createMetricsFrame(i_metric, a_metric):
+    '''
+    Returns a metrics frame of the given instability and abstractness metric (without any dependencies or classes)
+    '''
+    zeros = np.zeros(len(i_metric), dtype=int)
+    return mf.create_metrics_frame_from_columns(list(i_metric.index), {
+        mf.INSTABILITY: i_metric.values, mf.ABSTRACTNESS: a_metric.values,
+        mf.DISTANCE: abs(a_metric.values + i_metric.values - 1), mf.FAN_IN: zeros, mf.FAN_OUT: zeros,
+        mf.NB_INTERFACES: zeros, mf.NB_CLASSES: zeros, mf.CYCLE: zeros + ic.NO_CYCLE})
+
+
+def createInteractiveUUT(i_metric, a_metric):
+    '''
+    Returns an object to test whose diagram of the given metrics is drawn into a new current figure
+    '''
+    plt.figure()
+    main_sequence = createUUT()
+    main_sequence._metrics_frame = createMetricsFrame(i_metric, a_metric)
+    main_sequence._draw_metrics()
+
+    return main_sequence
+
+
+def createMouseEvent(ax, x, y):
+    '''
+    Returns a mouse-motion event at the given position (data coordinates) of the axes
+    '''
+    return bb.MouseEvent('motion_notify_event', ax.figure.canvas, *ax.transData.transform((x, y)))
+
+
 class TestMainSequenceAnnotatePoint(unittest.TestCase):
-    @patch('matplotlib.collections.PathCollection.contains')
-    @patch('matplotlib.text.Text.set_visible')
-    @patch('matplotlib.text.Text.get_visible')
-    def testCorrectFunctionCallsIfSinglePointSelected(self, mocked_txt_get_vis_func, mocked_txt_set_vis_func,
-                                                      mocked_coll_cont_func):
+    def tearDown(self):
+        plt.close('all')
+
+    @patch('matplotlib.backend_bases.FigureCanvasBase.draw_idle')
+    def testSinglePointSelected(self, mocked_draw_func):
         '''
-        Test correct function calls if mouse hovers over a single scattered point
+        Test that the annotation shows the name of the point the mouse hovers over
         '''
         # assert mocks
-        self.assertIs(txt.Text.get_visible, mocked_txt_get_vis_func)
-        self.assertIs(txt.Text.set_visible, mocked_txt_set_vis_func)
-        self.assertIs(coll.PathCollection.contains, mocked_coll_cont_func)
+        self.assertIs(bb.FigureCanvasBase.draw_idle, mocked_draw_func)
 
-        # create mock values
-        mocked_ax = plt.gca()
-        mocked_ax.set_xlim((0, 1))
-        mocked_ax.set_ylim((0, 1))
-        mocked_scatter = mocked_ax.scatter(pd.Series([.5], dtype=float), pd.Series([.5], dtype=float))
-        mocked_coll_cont_func.return_value = True, {'ind': np.array([0], dtype=int)}
-        mocked_annotation_points_list = [
-            txt.Annotation('dummy-annotation1', (.5, .5), visible=False),
-            txt.Annotation('dummy-annotation2', (.1, .5), visible=False),
-            txt.Annotation('dummy-annotation3', (.7, .2), visible=False)
-        ]
-        mocked_mouse_event = bb.MouseEvent('mocked-mouse-event', plt.gcf().canvas, 322, 242)  # on point (.5|.5)
+        main_sequence = createInteractiveUUT(pd.Series([.5, .1, .7], index=['a.h', 'b.h', 'c.h']),
+                                             pd.Series([.5, .5, .2], index=['a.h', 'b.h', 'c.h']))
+        ax = plt.gca()
 
-        # create object
-        main_sequence = createUUT()
-        with patch.object(main_sequence, '_annotation_points', mocked_annotation_points_list):
-            # call function to test
-            main_sequence._annotate_point(mocked_mouse_event, mocked_scatter)
+        # call function to test (mouse on point (.1|.5))
+        main_sequence._annotate_point(createMouseEvent(ax, .1, .5), ax)
 
-            # assert function calls
-            mocked_coll_cont_func.assert_called_once()
-            call_list = [mocked_txt_get_vis_func(), mocked_txt_get_vis_func(), mocked_txt_get_vis_func()]
-            mocked_txt_get_vis_func.has_calls(call_list)  # called three times
-            mocked_txt_set_vis_func.assert_called()
+        self.assertTrue(main_sequence._annotation.get_visible())
+        self.assertEqual(main_sequence._annotation.get_text(), 'b.h')
+        self.assertEqual(tuple(main_sequence._annotation.xy), (.1, .5))
+        mocked_draw_func.assert_called_once()
 
-    @patch('matplotlib.collections.PathCollection.contains')
-    @patch('matplotlib.text.Text.set_visible')
-    @patch('matplotlib.text.Text.get_visible')
-    def testCorrectFunctionCallsIfPointNotSelected(self, mocked_txt_get_vis_func, mocked_txt_set_vis_func,
-                                                   mocked_coll_cont_func):
+    @patch('matplotlib.backend_bases.FigureCanvasBase.draw_idle')
+    def testPointNotSelected(self, mocked_draw_func):
         '''
-        Test correct function calls if point is not contained in any scattered point but in axes-view
+        Test that the annotation is hidden if the mouse is not on a point but in the axes-view
         '''
         # assert mocks
-        self.assertIs(txt.Text.get_visible, mocked_txt_get_vis_func)
-        self.assertIs(txt.Text.set_visible, mocked_txt_set_vis_func)
-        self.assertIs(coll.PathCollection.contains, mocked_coll_cont_func)
+        self.assertIs(bb.FigureCanvasBase.draw_idle, mocked_draw_func)
 
-        # create mock values
-        mocked_ax = plt.gca()
-        mocked_ax.set_xlim((0, 1))
-        mocked_ax.set_ylim((0, 1))
-        mocked_scatter = mocked_ax.scatter(pd.Series([.5], dtype=float), pd.Series([.5], dtype=float))
-        mocked_coll_cont_func.return_value = False, {'ind': np.array([])}
-        mocked_annotation_points_list = [
-            txt.Annotation('dummy-annotation', (.5, .5), visible=False),
-            txt.Annotation('dummy-annotation2', (.1, .5), visible=False),
-            txt.Annotation('dummy-annotation3', (.7, .2), visible=False)
-        ]
-        mocked_mouse_event = bb.MouseEvent('mocked-mouse-event', plt.gcf().canvas, 100, 200)  # not on point (.5|.5)
-        mocked_txt_get_vis_func.return_value = True
+        main_sequence = createInteractiveUUT(pd.Series([.5], index=['a.h']), pd.Series([.5], index=['a.h']))
+        ax = plt.gca()
 
-        # create object
-        main_sequence = createUUT()
-        with patch.object(main_sequence, '_annotation_points', mocked_annotation_points_list):
-            # call function to test
-            main_sequence._annotate_point(mocked_mouse_event, mocked_scatter)
+        # call function to test (on the point, away from it, again away from it)
+        main_sequence._annotate_point(createMouseEvent(ax, .5, .5), ax)
+        main_sequence._annotate_point(createMouseEvent(ax, .2, .3), ax)
+        main_sequence._annotate_point(createMouseEvent(ax, .3, .3), ax)
 
-            # assert function calls
-            mocked_coll_cont_func.assert_called_once()
-            call_list = [mocked_txt_get_vis_func(), mocked_txt_get_vis_func(), mocked_txt_get_vis_func()]
-            mocked_txt_get_vis_func.has_calls(call_list)  # called three times
-            mocked_txt_set_vis_func.assert_called()  # called several times
+        # assert hidden annotation, redrawn only when the annotation changed
+        self.assertFalse(main_sequence._annotation.get_visible())
+        self.assertEqual(mocked_draw_func.call_count, 2)
 
-    def testCorrectSettingOfMultipleAnnotationPoints(self):
+    @patch('matplotlib.backend_bases.FigureCanvasBase.draw_idle')
+    def testMultiplePointsSelected(self, mocked_draw_func):
         '''
-        Test correct setting of annotations if mouse hovers over multiple scattered points
+        Test that the annotation lists the names of all points close to the mouse, the nearest first
         '''
-        # create mock values
-        mocked_ax = plt.gca()
-        mocked_ax.set_xlim((0, 1))
-        mocked_ax.set_ylim((0, 1))
-        mocked_scatter = mocked_ax.scatter(pd.Series([.5, .5, .5], dtype=float), pd.Series([.5, .5, .5], dtype=float))
-        # 3 annotations on same point
-        mocked_annotation_points_list = [
-            txt.Annotation('dummy-annotation1', (.5, .5), visible=False),
-            txt.Annotation('dummy-annotation2', (.5, .5), visible=False),
-            txt.Annotation('dummy-annotation3', (.5, .5), visible=False)
-        ]
-        mocked_last_hov_index = -1
-        mocked_mouse_event_on = bb.MouseEvent('mocked-mouse-event-on', plt.gcf().canvas, 322, 242)  # on point (.5|.5)
-        mocked_mouse_event_off = bb.MouseEvent('mocked-mouse-event-off', plt.gcf().canvas, 100, 100)  # off point (.5|.5)
-
-        # create object
-        main_sequence = createUUT()
-        with patch.object(main_sequence, '_annotation_points', mocked_annotation_points_list):
-            with patch.object(main_sequence, '_last_hov_anno_index', mocked_last_hov_index):
-                # call function on point
-                main_sequence._annotate_point(mocked_mouse_event_on, mocked_scatter)
-
-                # assert last hovered index
-                self.assertEqual(0, main_sequence._last_hov_anno_index)
-                self.assertTrue(main_sequence._annotation_points[0].get_visible())
-
-                # call function off point
-                main_sequence._annotate_point(mocked_mouse_event_off, mocked_scatter)
+        # assert mocks
+        self.assertIs(bb.FigureCanvasBase.draw_idle, mocked_draw_func)
 
-                # assert last hovered index (no change in index off point)
-                self.assertEqual(0, main_sequence._last_hov_anno_index)
-                self.assertFalse(main_sequence._annotation_points[0].get_visible())
+        names = ['a.h', 'b.h', 'c.h', 'd.h']
+        main_sequence = createInteractiveUUT(pd.Series([.5, .5, .501, .9], index=names),
+                                             pd.Series([.5, .5, .5, .9], index=names))
+        ax = plt.gca()
 
-                # call function on point again (annotation should change)
-                main_sequence._annotate_point(mocked_mouse_event_on, mocked_scatter)
+        # call function to test (mouse next to c.h)
+        main_sequence._annotate_point(createMouseEvent(ax, .5015, .5), ax)
 
-                # assert last hovered index change
-                self.assertEqual(1, main_sequence._last_hov_anno_index)
-                self.assertTrue(main_sequence._annotation_points[1].get_visible())
+        self.assertEqual(main_sequence._annotation.get_text(), 'c.h\na.h\nb.h')
+        self.assertEqual(tuple(main_sequence._annotation.xy), (.501, .5))
 
-    def testCorrectSettingOfMultipleAnnotationPointsOfAnotherGroup(self):
+    @patch('matplotlib.backend_bases.FigureCanvasBase.draw_idle')
+    def testTooManyPointsSelected(self, mocked_draw_func):
         '''
-        Test correct setting of annotations if mouse hovers from one group of annotation points to another
+        Test that the annotation lists the first names only if too many points are close to the mouse
         '''
-        # create mock values
-        mocked_ax = plt.gca()
-        mocked_ax.set_xlim((0, 1))
-        mocked_ax.set_ylim((0, 1))
-        mocked_scatter = mocked_ax.scatter(pd.Series([.5, .5, .25, .25], dtype=float),
-                                           pd.Series([.5, .5, .25, .25], dtype=float))
-        # 2 annotations on same point
-        mocked_annotation_points_list = [
-            txt.Annotation('dummy-annotation1_1', (.5, .5), visible=False),
-            txt.Annotation('dummy-annotation1_2', (.5, .5), visible=False),
-            txt.Annotation('dummy-annotation2_1', (.25, .25), visible=False),
-            txt.Annotation('dummy-annotation2_2', (.25, .25), visible=False),
-        ]
-        mocked_last_hov_index = -1
-        mocked_mouse_event_on_1 = bb.MouseEvent('mocked-mouse-event-on-1', plt.gcf().canvas, 322, 242)  # on point (.5|.5)
-        mocked_mouse_event_on_2 = bb.MouseEvent('mocked-mouse-event-on-2', plt.gcf().canvas, 205, 146)  # on point (.25|.25)
-        mocked_mouse_event_off = bb.MouseEvent('mocked-mouse-event-off', plt.gcf().canvas, 100, 100)  # off points
+        # assert mocks
+        self.assertIs(bb.FigureCanvasBase.draw_idle, mocked_draw_func)
 
-        # create object
-        main_sequence = createUUT()
-        with patch.object(main_sequence, '_annotation_points', mocked_annotation_points_list):
-            with patch.object(main_sequence, '_last_hov_anno_index', mocked_last_hov_index):
-                # call function on point 1
-                main_sequence._annotate_point(mocked_mouse_event_on_1, mocked_scatter)
+        names = ['{}.h'.format(number) for number in range(MAX_ANNOTATED_NAMES + 3)]
+        main_sequence = createInteractiveUUT(pd.Series(.5, index=names), pd.Series(.5, index=names))
+        ax = plt.gca()
 
-                # assert last hovered index
-                self.assertEqual(0, main_sequence._last_hov_anno_index)
-                self.assertTrue(main_sequence._annotation_points[0].get_visible())
+        # call function to test
+        main_sequence._annotate_point(createMouseEvent(ax, .5, .5), ax)
 
-                # call function off point
-                main_sequence._annotate_point(mocked_mouse_event_off, mocked_scatter)
+        expected_lines = names[:MAX_ANNOTATED_NAMES] + ['... (3 more)']
+        self.assertEqual(main_sequence._annotation.get_text().split('\n'), expected_lines)
 
-                # assert last hovered index (no change in index off point)
-                self.assertEqual(0, main_sequence._last_hov_anno_index)
-                self.assertFalse(main_sequence._annotation_points[0].get_visible())
+    @patch('matplotlib.backend_bases.FigureCanvasBase.draw_idle')
+    def testMouseOutsideOfAxes(self, mocked_draw_func):
+        '''
+        Test that the annotation is hidden if the mouse leaves the axes
+        '''
+        # assert mocks
+        self.assertIs(bb.FigureCanvasBase.draw_idle, mocked_draw_func)
+
+        main_sequence = createInteractiveUUT(pd.Series([.0], index=['a.h']), pd.Series([.0], index=['a.h']))
+        ax = plt.gca()
 
-                # call function on point 2
-                main_sequence._annotate_point(mocked_mouse_event_on_2, mocked_scatter)
+        # call function to test (on the point, then outside of the axes)
+        main_sequence._annotate_point(createMouseEvent(ax, .0, .0), ax)
+        main_sequence._annotate_point(createMouseEvent(ax, -.5, -.5), ax)
 
-                # assert last hovered index change
-                self.assertEqual(2, main_sequence._last_hov_anno_index)
-                self.assertTrue(main_sequence._annotation_points[2].get_visible())
+        self.assertFalse(main_sequence._annotation.get_visible())
 
 
 class TestMainSequenceLayoutAx(unittest.TestCase):
@@ -292,64 +255,61 @@ class TestMainSequenceLayoutAx(unittest.TestCase):
 class TestMainSequenceDefineMotionAnnotationCallback(unittest.TestCase):
     @patch('matplotlib.backend_bases.FigureCanvasBase.mpl_connect')
     @patch('matplotlib.backend_bases.FigureCanvasBase.set_window_title')
-    @patch('matplotlib.text.Text.set_visible')
     @patch('matplotlib.axes.Axes.annotate')
-    def testEarlyReturnIfEmptyName(self, mocked_anno_func, mocked_vis_func, mocked_set_func, mocked_con_func):
+    def testEarlyReturnIfNoPoints(self, mocked_anno_func, mocked_set_func, mocked_con_func):
         '''
-        Test that the function returns early if annotation-list is empty (no motion_event will be set)
+        Test that the function returns early if there are no points to annotate (no motion_event will be set)
         '''
         # assert mocks
         self.assertIs(axs.Axes.annotate, mocked_anno_func)
-        self.assertIs(txt.Text.set_visible, mocked_vis_func)
         self.assertIs(bb.FigureCanvasBase.set_window_title, mocked_set_func)
         self.assertIs(bb.FigureCanvasBase.mpl_connect, mocked_con_func)
 
-        # create mock values
-        mocked_scatter = plt.gca().scatter(pd.Series(dtype=float), pd.Series(dtype=float))
-        mocked_annotation_points_list = []
-
         # create object
         main_sequence = createUUT()
-        with patch.object(main_sequence, '_annotation_points', mocked_annotation_points_list):
+        with patch.object(main_sequence, '_metrics_frame', createMetricsFrame(pd.Series(dtype=float),
+                                                                              pd.Series(dtype=float))):
             with warnings.catch_warnings(record=True) as w:
                 # Cause all warnings to always be triggered.
                 warnings.simplefilter('always')
 
                 # call function to test
-                main_sequence._define_motion_annotation_callback(mocked_scatter)
+                main_sequence._define_motion_annotation_callback(plt.gca())
 
                 # assert correct setting of warning and early returning of function
-                self.assertEqual([], main_sequence._annotation_points)
+                self.assertIsNone(main_sequence._annotation)
                 self.assertEqual(len(w), 1)
-                self.assertTrue('"self._names_map" is empty...returning directly, no motion_notifiy_event connected'
+                self.assertTrue('No points to annotate...returning directly, no motion_notifiy_event connected'
                                 in str(w[-1].message))
                 mocked_set_func.assert_called_once_with('Main Sequence')
                 mocked_anno_func.assert_not_called()
-                mocked_vis_func.assert_not_called()
-                mocked_con_func.assert_not_called()
+                self.assertNotIn('motion_notify_event', [call_args[0] for call_args, _ in mocked_con_func.call_args_list])
 
     @patch('matplotlib.backend_bases.FigureCanvasBase.mpl_connect')
     @patch('metrics.main_sequence.MainSequence._annotate_point')
     def testCallbackConnectionToMotionEvent(self, mocked_ms_anno_func, mocked_con_func):
         '''
-        Test that the annotation-callback is correctly connected to Figure.Canvas
+        Test that the annotation-callback is correctly connected to Figure.Canvas and a single annotation is created
         '''
         # assert mock
         self.assertIs(MainSequence._annotate_point, mocked_ms_anno_func)
         self.assertIs(bb.FigureCanvasBase.mpl_connect, mocked_con_func)
 
         # create mock values
-        mocked_scatter = plt.gca().scatter(pd.Series(dtype=float), pd.Series(dtype=float))
-        mocked_annotation_points_list = [txt.Annotation('dummy-annotation1', (.5, .5), visible=False)]
+        ax = plt.gca()
+        nb_texts = len(ax.texts)
 
         # create object
         main_sequence = createUUT()
-        with patch.object(main_sequence, '_annotation_points', mocked_annotation_points_list):
+        with patch.object(main_sequence, '_metrics_frame', createMetricsFrame(pd.Series([.5, .2]),
+                                                                              pd.Series([.5, .1]))):
             # call function to test
-            main_sequence._define_motion_annotation_callback(mocked_scatter)
+            main_sequence._define_motion_annotation_callback(ax)
 
             # assert correct function call
             mocked_con_func.assert_called_once()
+            self.assertEqual(len(ax.texts), nb_texts + 1)
+            self.assertFalse(main_sequence._annotation.get_visible())
 
             # assert call-arguments (canvas.mpl_connect)
             (call_event, call_lambda), _ = mocked_con_func.call_args
@@ -357,11 +317,12 @@ class TestMainSequenceDefineMotionAnnotationCallback(unittest.TestCase):
 
             # assert correct lambda connection by invoking it
             call_lambda(None)
-            mocked_ms_anno_func.assert_called_once_with(None, mocked_scatter)
+            mocked_ms_anno_func.assert_called_once_with(None, ax)
+        plt.close('all')
 
 
 class TestMainSequencePlotMetrics(unittest.TestCase):
-    @patch('utils.DataSeriesUtility.get_instability_and_abstractness_metric')
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
     @patch('matplotlib.axes.Axes.scatter')
     @patch('matplotlib.pyplot.show')
     @patch('metrics.main_sequence.MainSequence._define_motion_annotation_callback')
@@ -372,7 +333,7 @@ class TestMainSequencePlotMetrics(unittest.TestCase):
         Test that functions inside this method are called correctly
         '''
         # assert mocks
-        self.assertIs(dsu.get_instability_and_abstractness_metric, mocked_dsu_func)
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
         self.assertIs(axs.Axes.scatter, mocked_scatter_func)
         self.assertIs(plt.show, mocked_show_func)  # mock this function to no show the plotted window
         self.assertIs(MainSequence._define_motion_annotation_callback, mocked_ms_cb_func)
@@ -381,26 +342,23 @@ class TestMainSequencePlotMetrics(unittest.TestCase):
         # create return values for mocked functions
         mocked_i_metric = pd.Series(np.array([.6, .0, .1, 1., .0, .5]))
         mocked_a_metric = pd.Series(np.array([.3, 1., .0, 1., .8, .2]))
-        mocked_annotation_points_list = [plt.gca().annotate(n, (x, y), visible=False) for n, x, y in
-                                         zip(mocked_i_metric.index, mocked_i_metric, mocked_a_metric)]
 
         # assign mocked return values to mocks
-        mocked_dsu_func.return_value = mocked_i_metric, mocked_a_metric
+        mocked_dsu_func.return_value = createMetricsFrame(mocked_i_metric, mocked_a_metric)
         mocked_ms_func.return_value = plt.gca()
 
         # create object and call function to test
         main_sequence = createUUT()
-        with patch.object(main_sequence, '_annotation_points', mocked_annotation_points_list):
-            main_sequence.plot_metrics()
+        main_sequence.plot_metrics()
 
-            # assert calls (empty directory-path given for testing)
-            mocked_dsu_func.assert_called_once_with('')
-            mocked_ms_func.assert_called_once()
-            mocked_scatter_func.assert_called_once()
-            mocked_ms_cb_func.assert_called_once()
-            mocked_show_func.assert_called_once()
+        # assert calls (empty directory-path given for testing)
+        mocked_dsu_func.assert_called_once_with('')
+        mocked_ms_func.assert_called_once()
+        mocked_scatter_func.assert_called_once()
+        mocked_ms_cb_func.assert_called_once()
+        mocked_show_func.assert_called_once()
 
-    @patch('utils.DataSeriesUtility.get_instability_and_abstractness_metric')
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
     @patch('matplotlib.axes.Axes.scatter')
     @patch('matplotlib.pyplot.show')
     @patch('metrics.main_sequence.MainSequence._define_motion_annotation_callback')
@@ -411,7 +369,7 @@ class TestMainSequencePlotMetrics(unittest.TestCase):
         Test that functions inside this method are called with correct arguments
         '''
         # assert mocks
-        self.assertIs(dsu.get_instability_and_abstractness_metric, mocked_dsu_func)
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
         self.assertIs(axs.Axes.scatter, mocked_scatter_func)
         self.assertIs(plt.show, mocked_show_func)  # mock this function to no show the plotted window
         self.assertIs(MainSequence._define_motion_annotation_callback, mocked_ms_cb_func)
@@ -421,28 +379,158 @@ class TestMainSequencePlotMetrics(unittest.TestCase):
         mocked_i_metric = pd.Series(np.array([.6, .0, .1, 1., .0, .5]))
         mocked_a_metric = pd.Series(np.array([.3, 1., .0, 1., .8, .2]))
         mocked_ax = plt.gca()
-        mocked_scatter = mocked_ax.scatter(mocked_i_metric, mocked_a_metric)
-        mocked_annotation_points_list = [mocked_ax.annotate(n, (x, y), visible=False) for n, x, y in
-                                         zip(mocked_i_metric.index, mocked_i_metric, mocked_a_metric)]
 
         # assign mocked return values to mocks
-        mocked_dsu_func.return_value = mocked_i_metric, mocked_a_metric
+        mocked_dsu_func.return_value = createMetricsFrame(mocked_i_metric, mocked_a_metric)
         mocked_ms_func.return_value = mocked_ax
-        mocked_scatter_func.return_value = mocked_scatter
 
         # create object and call function to test
         main_sequence = createUUT()
-        with patch.object(main_sequence, '_annotation_points', mocked_annotation_points_list):
-            main_sequence.plot_metrics()
+        main_sequence.plot_metrics()
+
+        # assert call-arguments (ax.scatter)
+        (call_i_metric, call_a_metric), _ = mocked_scatter_func.call_args
+        self.assertTrue(np.all(mocked_i_metric == call_i_metric))
+        self.assertTrue(np.all(mocked_a_metric == call_a_metric))
+
+        # assert call-arguments (MainSequence._define_motion_annotation_callback)
+        call_args, _ = mocked_ms_cb_func.call_args
+        self.assertIs(call_args[0], mocked_ax)
+
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
+    @patch('matplotlib.axes.Axes.hexbin')
+    @patch('matplotlib.axes.Axes.scatter')
+    @patch('matplotlib.pyplot.show')
+    @patch('metrics.main_sequence.MainSequence._define_motion_annotation_callback')
+    def testDensityIfTooManyPoints(self, mocked_ms_cb_func, mocked_show_func, mocked_scatter_func, mocked_hexbin_func,
+                                   mocked_dsu_func):
+        '''
+        Test that the density of the points is drawn instead of the single points if there are too many of them
+        '''
+        # assert mocks
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
+        self.assertIs(axs.Axes.hexbin, mocked_hexbin_func)
+        self.assertIs(axs.Axes.scatter, mocked_scatter_func)
+        self.assertIs(plt.show, mocked_show_func)
 
-            # assert call-arguments (ax.scatter)
-            (call_i_metric, call_a_metric), _ = mocked_scatter_func.call_args
-            self.assertTrue(np.all(mocked_i_metric == call_i_metric))
-            self.assertTrue(np.all(mocked_a_metric == call_a_metric))
+        nb_points = DENSITY_THRESHOLD + 1
+        mocked_dsu_func.return_value = createMetricsFrame(pd.Series(np.linspace(0, 1, nb_points)),
+                                                          pd.Series(np.linspace(1, 0, nb_points)))
 
-            # assert call-arguments (MainSequence._define_motion_annotation_callback)
-            call_args, _ = mocked_ms_cb_func.call_args
-            self.assertEqual(call_args[0], mocked_scatter)
+        # create object and call function to test
+        main_sequence = createUUT()
+        main_sequence.plot_metrics()
+
+        # assert density drawn, annotations still available
+        mocked_hexbin_func.assert_called_once()
+        mocked_scatter_func.assert_not_called()
+        mocked_ms_cb_func.assert_called_once()
+        plt.close('all')
+
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
+    @patch('matplotlib.pyplot.show')
+    @patch('metrics.main_sequence.MainSequence._define_motion_annotation_callback')
+    def testGivenMetricsFramePlotted(self, mocked_ms_cb_func, mocked_show_func, mocked_dsu_func):
+        '''
+        Test that the metrics frame given to the constructor is plotted without analyzing the directory again
+        '''
+        # assert mocks
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_func)
+        self.assertIs(plt.show, mocked_show_func)
+
+        metrics_frame = createMetricsFrame(pd.Series([.6, .0], index=['a.h', 'b.h']),
+                                           pd.Series([.3, 1.], index=['a.h', 'b.h']))
+
+        # create object and call function to test
+        plt.figure()
+        main_sequence = MainSequence('', metrics_frame)
+        main_sequence.plot_metrics()
+
+        # assert given metrics plotted
+        mocked_dsu_func.assert_not_called()
+        mocked_show_func.assert_called_once()
+        self.assertEqual(len(plt.gca().collections), 1)
+        self.assertEqual(len(plt.gca().collections[0].get_offsets()), 2)
+        plt.close('all')
+
+
+class TestMainSequenceImports(unittest.TestCase):
+    def testSavePlotWithoutPyplot(self):
+        '''
+        Test that importing the module and saving the diagram does not import pyplot
+        '''
+        code = ('import os, sys, tempfile\n'
+                'sys.path.append("tests/modules_under_test/")\n'
+                'from utils import MetricsFrame\n'
+                'from metrics.main_sequence import MainSequence\n'
+                'metrics_frame = MetricsFrame.create_metrics_frame_from_columns(\n'
+                '    ["a.h"], {column: [0] for column in MetricsFrame.COLUMNS})\n'
+                'with tempfile.TemporaryDirectory() as tmp_dir:\n'
+                '    MainSequence("", metrics_frame).save_plot(os.path.join(tmp_dir, "main_sequence.png"))\n'
+                'print("matplotlib.pyplot" in sys.modules)')
+
+        output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True,
+                                universal_newlines=True).stdout.split()
+
+        self.assertEqual(output, ['False'])
+
+
+class TestMainSequenceRedrawMetrics(unittest.TestCase):
+    @patch('matplotlib.backend_bases.FigureCanvasBase.mpl_disconnect')
+    @patch('matplotlib.backend_bases.FigureCanvasBase.set_window_title')
+    def testPreviousDiagramReplaced(self, mocked_set_func, mocked_discon_func):
+        '''
+        Test that redrawing replaces the previous diagram and its motion callback
+        '''
+        # assert mocks
+        self.assertIs(bb.FigureCanvasBase.set_window_title, mocked_set_func)
+        self.assertIs(bb.FigureCanvasBase.mpl_disconnect, mocked_discon_func)
+
+        i_metric = pd.Series([.6, .0], index=['a.h', 'b.h'])
+        a_metric = pd.Series([.3, 1.], index=['a.h', 'b.h'])
+
+        # create object and call function to test twice
+        main_sequence = createUUT()
+        main_sequence.redraw_metrics(createMetricsFrame(i_metric, a_metric))
+        first_callback_id = main_sequence._motion_callback_id
+        main_sequence.redraw_metrics(createMetricsFrame(i_metric[:1], a_metric[:1]))
+
+        # assert single diagram containing the new metrics
+        mocked_discon_func.assert_called_once_with(first_callback_id)
+        self.assertEqual(len(plt.gcf().axes), 1)
+        self.assertEqual(len(plt.gca().collections), 1)
+        self.assertEqual(len(main_sequence._metrics_frame), 1)
+        plt.close('all')
+
+
+class TestMainSequenceSavePlot(unittest.TestCase):
+    @patch('metrics.main_sequence.MainSequence._define_motion_annotation_callback')
+    @patch('matplotlib.pyplot.show')
+    def testPlotSavedWithoutDisplay(self, mocked_show_func, mocked_ms_cb_func):
+        '''
+        Test that the diagram is rendered to the given files without displaying it or connecting a motion callback
+        '''
+        # assert mocks
+        self.assertIs(plt.show, mocked_show_func)
+        self.assertIs(MainSequence._define_motion_annotation_callback, mocked_ms_cb_func)
+
+        i_metric = pd.Series([.6, .0], index=['a.h', 'b.h'])
+        a_metric = pd.Series([.3, 1.], index=['a.h', 'b.h'])
+
+        # create object and call function to test for several formats
+        main_sequence = createUUT()
+        figure_numbers = plt.get_fignums()
+        with patch.object(main_sequence, '_metrics_frame', createMetricsFrame(i_metric, a_metric)):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                for filename in ['main_sequence.png', 'main_sequence.svg']:
+                    main_sequence.save_plot(os.path.join(tmp_dir, filename))
+                    self.assertGreater(os.path.getsize(os.path.join(tmp_dir, filename)), 0)
+
+        # assert no displayed figure and no annotations
+        mocked_show_func.assert_not_called()
+        mocked_ms_cb_func.assert_not_called()
+        self.assertEqual(plt.get_fignums(), figure_numbers)
+        self.assertIsNone(main_sequence._annotation)
 
 
 class TestMainSequenceSaveMetrics(unittest.TestCase):
@@ -455,22 +543,24 @@ class TestMainSequenceSaveMetrics(unittest.TestCase):
         self.assertIs(fut.save_metric_to_file, mocked_fut_save_func)
 
         # create mock values
-        mocked_ins_metric = pd.Series([.5], dtype=float)
-        mocked_abs_metric = pd.Series([.4], dtype=float)
+        mocked_metrics_frame = createMetricsFrame(pd.Series([.5], dtype=float), pd.Series([.4], dtype=float))
 
         # create object to test
         main_sequence = createUUT()
-        with patch.object(main_sequence, '_instability_metric', mocked_ins_metric):
-            with patch.object(main_sequence, '_abstractness_metric', mocked_abs_metric):
-                # call function to test
-                main_sequence.save_metrics('')
-
-                # assert calls and function arguments
-                call_list = [mocked_fut_save_func(mocked_ins_metric, ''),
-                             mocked_fut_save_func(mocked_abs_metric, '')]
-                mocked_fut_save_func.has_calls(call_list)
-
-    @patch('utils.DataSeriesUtility.get_instability_and_abstractness_metric')
+        with patch.object(main_sequence, '_metrics_frame', mocked_metrics_frame):
+            # call function to test
+            main_sequence.save_metrics('')
+
+            # assert calls and function arguments (named instability and abstractness metric)
+            self.assertEqual(mocked_fut_save_func.call_count, 2)
+            (saved_i_metric, saved_dir_path), _ = mocked_fut_save_func.call_args_list[0]
+            (saved_a_metric, _), _ = mocked_fut_save_func.call_args_list[1]
+            self.assertEqual(saved_i_metric.name, 'Instability-Metric')
+            self.assertEqual(saved_a_metric.name, 'Abstractness-Metric')
+            self.assertEqual(list(saved_a_metric), [.4])
+            self.assertEqual(saved_dir_path, '')
+
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
     @patch('utils.FileUtility.save_metric_to_file')
     def testCorrectFunctionCallsIfMetricsNotExisting(self, mocked_fut_save_func, mocked_dsu_get_func):
         '''
@@ -478,22 +568,42 @@ class TestMainSequenceSaveMetrics(unittest.TestCase):
         '''
         # assert mocks
         self.assertIs(fut.save_metric_to_file, mocked_fut_save_func)
-        self.assertIs(dsu.get_instability_and_abstractness_metric, mocked_dsu_get_func)
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_get_func)
 
         # create mock values
-        mocked_ins_metric = None
-        mocked_abs_metric = None
-        mocked_dsu_get_func.return_value = pd.Series([.5], dtype=float), pd.Series([.4], dtype=float)
+        mocked_dsu_get_func.return_value = createMetricsFrame(pd.Series([.5], dtype=float),
+                                                              pd.Series([.4], dtype=float))
 
         # create object to test
         main_sequence = createUUT()
-        with patch.object(main_sequence, '_instability_metric', mocked_ins_metric):
-            with patch.object(main_sequence, '_abstractness_metric', mocked_abs_metric):
-                # call function to test
-                main_sequence.save_metrics()
+        with patch.object(main_sequence, '_metrics_frame', None):
+            # call function to test
+            main_sequence.save_metrics()
+
+            # assert calls and function arguments
+            mocked_dsu_get_func.assert_called_once()
+            self.assertEqual(mocked_fut_save_func.call_count, 2)
+
+
+class TestMainSequenceExportMetrics(unittest.TestCase):
+    @patch('utils.DataSeriesUtility.get_metrics_frame')
+    @patch('utils.FileUtility.save_metrics_frame_to_file')
+    def testWholeFrameExportedOnce(self, mocked_fut_export_func, mocked_dsu_get_func):
+        '''
+        Test that all metrics are exported to the given file at once
+        '''
+        # assert mocks
+        self.assertIs(fut.save_metrics_frame_to_file, mocked_fut_export_func)
+        self.assertIs(dsu.get_metrics_frame, mocked_dsu_get_func)
+
+        # create mock values
+        mocked_metrics_frame = createMetricsFrame(pd.Series([.5], dtype=float), pd.Series([.4], dtype=float))
+        mocked_dsu_get_func.return_value = mocked_metrics_frame
+
+        # call function to test
+        main_sequence = createUUT()
+        main_sequence.export_metrics('metrics.jsonl')
 
-                # assert calls and function arguments
-                mocked_dsu_get_func.assert_called_once()
-                func_calls = [mocked_fut_save_func(mocked_ins_metric, ''),
-                              mocked_fut_save_func(mocked_abs_metric, '')]
-                mocked_fut_save_func.has_calls(func_calls)
+        # assert calls and function arguments
+        mocked_dsu_get_func.assert_called_once()
+        mocked_fut_export_func.assert_called_once_with(mocked_metrics_frame, 'metrics.jsonl')
@@ -0,0 +1,69 @@
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import AnalysisSession as ases
+import DataSeriesUtility as dsu
+
+
+class TestAnalysisSessionUpdateFiles(unittest.TestCase):
+    def setUp(self):
+        '''
+        Create a temporary directory containing two code files
+        '''
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._header_file = os.path.join(self._tmp_dir.name, 'lib1.hpp')
+        self._source_file = os.path.join(self._tmp_dir.name, 'source.cpp')
+        Path(self._header_file).write_text('class Lib1 {\n    virtual void run() = 0;\n};\n')
+        Path(self._source_file).write_text('#include "lib1.hpp"\n')
+
+        self._session = ases.AnalysisSession(self._tmp_dir.name)
+        self._session.scan()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _assertMetricsOfFullScan(self):
+        ''' assert that the metrics of the session equal the metrics of a full scan '''
+        metrics_frame = self._session.get_metrics_frame()
+        expected_metrics_frame = dsu.get_metrics_frame(self._tmp_dir.name)
+
+        self.assertEqual(metrics_frame.sort_index().to_dict(), expected_metrics_frame.sort_index().to_dict())
+
+    def testChangedAndNewFiles(self):
+        '''
+        Test that changed and new files are scanned again
+        '''
+        new_file = os.path.join(self._tmp_dir.name, 'lib2.hpp')
+        Path(self._source_file).write_text('#include "lib1.hpp"\n#include "lib2.hpp"\n')
+        Path(new_file).write_text('class Lib2 {\n};\n')
+
+        self._session.update_files({self._source_file, new_file})
+        self._assertMetricsOfFullScan()
+
+    def testDeletedFile(self):
+        '''
+        Test that deleted files are removed
+        '''
+        os.remove(self._header_file)
+        self._session.update_files({self._header_file})
+
+        self.assertEqual([record.file_path for record in self._session.get_file_records()], [self._source_file])
+        self._assertMetricsOfFullScan()
+
+    def testUpdateChangedFilesOfWatcher(self):
+        '''
+        Test that only changes reported by the file watcher lead to an update, None to a full scan
+        '''
+        file_watcher = MagicMock()
+        file_watcher.get_changed_files.return_value = set()
+        self.assertFalse(self._session.update_changed_files(file_watcher))
+
+        Path(self._source_file).write_text('')
+        file_watcher.get_changed_files.return_value = None
+        self.assertTrue(self._session.update_changed_files(file_watcher))
+        self._assertMetricsOfFullScan()
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+import warnings
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import CompilationDatabase as cdb
+
+
+class TestCompilationDatabaseGetIncludeDirectories(unittest.TestCase):
+    def testIncludeOptions(self):
+        '''
+        Test that attached and separated include directories of all include options are found in order
+        '''
+        arguments = ['g++', '-Iinclude', '-I', 'src', '-isystem', '/usr/include/qt', '-iquote../common',
+                     '-DNDEBUG', '-include', 'config.h', '-c', 'main.cpp']
+
+        returned_directories = cdb.get_include_directories(arguments, '/build')
+
+        self.assertEqual(returned_directories, [os.path.normpath(directory) for directory in
+                                                ['/build/include', '/build/src', '/usr/include/qt', '/common']])
+
+    def testMissingDirectory(self):
+        '''
+        Test that an include option at the end of the arguments is ignored
+        '''
+        self.assertEqual(cdb.get_include_directories(['g++', '-I']), [])
+
+
+class TestCompilationDatabaseLoadCompilationDatabase(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._database_file = os.path.join(self._tmp_dir.name, cdb.COMPILATION_DATABASE_FILENAME)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def testCommandAndArguments(self):
+        '''
+        Test that entries given by a command string and by an argument list are read (database given by its directory)
+        '''
+        build_directory = os.path.join(self._tmp_dir.name, 'build')
+        with open(self._database_file, 'w') as file:
+            json.dump([{'directory': build_directory, 'file': '../src/a.cpp', 'command': 'g++ -I ../include -c a.cpp'},
+                       {'directory': build_directory, 'file': 'b.cpp', 'arguments': ['g++', '-Igen', '-c', 'b.cpp']}],
+                      file)
+
+        returned_database = cdb.load_compilation_database(self._tmp_dir.name)
+
+        self.assertEqual(returned_database, {
+            os.path.join(self._tmp_dir.name, 'src', 'a.cpp'): [os.path.join(self._tmp_dir.name, 'include')],
+            os.path.join(build_directory, 'b.cpp'): [os.path.join(build_directory, 'gen')]})
+
+    def testInvalidDatabase(self):
+        '''
+        Test that a CompilationDatabaseError is raised for an invalid database, which is ignored with a warning
+        '''
+        with open(self._database_file, 'w') as file:
+            file.write('[{"directory": ')
+
+        with self.assertRaises(cdb.CompilationDatabaseError):
+            cdb.load_compilation_database(self._database_file)
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            self.assertIsNone(cdb.get_compilation_database(self._database_file))
+            self.assertTrue('...ignoring compilation database' in str(w[-1].message))
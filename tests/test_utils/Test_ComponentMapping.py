@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import ComponentMapping as cm
+
+
+class TestComponentMappingDirectoryComponents(unittest.TestCase):
+    def testDepth(self):
+        '''
+        Test that files are mapped to their directory cut after the given depth
+        '''
+        directory_components = cm.DirectoryComponents(2)
+
+        self.assertEqual(directory_components.get_component('src/core/io/file.h'), 'src/core')
+        self.assertEqual(directory_components.get_component('src/main.cpp'), 'src')
+        self.assertEqual(directory_components.get_component('main.cpp'), '.')
+
+
+class TestComponentMappingRuleComponents(unittest.TestCase):
+    def testFirstMatchingRule(self):
+        '''
+        Test that the first matching glob or regex rule counts and regex groups can be used in the name
+        '''
+        rule_components = cm.RuleComponents([('tests', '*/test_*'), (r'lib_\1', r're:src/(\w+)/'), ('app', 'app/*')])
+
+        self.assertEqual(rule_components.get_component('src/core/test_file.cpp'), 'tests')
+        self.assertEqual(rule_components.get_component('src/core/file.cpp'), 'lib_core')
+        self.assertEqual(rule_components.get_component('app/gui/main.cpp'), 'app')
+        self.assertIsNone(rule_components.get_component('main.cpp'))
+
+    def testInvalidRule(self):
+        '''
+        Test that a ComponentMappingError is raised for an invalid rule
+        '''
+        with self.assertRaises(cm.ComponentMappingError):
+            cm.parse_component_rule('core')
+        with self.assertRaises(cm.ComponentMappingError):
+            cm.RuleComponents([('core', 're:(')])
+        self.assertEqual(cm.parse_component_rule('core=src/core/*'), ('core', 'src/core/*'))
+
+
+class TestComponentMappingFileComponents(unittest.TestCase):
+    def testDirectoryOfMappedFiles(self):
+        '''
+        Test that a file not mapped belongs to the component of the nearest directory containing mapped files
+        '''
+        file_components = cm.FileComponents({'core/core.cpp': 'core', 'gui/widgets/button.cpp': 'widgets'})
+
+        self.assertEqual(file_components.get_component('core/core.cpp'), 'core')
+        self.assertEqual(file_components.get_component('core/io/file.h'), 'core')
+        self.assertEqual(file_components.get_component('gui/widgets/button.h'), 'widgets')
+        self.assertIsNone(file_components.get_component('gui/window.h'))
+
+    def testCMakeTargets(self):
+        '''
+        Test that the sources of the CMake targets are read from the codemodel of the CMake file API
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            reply_directory = os.path.join(tmp_dir, 'build', cm.CMAKE_REPLY_DIRECTORY)
+            os.makedirs(reply_directory)
+            codemodel = {'paths': {'source': tmp_dir, 'build': os.path.join(tmp_dir, 'build')},
+                         'configurations': [{'targets': [{'name': 'core', 'jsonFile': 'target-core.json'},
+                                                         {'name': 'app', 'jsonFile': 'target-app.json'}]}]}
+            targets = {'target-core.json': {'sources': [{'path': 'src/core/core.cpp'}]},
+                       'target-app.json': {'sources': [{'path': 'src/main.cpp'}, {'path': 'src/core/core.cpp'}]}}
+            for filename, content in [('codemodel-v2-0123.json', codemodel)] + list(targets.items()):
+                with open(os.path.join(reply_directory, filename), 'w') as file:
+                    json.dump(content, file)
+
+            file_components = cm.load_cmake_targets(os.path.join(tmp_dir, 'build'), os.path.join(tmp_dir, 'src'))
+
+            self.assertEqual(file_components.get_component('core/core.cpp'), 'app')
+            self.assertEqual(file_components.get_component('core/core.h'), 'app')
+            self.assertEqual(file_components.get_component('main.cpp'), 'app')
+
+    def testMissingCMakeReply(self):
+        '''
+        Test that a ComponentMappingError is raised if the CMake file API was not queried
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(cm.ComponentMappingError):
+                cm.load_cmake_targets(tmp_dir, '')
@@ -0,0 +1,117 @@
+import numpy as np
+import unittest
+from unittest.mock import patch
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import ComponentMetrics as cmet
+import ComponentMapping as cm
+import MetricsFrame as mf
+import SourceFileScanner as sfs
+
+sys.path.append('tests/modules_under_test/')
+from utils import AnalysisConfig
+from utils import DataSeriesUtility as dsu
+from utils.IncludeGraph import IncludeGraph
+
+# constants (components core and gui, gui/gui.cpp includes both headers of core and vector)
+FILE_RECORDS = [sfs.FileRecord('core/a.h', [], ['vector'], 1, 1),
+                sfs.FileRecord('core/b.h', ['a.h'], [], 0, 2),
+                sfs.FileRecord('gui/gui.cpp', ['core/a.h', 'core/b.h'], ['vector'], 0, 0),
+                sfs.FileRecord('gui/gui.h', ['core/a.h'], [], 1, 1)]
+
+
+class TestComponentMetricsAggregateIncludeGraph(unittest.TestCase):
+    def testAggregationEqualsSetsOfFiles(self):
+        '''
+        Test that fan-in and fan-out of each component equal the number of distinct files outside the component
+        included by / including it for a random graph
+        '''
+        random_state = np.random.RandomState(0)
+        nb_nodes, nb_components = 60, 5
+        include_graph = IncludeGraph()
+        for node in range(nb_nodes):
+            include_graph.add_node(node)
+        for source, target in random_state.randint(0, nb_nodes, (400, 2)):
+            include_graph.add_edge(source, target)
+        node_components = random_state.randint(-1, nb_components, nb_nodes)
+
+        indptr, indices = include_graph.get_csr()
+        fan_in, fan_out = cmet.aggregate_include_graph(indptr, indices, node_components, nb_components)
+
+        edges = [(source, target) for source in range(nb_nodes) for target in indices[indptr[source]:indptr[source + 1]]]
+        for component in range(nb_components):
+            included = {target for source, target in edges
+                        if node_components[source] == component and node_components[target] != component}
+            including = {source for source, target in edges
+                         if node_components[target] == component and node_components[source] != component}
+            self.assertEqual(fan_in[component], len(included))
+            self.assertEqual(fan_out[component], len(including))
+
+
+class TestComponentMetricsCreateComponentMetricsFrame(unittest.TestCase):
+    def testComponentsByDirectory(self):
+        '''
+        Test the metrics of components given by their directory
+        '''
+        metrics_frame, include_graph = dsu.compute_file_metrics('', FILE_RECORDS)
+
+        returned_frame = cmet.create_component_metrics_frame(include_graph, metrics_frame, cm.DirectoryComponents(1))
+
+        self.assertEqual(list(returned_frame.index), ['core', 'gui'])
+        self.assertEqual(list(returned_frame.columns), mf.COLUMNS + [cmet.NB_FILES])
+        self.assertEqual(list(returned_frame[mf.FAN_IN]), [1, 3])
+        self.assertEqual(list(returned_frame[mf.FAN_OUT]), [2, 0])
+        self.assertEqual(list(returned_frame[mf.NB_INTERFACES]), [1, 1])
+        self.assertEqual(list(returned_frame[mf.NB_CLASSES]), [3, 1])
+        self.assertEqual(list(returned_frame[cmet.NB_FILES]), [2, 2])
+        self.assertTrue(np.allclose(returned_frame[mf.INSTABILITY], [2 / 3, 0]))
+        self.assertTrue(np.allclose(returned_frame[mf.DISTANCE], [0, 0]))
+
+    def testFilesWithoutComponent(self):
+        '''
+        Test that files without component are outside of all components
+        '''
+        metrics_frame, include_graph = dsu.compute_file_metrics('', FILE_RECORDS)
+
+        returned_frame = cmet.create_component_metrics_frame(include_graph, metrics_frame,
+                                                             cm.RuleComponents([('gui', 'gui/*.cpp')]))
+
+        self.assertEqual(list(returned_frame.index), ['gui'])
+        self.assertEqual(list(returned_frame[mf.FAN_IN]), [3])
+        self.assertEqual(list(returned_frame[cmet.NB_FILES]), [1])
+
+    def testComponentCycles(self):
+        '''
+        Test that components including each other form a cycle, although their files do not
+        '''
+        file_records = FILE_RECORDS + [sfs.FileRecord('core/c.h', ['gui/gui.h'], [], 0, 0),
+                                       sfs.FileRecord('io/io.h', ['core/c.h'], [], 0, 0)]
+        metrics_frame, include_graph = dsu.compute_file_metrics('', file_records)
+
+        returned_frame = cmet.create_component_metrics_frame(include_graph, metrics_frame, cm.DirectoryComponents(1))
+
+        self.assertEqual(list(metrics_frame[mf.CYCLE].unique()), [-1])
+        self.assertEqual(list(returned_frame.index), ['core', 'gui', 'io'])
+        self.assertEqual(list(returned_frame[mf.CYCLE]), [0, 0, -1])
+
+    def testComponentsConfigured(self):
+        '''
+        Test that the metrics frame contains the components if a component mapping is given
+        '''
+        returned_frame = dsu.compute_metrics_frame('', FILE_RECORDS, cm.DirectoryComponents(0))
+
+        self.assertEqual(list(returned_frame.index), ['.'])
+        self.assertEqual(list(returned_frame[mf.FAN_IN]), [1])
+
+    def testConfiguredComponentsByDefault(self):
+        '''
+        Test that the component mapping configured in AnalysisConfig is used by default and that the metrics are
+        computed per file if no component mapping is given explicitly
+        '''
+        with patch.object(AnalysisConfig, 'COMPONENT_MAPPING', cm.DirectoryComponents(1)):
+            configured_frame = dsu.compute_metrics_frame('', FILE_RECORDS)
+            file_frame = dsu.compute_metrics_frame('', FILE_RECORDS, None)
+
+        self.assertEqual(list(configured_frame.index), ['core', 'gui'])
+        self.assertEqual(list(file_frame.index), [record.file_path for record in FILE_RECORDS])
@@ -1,15 +1,14 @@
 import numpy as np
 import pandas as pd
 import unittest
-from unittest.mock import patch
 import sys
 
 sys.path.append('tests/modules_under_test/utils/')
 import DataSeriesUtility as dsu
+import SourceFileScanner as sfs
 
-sys.path.append('tests/modules_under_test/metrics/')
-from instability_metric import InstabilityMetric
-from abstractness_metric import AbstractnessMetric
+# constants
+TEST_CODE_FILES = 'tests/files/'
 
 
 class TestDataSeriesUtilityGetInstabilityAndAbstractnessMetric(unittest.TestCase):
@@ -23,112 +22,39 @@ class TestDataSeriesUtilityGetInstabilityAndAbstractnessMetric(unittest.TestCase
         self.assertEqual(returned_instability_metric.dtype, float)
         self.assertEqual(returned_abstractness_metric.dtype, float)
 
-    @patch('DataSeriesUtility.reorder_data_series_elements')
-    @patch('DataSeriesUtility.pad_data_series_with_default_values')
-    @patch('abstractness_metric.AbstractnessMetric.compute_abstractness')
-    @patch('instability_metric.InstabilityMetric.compute_instability')
-    def testCorrectFunctionCallsWithEmptyFilePath(self, mocked_comp_i_func, mocked_comp_a_func,
-                                                  mocked_pad_func, mocked_reorder_func):
+    def testSameFilesInSameOrder(self):
         '''
-        Test that the correct functions are invoked (or not invoked) when an empty filepath was provided
+        Test that both metrics contain the same files in the same order and are named
         '''
-        # assert mocks
-        self.assertIs(InstabilityMetric.compute_instability, mocked_comp_i_func)
-        self.assertIs(AbstractnessMetric.compute_abstractness, mocked_comp_a_func)
-        self.assertIs(dsu.reorder_data_series_elements, mocked_reorder_func)
+        returned_i_metric, returned_a_metric = dsu.get_instability_and_abstractness_metric(TEST_CODE_FILES)
 
-        # call function to test
-        returned_i_metric, returned_a_metric = dsu.get_instability_and_abstractness_metric('')
-        mocked_comp_i_func.assert_called_once()
-        mocked_comp_a_func.assert_called_once()
-        mocked_pad_func.assert_not_called()
-        mocked_reorder_func.assert_called_once()
-
-    @patch('DataSeriesUtility.reorder_data_series_elements')
-    @patch('DataSeriesUtility.pad_data_series_with_default_values')
-    @patch('abstractness_metric.AbstractnessMetric.compute_abstractness')
-    @patch('instability_metric.InstabilityMetric.compute_instability')
-    def testCorrectFunctionCallsWithCorrectFilePath(self, mocked_comp_i_func, mocked_comp_a_func,
-                                                    mocked_pad_func, mocked_reorder_func):
-        '''
-        Test that the correct functions are invoked when A and I of different size are returned by compute_X function
-        '''
-        # assert mocks
-        self.assertIs(InstabilityMetric.compute_instability, mocked_comp_i_func)
-        self.assertIs(AbstractnessMetric.compute_abstractness, mocked_comp_a_func)
-        self.assertIs(dsu.pad_data_series_with_default_values, mocked_pad_func)
-        self.assertIs(dsu.reorder_data_series_elements, mocked_reorder_func)
-
-        # set return values of mocked functions
-        data_series = pd.Series(np.ones(5), dtype=float)
-        data_series_to_pad = pd.Series(np.ones(3), dtype=float)
-        padded_data_series = pd.Series([1, 1, 1, 0, 0], dtype=float)
-        mocked_comp_i_func.return_value = data_series
-        mocked_comp_a_func.return_value = data_series_to_pad
-        mocked_pad_func.return_value = padded_data_series
-
-        # call function to test
-        returned_i_metric, returned_a_metric = dsu.get_instability_and_abstractness_metric('')
-        mocked_comp_i_func.assert_called_once()
-        mocked_comp_a_func.assert_called_once()
-        mocked_pad_func.assert_called_once_with(data_series, data_series_to_pad)
-        mocked_reorder_func.assert_called_once_with(data_series, padded_data_series)
+        self.assertEqual(list(returned_i_metric.index), list(returned_a_metric.index))
+        self.assertEqual(returned_i_metric.name, 'Instability-Metric')
+        self.assertEqual(returned_a_metric.name, 'Abstractness-Metric')
 
 
-class TestDataSeriesUtilityPadDataSeriesWithDefaultValues(unittest.TestCase):
-    def testEmtpyFunctionArguments(self):
+class TestDataSeriesUtilityGetMetricsFrame(unittest.TestCase):
+    def testMetricsJoined(self):
         '''
-        Test that if either first or second argument are not of type pd.Series an empty pd.Series
-        with dtype=float is returned
+        Test that instability and abstractness metric of different size are joined into one frame
         '''
-        empty_data_series = pd.Series(dtype=float)
-        # first arg empty
-        returned_padded_data_series = dsu.pad_data_series_with_default_values(None, empty_data_series)
-        self.assertIsInstance(returned_padded_data_series, type(pd.Series(dtype=float)))
-        self.assertEqual(returned_padded_data_series.dtype, float)
-        # second arg empty
-        returned_padded_data_series = dsu.pad_data_series_with_default_values(empty_data_series, None)
-        self.assertIsInstance(returned_padded_data_series, type(pd.Series(dtype=float)))
-        self.assertEqual(returned_padded_data_series.dtype, float)
+        # a.cpp is not considered by the abstractness metric
+        file_records = [sfs.FileRecord('a.cpp', ['b.h'], [], 0, 0), sfs.FileRecord('b.h', [], [], 1, 2)]
 
-    def testCorrectPadding(self):
-        '''
-        Test that
-            - the second argument is correctly padded with a default value
-            - all indices are present in padded array
-        '''
-        data_series = pd.Series(np.ones(5), index=['a', 'b', 'c', 'd', 'e'], dtype=float)
-        data_series_to_pad = pd.Series(np.ones(2), index=['c', 'e'], dtype=float)
-        returned_padded_data_series = dsu.pad_data_series_with_default_values(data_series, data_series_to_pad)
-        self.assertEqual(returned_padded_data_series.size, data_series.size)
-        for index in returned_padded_data_series.index:
-            self.assertTrue(index in data_series.index)
-        self.assertEqual(returned_padded_data_series[3], dsu.DEFAULT_PADDING_VALUE)
+        # call function to test
+        returned_metrics_frame = dsu.compute_metrics_frame('', file_records)
 
+        self.assertEqual(list(returned_metrics_frame.index), ['a.cpp', 'b.h'])
+        self.assertEqual(list(returned_metrics_frame['I']), [.0, 1.])
+        self.assertEqual(list(returned_metrics_frame['A']), [.0, .5])
+        self.assertEqual(list(returned_metrics_frame['N_c']), [0, 2])
+        self.assertTrue(np.allclose(returned_metrics_frame['D'], [1., .5]))
 
-class TestDataSeriesReorderDataSeriesElements(unittest.TestCase):
-    def testEmtpyFunctionArguments(self):
+    def testMetricsFrameOfDirectory(self):
         '''
-        Test that if either first or second argument are not of type pd.Series an empty pd.Series
-        with dtype=float is returned
+        Test that the metrics frame of a directory contains all files and columns
         '''
-        empty_data_series = pd.Series(dtype=float)
-        # first arg empty
-        returned_reorderd_data_series = dsu.reorder_data_series_elements(None, empty_data_series)
-        self.assertIsInstance(returned_reorderd_data_series, type(pd.Series(dtype=float)))
-        self.assertEqual(returned_reorderd_data_series.dtype, float)
-        # second arg empty
-        returned_reorderd_data_series = dsu.pad_data_series_with_default_values(empty_data_series, None)
-        self.assertIsInstance(returned_reorderd_data_series, type(pd.Series(dtype=float)))
-        self.assertEqual(returned_reorderd_data_series.dtype, float)
+        returned_metrics_frame = dsu.get_metrics_frame(TEST_CODE_FILES)
 
-    def testCorrectReordering(self):
-        '''
-        Test that the seconds argument is correctly reordered
-        '''
-        data_series = pd.Series(np.ones(5), index=['a', 'b', 'c', 'd', 'e'], dtype=float)
-        data_series_to_reorder = pd.Series(np.ones(5), index=['c', 'e', 'a', 'b', 'd'], dtype=float)
-        returned_reorderd_data_series = dsu.reorder_data_series_elements(data_series, data_series_to_reorder)
-        self.assertEqual(returned_reorderd_data_series.size, data_series.size)
-        for index in returned_reorderd_data_series.index:
-            self.assertEqual(returned_reorderd_data_series[index], data_series[index])
+        self.assertEqual(list(returned_metrics_frame.columns), ['I', 'A', 'D', 'fan_in', 'fan_out', 'N_a', 'N_c', 'cycle'])
+        self.assertEqual(len(returned_metrics_frame), 5)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import FileMetrics as fm
+import IncludeCycles as ic
+import MetricsFrame as mf
+import SourceFileScanner as sfs
+
+sys.path.append('tests/modules_under_test/metrics/')
+from instability_metric import InstabilityMetric
+from abstractness_metric import AbstractnessMetric
+
+# constants
+TEST_CODE_FILES = 'tests/files/'
+
+
+class TestFileMetricsComputeFileMetrics(unittest.TestCase):
+    def testEqualsMetricsOfMetricClasses(self):
+        '''
+        Test that the metrics computed without pandas equal the metrics of the instability and abstractness metric,
+        the files of the instability metric come first
+        '''
+        file_records = sfs.scan_code_files(TEST_CODE_FILES)
+
+        instability = InstabilityMetric(TEST_CODE_FILES, file_records).compute_instability()
+        abstractness = AbstractnessMetric(TEST_CODE_FILES, file_records).compute_abstractness()
+
+        names, columns, _ = fm.compute_file_metrics(TEST_CODE_FILES, file_records)
+
+        self.assertEqual(names[:len(instability)], list(instability.index))
+        self.assertEqual(set(names), set(instability.index) | set(abstractness.index))
+        self.assertTrue(np.allclose(pd.Series(columns[mf.INSTABILITY], index=names)[instability.index], instability))
+        self.assertTrue(np.allclose(pd.Series(columns[mf.ABSTRACTNESS], index=names)[abstractness.index],
+                                    abstractness))
+
+    def testFilesOnlyKnownToAbstractnessMetric(self):
+        '''
+        Test that files not considered by the instability metric follow the other files with default values
+        '''
+        file_records = [sfs.FileRecord('b.h', [], [], 1, 2), sfs.FileRecord('a.cpp', ['b.h', 'a.cpp'], [], 0, 0)]
+
+        names, columns, include_graph = fm.compute_file_metrics('', file_records)
+
+        self.assertEqual(names, ['b.h', 'a.cpp'])
+        self.assertEqual(list(columns[mf.FAN_IN]), [0, 2])
+        self.assertEqual(list(columns[mf.FAN_OUT]), [1, 1])
+        self.assertEqual(list(columns[mf.NB_CLASSES]), [2, 0])
+        self.assertEqual(list(columns[mf.CYCLE]), [ic.NO_CYCLE, 0])
+        self.assertEqual(include_graph.get_number_of_nodes(), 2)
+
+    def testNoFiles(self):
+        '''
+        Test that no files result in empty columns
+        '''
+        names, columns, _ = fm.compute_file_metrics('', [])
+
+        self.assertEqual(names, [])
+        self.assertEqual(sorted(columns), sorted(mf.COLUMNS))
+        self.assertEqual(columns[mf.INSTABILITY].size, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
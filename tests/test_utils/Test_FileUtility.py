@@ -1,5 +1,10 @@
+import importlib.util
+import json
+import os
 import pandas as pd
 from pathlib import Path
+import tempfile
+import types
 import unittest
 from unittest.mock import patch
 import warnings
@@ -45,6 +50,68 @@ class TestFileUtilityGetAllCodeFiles(unittest.TestCase):
             self.assertTrue('Returning empty list..' in str(w[-1].message))
 
 
+class TestFileUtilityIterateCodeFiles(unittest.TestCase):
+    def testReturnsGenerator(self):
+        '''
+        Test that files are provided lazily by a generator
+        '''
+        returned_type = fut.iterate_code_files('tests/files/', ['h'])
+        self.assertIsInstance(returned_type, types.GeneratorType)
+
+    def testAllExtensionsInSingleTraversal(self):
+        '''
+        Test that files of all provided extensions are found
+        '''
+        returned_files = list(fut.iterate_code_files('tests/files/', ['cpp', 'hpp', 'h']))
+        returned_names = sorted(fut.extract_filename(file) for file in returned_files)
+        self.assertEqual(returned_names, ['abstract_class.h', 'lib1.hpp', 'lib2.hpp', 'non_abstract_class.h', 'source.cpp'])
+
+    def testHiddenEntriesArePruned(self):
+        '''
+        Test that hidden files and files inside hidden directories are ignored
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, '.hidden').mkdir()
+            Path(tmp_dir, '.hidden', 'ignored.h').touch()
+            Path(tmp_dir, '.ignored.h').touch()
+            Path(tmp_dir, 'found.h').touch()
+
+            returned_files = list(fut.iterate_code_files(tmp_dir, ['h']))
+            self.assertEqual(returned_files, [os.path.join(tmp_dir, 'found.h')])
+
+    def testSymlinkLoopIsVisitedOnce(self):
+        '''
+        Test that a directory-symlink pointing to its parent does not lead to an endless traversal
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, 'sub').mkdir()
+            Path(tmp_dir, 'sub', 'file.h').touch()
+            try:
+                os.symlink(tmp_dir, os.path.join(tmp_dir, 'sub', 'loop'), target_is_directory=True)
+            except (OSError, NotImplementedError):
+                self.skipTest('symlinks are not supported on this platform')
+
+            returned_files = list(fut.iterate_code_files(tmp_dir, ['h']))
+            self.assertEqual(returned_files, [os.path.join(tmp_dir, 'sub', 'file.h')])
+
+
+class TestFileUtilityScanDirectory(unittest.TestCase):
+    def testOneLevelOnly(self):
+        '''
+        Test that the matching files and the sub-directories of the given directory are returned, without descending
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, 'sub').mkdir()
+            Path(tmp_dir, 'sub', 'nested.h').touch()
+            Path(tmp_dir, '.hidden').mkdir()
+            Path(tmp_dir, 'found.h').touch()
+            Path(tmp_dir, 'other.txt').touch()
+
+            returned_files, returned_directories = fut.scan_directory(tmp_dir, ('.h',), set())
+            self.assertEqual(returned_files, [os.path.join(tmp_dir, 'found.h')])
+            self.assertEqual(returned_directories, [os.path.join(tmp_dir, 'sub')])
+
+
 class TestFileUtilityExtractFileName(unittest.TestCase):
     def testEmptyFilePath(self):
         '''
@@ -63,6 +130,22 @@ class TestFileUtilityExtractFileName(unittest.TestCase):
         self.assertEqual(returned_name, 'filename.py')
 
 
+class TestFileUtilityGetRelativePath(unittest.TestCase):
+    def testPathInDirectory(self):
+        '''
+        Test that a normalized path relative to the given directory is returned
+        '''
+        returned_path = fut.get_relative_path(os.path.join('root', 'src', '.', 'utils.h'), 'root/')
+        self.assertEqual(returned_path, 'src/utils.h')
+
+    def testEmptyDirectoryPath(self):
+        '''
+        Test that an empty directory path denotes the current working directory
+        '''
+        returned_path = fut.get_relative_path(os.path.join('.', 'src', 'utils.h'), '')
+        self.assertEqual(returned_path, 'src/utils.h')
+
+
 class TestFileUtilitySaveMetricToFile(unittest.TestCase):
     @patch('pathlib.Path.is_dir')
     @patch('pathlib.Path.mkdir')
@@ -116,3 +199,97 @@ class TestFileUtilitySaveMetricToFile(unittest.TestCase):
         mocked_pl_isdir.assert_called_once()
         mocked_pl_join.assert_called_once()
         mocked_pd_csv.assert_called_once()
+
+    def testSaveWithAdditionalColumns(self):
+        '''
+        Test that additional columns are saved next to the metric
+        '''
+        metric = pd.Series([.1, .2], index=['a.h', 'b.h'], name='Distance', dtype=float)
+        cycle = pd.Series([0, -1], index=['a.h', 'b.h'], name='Cycle')
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fut.save_metric_to_file(metric, tmp_dir, additional_columns=cycle)
+            saved_files = os.listdir(tmp_dir)
+            saved_frame = pd.read_csv(os.path.join(tmp_dir, saved_files[0]), index_col=0)
+
+        self.assertEqual(len(saved_files), 1)
+        self.assertEqual(list(saved_frame.columns), ['Distance', 'Cycle'])
+        self.assertEqual(list(saved_frame['Cycle']), [0, -1])
+
+
+class TestFileUtilitySaveMetricsFrameToFile(unittest.TestCase):
+    def setUp(self):
+        self.metrics_frame = pd.DataFrame({'I': [.5, 1.], 'A': [.0, .5], 'D': [.5, .5], 'fan_in': [1, 2], 'cycle': [0, -1]},
+                                          index=pd.Index(['a.h', 'src/b.cpp'], dtype=object))
+
+    def testSaveJsonLines(self):
+        '''
+        Test that each file is saved as one JSON object containing its name and all columns
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'sub', 'metrics.jsonl')
+            fut.save_metrics_frame_to_file(self.metrics_frame, file_path)
+            with open(file_path) as file:
+                rows = [json.loads(line) for line in file]
+            saved_files = os.listdir(os.path.join(tmp_dir, 'sub'))
+
+        self.assertEqual(saved_files, ['metrics.jsonl'])
+        self.assertEqual(rows, [{'name': 'a.h', 'I': .5, 'A': .0, 'D': .5, 'fan_in': 1, 'cycle': 0},
+                                {'name': 'src/b.cpp', 'I': 1., 'A': .5, 'D': .5, 'fan_in': 2, 'cycle': -1}])
+
+    def testSaveCsvReplacesFile(self):
+        '''
+        Test that all columns are saved to the given file, which is replaced if it exists
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'metrics.csv')
+            Path(file_path).write_text('outdated')
+            fut.save_metrics_frame_to_file(self.metrics_frame, file_path)
+            saved_frame = pd.read_csv(file_path, index_col='name')
+
+        self.assertEqual(list(saved_frame.columns), ['I', 'A', 'D', 'fan_in', 'cycle'])
+        self.assertEqual(list(saved_frame.index), ['a.h', 'src/b.cpp'])
+        self.assertEqual(list(saved_frame['cycle']), [0, -1])
+
+    def testSaveCsvOfColumns(self):
+        '''
+        Test that metrics given by names and columns (without a metrics frame) are saved as csv, one line per row
+        '''
+        columns = {column: self.metrics_frame[column].values for column in self.metrics_frame.columns}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'metrics.csv')
+            fut.save_metrics_to_file(['a.h', 'src/b.cpp'], columns, file_path)
+            saved_lines = Path(file_path).read_text().splitlines()
+
+        self.assertEqual(saved_lines, ['name,I,A,D,fan_in,cycle', 'a.h,0.5,0.0,0.5,1,0', 'src/b.cpp,1.0,0.5,0.5,2,-1'])
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def testSaveParquet(self):
+        '''
+        Test that all columns are saved to a parquet file
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'metrics.parquet')
+            fut.save_metrics_frame_to_file(self.metrics_frame, file_path)
+            saved_frame = pd.read_parquet(file_path)
+
+        self.assertEqual(list(saved_frame.columns), ['name', 'I', 'A', 'D', 'fan_in', 'cycle'])
+        self.assertEqual(list(saved_frame['fan_in']), [1, 2])
+
+    def testUnknownFormat(self):
+        '''
+        Test that an error is raised if the extension of the file is unknown
+        '''
+        with self.assertRaises(fut.ExportError):
+            fut.get_export_format('metrics.xlsx')
+
+    @patch('importlib.util.find_spec')
+    def testMissingPyarrow(self, mocked_find_spec):
+        '''
+        Test that an error is raised if a format requires pyarrow which is not installed
+        '''
+        mocked_find_spec.return_value = None
+
+        with self.assertRaises(fut.ExportError):
+            fut.get_export_format('metrics.parquet')
+        self.assertEqual(fut.get_export_format('metrics.JSONL'), fut.JSONL_FORMAT)
@@ -0,0 +1,123 @@
+import os
+from pathlib import Path
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import FileWatcher as fw
+
+# constants
+FILE_EXTENSIONS = ['h', 'cpp']
+
+
+class FileWatcherTestCase(unittest.TestCase):
+    def setUp(self):
+        '''
+        Create a temporary directory containing a code file and a file which is not a code file
+        '''
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._code_file = os.path.join(self._tmp_dir.name, 'file.h')
+        Path(self._code_file).write_text('#include "lib1.hpp"\n')
+        Path(self._tmp_dir.name, 'readme.txt').write_text('')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _change_files(self):
+        ''' change, add and delete code files and change a file which is not a code file, return the changed files '''
+        new_file = os.path.join(self._tmp_dir.name, 'new.cpp')
+        sub_directory = os.path.join(self._tmp_dir.name, 'sub')
+        sub_directory_file = os.path.join(sub_directory, 'sub.h')
+
+        Path(self._code_file).write_text('#include "lib2.hpp"\n#include "lib3.hpp"\n')
+        Path(new_file).write_text('')
+        Path(self._tmp_dir.name, 'readme.txt').write_text('changed')
+        os.mkdir(sub_directory)
+        Path(sub_directory_file).write_text('')
+
+        return {self._code_file, new_file, sub_directory_file}
+
+
+class TestFileWatcherPolling(FileWatcherTestCase):
+    def testNoChanges(self):
+        '''
+        Test that an empty set is returned if no file changed
+        '''
+        file_watcher = fw.PollingFileWatcher(self._tmp_dir.name, FILE_EXTENSIONS, poll_interval=0.01)
+        self.assertEqual(file_watcher.get_changed_files(0.05), set())
+
+    def testChangedFiles(self):
+        '''
+        Test that changed, added and deleted code files are returned
+        '''
+        file_watcher = fw.PollingFileWatcher(self._tmp_dir.name, FILE_EXTENSIONS, poll_interval=0.01)
+        changed_files = self._change_files()
+        self.assertEqual(file_watcher.get_changed_files(1), changed_files)
+
+        os.remove(self._code_file)
+        self.assertEqual(file_watcher.get_changed_files(1), {self._code_file})
+
+    def testPolledAtMostOncePerInterval(self):
+        '''
+        Test that the directory is not walked again before the poll interval passed, however often the changed files
+        are requested
+        '''
+        file_watcher = fw.PollingFileWatcher(self._tmp_dir.name, FILE_EXTENSIONS, poll_interval=0.2)
+        changed_files = self._change_files()
+
+        with patch.object(file_watcher, '_get_file_states', wraps=file_watcher._get_file_states) as mocked_func:
+            for _ in range(10):
+                self.assertEqual(file_watcher.get_changed_files(), set())
+            mocked_func.assert_not_called()
+
+            time.sleep(0.2)
+            self.assertEqual(file_watcher.get_changed_files(), changed_files)
+
+
+@unittest.skipIf(fw._load_inotify() is None, 'inotify is not available')
+class TestFileWatcherInotify(FileWatcherTestCase):
+    def setUp(self):
+        super().setUp()
+        self._file_watcher = fw.InotifyFileWatcher(self._tmp_dir.name, FILE_EXTENSIONS, fw._load_inotify())
+
+    def tearDown(self):
+        self._file_watcher.close()
+        super().tearDown()
+
+    def testNoChanges(self):
+        '''
+        Test that an empty set is returned if no file changed
+        '''
+        self.assertEqual(self._file_watcher.get_changed_files(0.05), set())
+
+    def testChangedFiles(self):
+        '''
+        Test that changed, added and deleted code files are returned, including files of new directories
+        '''
+        changed_files = self._change_files()
+        self.assertEqual(self._file_watcher.get_changed_files(1), changed_files)
+
+        os.remove(self._code_file)
+        self.assertEqual(self._file_watcher.get_changed_files(1), {self._code_file})
+
+    def testRenamedFile(self):
+        '''
+        Test that both paths of a renamed file (e.g. written by an editor via a temporary file) are returned
+        '''
+        renamed_file = os.path.join(self._tmp_dir.name, 'renamed.h')
+        os.rename(self._code_file, renamed_file)
+        self.assertEqual(self._file_watcher.get_changed_files(1), {self._code_file, renamed_file})
+
+    def testDeletedDirectory(self):
+        '''
+        Test that None is returned if a directory was deleted, all files have to be compared then
+        '''
+        sub_directory = os.path.join(self._tmp_dir.name, 'sub')
+        os.mkdir(sub_directory)
+        self._file_watcher.get_changed_files(1)
+
+        os.rmdir(sub_directory)
+        self.assertIsNone(self._file_watcher.get_changed_files(1))
@@ -0,0 +1,150 @@
+import os
+from pathlib import Path
+import subprocess
+import tempfile
+import unittest
+import warnings
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import GitUtility as gu
+import SourceFileScanner as sfs
+
+
+def _git(directory_path, *git_arguments):
+    subprocess.run(['git', '-C', directory_path] + list(git_arguments), check=True, stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE)
+
+
+def _scan_with_snapshot(directory_path, cache_dir):
+    ''' scan all files like a first run with --since, which saves the snapshot for the next run '''
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        sfs.scan_code_files(directory_path, cache_dir, since_revision='HEAD')
+
+
+class TestGitUtilityParseNameStatus(unittest.TestCase):
+    def testAllStatusTypes(self):
+        '''
+        Test that added, modified, deleted, renamed and copied paths are classified correctly
+        '''
+        name_status_output = 'A\0added.h\0M\0modified.h\0D\0deleted.h\0R087\0old.h\0new.h\0C100\0orig.h\0copy.h\0'
+        changed_paths, deleted_paths = gu.parse_name_status(name_status_output)
+
+        self.assertEqual(changed_paths, ['added.h', 'modified.h', 'new.h', 'copy.h'])
+        self.assertEqual(deleted_paths, ['deleted.h', 'old.h'])
+
+    def testEmptyOutput(self):
+        '''
+        Test that no changes result in two empty lists
+        '''
+        self.assertEqual(gu.parse_name_status(''), ([], []))
+
+
+class TestGitUtilityGetChangedFiles(unittest.TestCase):
+    def setUp(self):
+        '''
+        Create a temporary git repository with two committed code files
+        '''
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._repo = self._tmp_dir.name
+        try:
+            _git(self._repo, 'init', '-q')
+        except (OSError, subprocess.CalledProcessError):
+            self._tmp_dir.cleanup()
+            self.skipTest('git is not available')
+
+        _git(self._repo, 'config', 'user.email', 'test@example.com')
+        _git(self._repo, 'config', 'user.name', 'test')
+        Path(self._repo, 'a.hpp').write_text('#include <vector>\n')
+        Path(self._repo, 'b.hpp').write_text('#include "a.hpp"\n')
+        Path(self._repo, 'c.hpp').write_text('')
+        _git(self._repo, 'add', '.')
+        _git(self._repo, 'commit', '-q', '-m', 'initial')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def testChangedDeletedAndUntrackedFiles(self):
+        '''
+        Test that modified, deleted and untracked files are reported relative to the given directory
+        '''
+        Path(self._repo, 'a.hpp').write_text('#include <map>\n')
+        os.remove(os.path.join(self._repo, 'c.hpp'))
+        Path(self._repo, 'new.hpp').write_text('')
+
+        changed_files, deleted_files = gu.get_changed_files(self._repo, 'HEAD')
+        self.assertEqual(sorted(changed_files), [os.path.join(self._repo, 'a.hpp'), os.path.join(self._repo, 'new.hpp')])
+        self.assertEqual(deleted_files, [os.path.join(self._repo, 'c.hpp')])
+
+    def testUnknownRevision(self):
+        '''
+        Test that an unknown revision raises a GitError
+        '''
+        with self.assertRaises(gu.GitError):
+            gu.get_changed_files(self._repo, 'unknown-revision')
+
+    def testIncrementalScanEqualsFullScan(self):
+        '''
+        Test that patching the snapshot of a previous run results in the same records as scanning all files
+        '''
+        cache_dir = os.path.join(self._repo, '.scm_cache')
+        _scan_with_snapshot(self._repo, cache_dir)
+
+        Path(self._repo, 'a.hpp').write_text('#include <map>\n')
+        os.remove(os.path.join(self._repo, 'c.hpp'))
+        Path(self._repo, 'd.hpp').write_text('#include "b.hpp"\n')
+
+        with warnings.catch_warnings(record=True) as w:
+            # Cause all warnings to always be triggered.
+            warnings.simplefilter("always")
+
+            # no warning indicates that the snapshot was patched instead of scanning all files
+            incremental_records = sfs.scan_code_files(self._repo, cache_dir, since_revision='HEAD')
+            self.assertEqual(len(w), 0)
+
+        full_records = sfs.scan_code_files(self._repo)
+        self.assertEqual(sorted(incremental_records), sorted(full_records))
+
+    def testRevertedUncommittedChangeScannedAgain(self):
+        '''
+        Test that a file with uncommitted changes when the snapshot was taken is scanned again, although its changes
+        were reverted since (i.e. it equals the revision again)
+        '''
+        cache_dir = os.path.join(self._repo, '.scm_cache')
+        Path(self._repo, 'a.hpp').write_text('#include <map>\n')
+        _scan_with_snapshot(self._repo, cache_dir)
+
+        _git(self._repo, 'checkout', '--', 'a.hpp')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            incremental_records = sfs.scan_code_files(self._repo, cache_dir, since_revision='HEAD')
+            self.assertEqual(len(w), 0)
+
+        self.assertEqual(incremental_records, sfs.scan_code_files(self._repo))
+
+    def testSnapshotOfOtherCommit(self):
+        '''
+        Test that all files are scanned if the snapshot was not taken at the given revision
+        '''
+        cache_dir = os.path.join(self._repo, '.scm_cache')
+        _scan_with_snapshot(self._repo, cache_dir)
+
+        Path(self._repo, 'c.hpp').write_text('#include "a.hpp"\n')
+        _git(self._repo, 'commit', '-q', '-a', '-m', 'change')
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            incremental_records = sfs.scan_code_files(self._repo, cache_dir, since_revision='HEAD')
+            self.assertEqual(len(w), 1)
+            self.assertTrue('...scanning all files' in str(w[-1].message))
+
+        self.assertEqual(incremental_records, sfs.scan_code_files(self._repo))
+
+    def testNoSnapshotWithoutRevision(self):
+        '''
+        Test that a run which does not patch a previous run saves no snapshot
+        '''
+        cache_dir = os.path.join(self._repo, '.scm_cache')
+        sfs.scan_code_files(self._repo, cache_dir)
+
+        self.assertIsNone(sfs.load_snapshot(sfs.get_snapshot_file(cache_dir, self._repo)))
@@ -0,0 +1,110 @@
+import json
+import numpy as np
+import os
+import tempfile
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import IncludeCycles as ic
+
+sys.path.append('tests/modules_under_test/')
+from utils.IncludeGraph import IncludeGraph
+
+
+def create_include_graph(nb_nodes, edges):
+    include_graph = IncludeGraph()
+    for node in range(nb_nodes):
+        include_graph.add_node('file{}.h'.format(node))
+    for source, target in edges:
+        include_graph.add_edge('file{}.h'.format(source), 'file{}.h'.format(target))
+
+    return include_graph
+
+
+class TestIncludeCyclesFindStronglyConnectedComponents(unittest.TestCase):
+    def testComponentsInReverseTopologicalOrder(self):
+        '''
+        Test that the nodes of a cycle share their label and a component only includes components of smaller labels
+        '''
+        # 0 -> 1 -> 2 -> 0 is a cycle, 2 -> 3 -> 4 -> 3 contains a second cycle
+        edges = [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 3), (5, 0)]
+        indptr, indices = create_include_graph(6, edges).get_csr()
+
+        labels, nb_components = ic.find_strongly_connected_components(indptr, indices)
+
+        self.assertEqual(nb_components, 3)
+        self.assertEqual(len({labels[0], labels[1], labels[2]}), 1)
+        self.assertEqual(labels[3], labels[4])
+        for source, target in edges:
+            self.assertGreaterEqual(labels[source], labels[target])
+
+    def testDeepChain(self):
+        '''
+        Test that a long include chain (deeper than the recursion limit) is processed
+        '''
+        nb_nodes = 100000
+        indptr = np.arange(nb_nodes + 1)
+        indptr[-1] = nb_nodes - 1
+        indices = np.arange(1, nb_nodes)
+
+        labels, nb_components = ic.find_strongly_connected_components(indptr, indices)
+
+        self.assertEqual(nb_components, nb_nodes)
+        self.assertTrue(np.all(np.diff(labels) < 0))
+
+
+class TestIncludeCyclesGetCycleIds(unittest.TestCase):
+    def testCycleIds(self):
+        '''
+        Test that cycles are numbered by their first file and files outside of cycles have no cycle id
+        '''
+        include_graph = create_include_graph(6, [(0, 1), (1, 0), (2, 3), (3, 4), (4, 2), (5, 1)])
+
+        returned_ids = ic.get_cycle_ids(*include_graph.get_csr())
+
+        self.assertEqual(list(returned_ids), [0, 0, 1, 1, 1, ic.NO_CYCLE])
+
+    def testSelfInclude(self):
+        '''
+        Test that a file including itself is a cycle
+        '''
+        include_graph = create_include_graph(3, [(0, 1), (1, 1)])
+
+        returned_ids = ic.get_cycle_ids(*include_graph.get_csr())
+
+        self.assertEqual(list(returned_ids), [ic.NO_CYCLE, 0, ic.NO_CYCLE])
+
+    def testEmptyGraph(self):
+        '''
+        Test that an empty include graph contains no cycles
+        '''
+        self.assertEqual(ic.get_cycle_ids(*IncludeGraph().get_csr()).size, 0)
+
+
+class TestIncludeCyclesSaveCondensation(unittest.TestCase):
+    def testCondensation(self):
+        '''
+        Test that the condensation contains the components in topological order and the edges between them
+        '''
+        include_graph = create_include_graph(4, [(0, 1), (1, 0), (1, 2), (3, 0), (3, 2)])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'graph', 'condensation.json')
+            ic.save_condensation(include_graph, file_path)
+            with open(file_path, 'r') as file:
+                condensation = json.load(file)
+
+        components = {frozenset(component['files']): component for component in condensation['components']}
+        cycle = components[frozenset(['file0.h', 'file1.h'])]
+        self.assertTrue(cycle['cycle'])
+        self.assertFalse(components[frozenset(['file2.h'])]['cycle'])
+        self.assertEqual(len(components), 3)
+
+        ids = {files: component['id'] for files, component in components.items()}
+        expected_edges = sorted([[ids[frozenset(['file3.h'])], cycle['id']],
+                                 [ids[frozenset(['file3.h'])], ids[frozenset(['file2.h'])]],
+                                 [cycle['id'], ids[frozenset(['file2.h'])]]])
+        self.assertEqual(condensation['edges'], expected_edges)
+        for source, target in condensation['edges']:
+            self.assertLess(source, target)
@@ -0,0 +1,71 @@
+import numpy as np
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+from IncludeGraph import IncludeGraph
+
+
+class TestIncludeGraphNodes(unittest.TestCase):
+    def testNodesAreInterned(self):
+        '''
+        Test that each name is mapped to exactly one dense integer id
+        '''
+        include_graph = IncludeGraph()
+        self.assertEqual(include_graph.add_node('a.hpp'), 0)
+        self.assertEqual(include_graph.add_node('b.hpp'), 1)
+        self.assertEqual(include_graph.add_node('a.hpp'), 0)
+
+        self.assertEqual(include_graph.get_number_of_nodes(), 2)
+        self.assertEqual(include_graph.get_node_names(), ['a.hpp', 'b.hpp'])
+        self.assertEqual(include_graph.get_node_id('b.hpp'), 1)
+        self.assertIsNone(include_graph.get_node_id('c.hpp'))
+
+    def testEmptyGraph(self):
+        '''
+        Test that an empty graph returns empty degree vectors
+        '''
+        include_graph = IncludeGraph()
+        self.assertEqual(include_graph.get_number_of_edges(), 0)
+        self.assertEqual(include_graph.get_out_degrees().size, 0)
+        self.assertEqual(include_graph.get_in_degrees().size, 0)
+
+
+class TestIncludeGraphEdges(unittest.TestCase):
+    def testCsrAndDegrees(self):
+        '''
+        Test that the CSR representation and the degree vectors are correct
+        '''
+        include_graph = IncludeGraph()
+        include_graph.add_edge('a', 'b')
+        include_graph.add_edge('a', 'c')
+        include_graph.add_edge('c', 'b')
+
+        indptr, indices = include_graph.get_csr()
+        self.assertTrue(np.array_equal(indptr, [0, 2, 2, 3]))
+        self.assertTrue(np.array_equal(indices, [1, 2, 1]))
+        self.assertTrue(np.array_equal(include_graph.get_out_degrees(), [2, 0, 1]))
+        self.assertTrue(np.array_equal(include_graph.get_in_degrees(), [0, 2, 1]))
+
+    def testDuplicatedEdgesCountOnce(self):
+        '''
+        Test that including the same file several times results in a single edge
+        '''
+        include_graph = IncludeGraph()
+        include_graph.add_edge('a', 'b')
+        include_graph.add_edge('a', 'b')
+
+        self.assertEqual(include_graph.get_number_of_edges(), 1)
+        self.assertTrue(np.array_equal(include_graph.get_in_degrees(), [0, 1]))
+
+    def testEdgeAddedAfterCsrAccess(self):
+        '''
+        Test that the CSR representation is rebuilt if edges are added after it was accessed
+        '''
+        include_graph = IncludeGraph()
+        include_graph.add_edge('a', 'b')
+        self.assertEqual(include_graph.get_number_of_edges(), 1)
+
+        include_graph.add_edge('b', 'a')
+        self.assertEqual(include_graph.get_number_of_edges(), 2)
+        self.assertTrue(np.array_equal(include_graph.get_out_degrees(), [1, 1]))
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+from IncludeResolver import IncludeResolver, create_include_resolver
+
+sys.path.append('tests/modules_under_test/')
+from utils import AnalysisConfig
+
+# constants (two different utils.h and a header included by its path)
+FILE_PATHS = ['core/utils.h', 'core/core.cpp', 'gui/utils.h', 'gui/widgets/button.h', 'gui/widgets/button.cpp']
+
+
+class TestIncludeResolverResolve(unittest.TestCase):
+    def setUp(self):
+        self._include_resolver = IncludeResolver(FILE_PATHS)
+
+    def testIncludeOfSameDirectory(self):
+        '''
+        Test that an include is resolved relative to the directory of the including file first
+        '''
+        self.assertEqual(self._include_resolver.resolve('core/core.cpp', 'utils.h'), 0)
+        self.assertEqual(self._include_resolver.resolve('gui/widgets/button.cpp', 'button.h'), 3)
+        self.assertEqual(self._include_resolver.resolve('gui/widgets/button.h', '../utils.h'), 2)
+
+    def testIncludeOfPath(self):
+        '''
+        Test that an include is resolved by the file whose path ends with the included path
+        '''
+        self.assertEqual(self._include_resolver.resolve('core/core.cpp', 'gui/widgets/button.h'), 3)
+        self.assertEqual(self._include_resolver.resolve('core/core.cpp', 'gui/utils.h'), 2)
+
+    def testClosestFileOfSameName(self):
+        '''
+        Test that the file closest to the including file is taken if several files match
+        '''
+        self.assertEqual(self._include_resolver.resolve('gui/widgets/button.cpp', 'utils.h'), 2)
+        self.assertEqual(self._include_resolver.resolve('main.cpp', 'utils.h'), 0)
+
+    def testUnknownInclude(self):
+        '''
+        Test that None is returned for an include which does not refer to a known file
+        '''
+        self.assertIsNone(self._include_resolver.resolve('core/core.cpp', 'vector'))
+        self.assertIsNone(self._include_resolver.resolve('core/core.cpp', 'widgets/utils.h'))
+
+    def testIncludingDirectoryNotSearched(self):
+        '''
+        Test that the directory of the including file is skipped if desired (e.g. for #include <...>)
+        '''
+        include_resolver = IncludeResolver(['lib/string.h', 'src/string.h', 'src/main.cpp'])
+        self.assertEqual(include_resolver.resolve('src/main.cpp', 'string.h'), 1)
+        self.assertEqual(include_resolver.resolve('src/main.cpp', 'lib/string.h', False), 0)
+
+    def testIncludeDirectories(self):
+        '''
+        Test that the include directories of the including file are searched before the ones of all files
+        '''
+        include_resolver = IncludeResolver(FILE_PATHS, ['core'], {'gui/widgets/button.cpp': ('gui',)})
+
+        self.assertEqual(include_resolver.resolve('gui/widgets/button.cpp', 'utils.h'), 2)
+        self.assertEqual(include_resolver.resolve('gui/widgets/button.h', 'utils.h'), 0)
+        self.assertEqual(include_resolver.resolve('main.cpp', 'widgets/button.h'), 3)
+
+
+class TestIncludeResolverCreateIncludeResolver(unittest.TestCase):
+    def testConfiguredIncludeDirectories(self):
+        '''
+        Test that the include directories and the compilation database of AnalysisConfig are used
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database_file = os.path.join(tmp_dir, 'compile_commands.json')
+            with open(database_file, 'w') as file:
+                json.dump([{'directory': tmp_dir, 'file': 'gui/gui.cpp', 'arguments': ['g++', '-Igui', '-c', 'gui.cpp']}],
+                          file)
+
+            with patch.object(AnalysisConfig, 'INCLUDE_DIRECTORIES', [os.path.join(tmp_dir, 'core')]), \
+                    patch.object(AnalysisConfig, 'COMPILATION_DATABASE', database_file):
+                include_resolver = create_include_resolver(['core/utils.h', 'gui/utils.h', 'gui/gui.cpp', 'main.cpp'],
+                                                           tmp_dir)
+
+        self.assertEqual(include_resolver.resolve('main.cpp', 'utils.h'), 0)
+        self.assertEqual(include_resolver.resolve('gui/gui.cpp', 'utils.h', False), 1)
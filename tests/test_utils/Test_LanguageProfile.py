@@ -0,0 +1,101 @@
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import LanguageProfile as lp
+import ProgrammingLanguageConstants as plconst
+
+# the profile uses the configuration of the utils package
+sys.path.append('tests/modules_under_test/')
+from utils import ProgrammingLanguageConfig as plc
+
+
+class TestLanguageProfileCreate(unittest.TestCase):
+    def tearDown(self):
+        plc.PROGRAMMING_LANGUAGE = 'c++'
+
+    def testProfileOfCPP(self):
+        '''
+        Test that the profile contains the compiled C++ include pattern
+        '''
+        plc.PROGRAMMING_LANGUAGE = 'c++'
+        language_profile = lp.create_language_profile()
+
+        self.assertEqual(language_profile.programming_language, 'c++')
+        self.assertEqual(language_profile.include_pattern.pattern, plconst.CPP_INCLUDE_PATTERN)
+
+    def testUnsupportedLanguage(self):
+        '''
+        Test that a LanguageOptionError is raised for an unsupported programming language
+        '''
+        plc.PROGRAMMING_LANGUAGE = 'java'
+        with self.assertRaises(plc.LanguageOptionError):
+            lp.create_language_profile()
+
+
+class TestLanguageProfileFindIncludes(unittest.TestCase):
+    def setUp(self):
+        plc.PROGRAMMING_LANGUAGE = 'c++'
+        self.language_profile = lp.create_language_profile()
+
+    def testUserAndStlIncludes(self):
+        '''
+        Test that user-includes and stl-includes of a whole buffer are separated
+        '''
+        content = b'#include "lib1.hpp"\n#include <vector>\nint x;\n#include "dir/lib2.hpp"\n'
+        user_includes, stl_includes = self.language_profile.find_includes(content)
+
+        self.assertEqual(user_includes, [b'lib1.hpp', b'dir/lib2.hpp'])
+        self.assertEqual(stl_includes, [b'vector'])
+
+    def testWhitespaceAndLineEndings(self):
+        '''
+        Test that whitespace around # and include as well as CRLF line endings are handled
+        '''
+        content = b'  #  include "lib1.hpp"\r\n#include<map>\r\n'
+        user_includes, stl_includes = self.language_profile.find_includes(content)
+
+        self.assertEqual(user_includes, [b'lib1.hpp'])
+        self.assertEqual(stl_includes, [b'map'])
+
+    def testNoIncludesInsideLines(self):
+        '''
+        Test that includes which do not start a line (e.g. comments) or are incomplete are ignored
+        '''
+        content = b'// #include "lib1.hpp"\n#include "lib2.hpp\n"\n#define X #include <map>\n'
+        self.assertEqual(self.language_profile.find_includes(content), ([], []))
+
+
+class TestLanguageProfileMatchClassDefinition(unittest.TestCase):
+    def setUp(self):
+        plc.PROGRAMMING_LANGUAGE = 'c++'
+        self.language_profile = lp.create_language_profile()
+
+    def testNamespace(self):
+        '''
+        Test that a namespace definition is matched
+        '''
+        self.assertEqual(self.language_profile.match_class_definition('namespace utils {\n'), lp.NAMESPACE_GROUP)
+
+    def testClass(self):
+        '''
+        Test that class and struct definitions are matched, including a dllexport-part
+        '''
+        self.assertEqual(self.language_profile.match_class_definition('class Foo {\n'), lp.CLASS_GROUP)
+        self.assertEqual(self.language_profile.match_class_definition('  struct Bar\n'), lp.CLASS_GROUP)
+        self.assertEqual(self.language_profile.match_class_definition('class __declspec(dllexport) Baz\n'),
+                         lp.CLASS_GROUP)
+
+    def testAbstractMethod(self):
+        '''
+        Test that an abstract method is matched
+        '''
+        self.assertEqual(self.language_profile.match_class_definition('    virtual void run() = 0;\n'),
+                         lp.ABSTRACT_METHOD_GROUP)
+
+    def testOtherLines(self):
+        '''
+        Test that None is returned for lines without a definition
+        '''
+        for line in ['int main() {\n', '    virtual void run();\n', '// class Foo\n', '\n']:
+            self.assertIsNone(self.language_profile.match_class_definition(line))
@@ -0,0 +1,96 @@
+import numpy as np
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import MetricKernels as mk
+
+
+class TestMetricKernelsComputeInstability(unittest.TestCase):
+    def testCorrectCalculation(self):
+        '''
+        Test that I = fan_out / (fan_in + fan_out) is computed element-wise, 0 if there are no dependencies
+        '''
+        returned_instability = mk.compute_instability([1, 0, 2, 0], [1, 3, 0, 0])
+        self.assertTrue(np.array_equal(returned_instability, [.5, 1., 0., 0.]))
+        self.assertEqual(returned_instability.dtype, float)
+
+    def testBatchOfArrays(self):
+        '''
+        Test that several repositories can be computed at once using 2D-arrays
+        '''
+        fan_in = np.array([[1, 0], [0, 0]])
+        fan_out = np.array([[3, 0], [2, 0]])
+        returned_instability = mk.compute_instability(fan_in, fan_out)
+        self.assertEqual(returned_instability.shape, (2, 2))
+        self.assertTrue(np.array_equal(returned_instability, [[.75, 0.], [1., 0.]]))
+
+
+class TestMetricKernelsComputeAbstractness(unittest.TestCase):
+    def testCorrectCalculation(self):
+        '''
+        Test that A = N_a / N_c is computed element-wise, 0 if there is no class
+        '''
+        returned_abstractness = mk.compute_abstractness([1, 2, 0], [1, 4, 0])
+        self.assertTrue(np.array_equal(returned_abstractness, [1., .5, 0.]))
+
+    def testEmptyArrays(self):
+        '''
+        Test that empty arrays result in an empty array of type float
+        '''
+        returned_abstractness = mk.compute_abstractness([], [])
+        self.assertEqual(returned_abstractness.size, 0)
+        self.assertEqual(returned_abstractness.dtype, float)
+
+
+class TestMetricKernelsComputeDistance(unittest.TestCase):
+    def testCorrectCalculation(self):
+        '''
+        Test that D = |A + I - 1| is computed element-wise
+        '''
+        returned_distance = mk.compute_distance([1., 0., .5], [1., 0., .5])
+        self.assertTrue(np.array_equal(returned_distance, [1., 1., 0.]))
+
+
+class TestMetricKernelsGetTopIndices(unittest.TestCase):
+    def testEqualsFullSort(self):
+        '''
+        Test that the top values equal the first values of a full sort, equal values ordered by index
+        '''
+        values = np.round(np.random.RandomState(0).rand(1000), 1)
+        expected_indices = sorted(range(values.size), key=lambda index: (-values[index], index))
+
+        for nb_top in [1, 10, 99, 1000]:
+            self.assertEqual(list(mk.get_top_indices(values, nb_top)), expected_indices[:nb_top])
+
+    def testMoreTopValuesThanValues(self):
+        '''
+        Test that all values are returned if more top values than values are requested, none if no value is requested
+        '''
+        self.assertEqual(list(mk.get_top_indices([.2, .5], 5)), [1, 0])
+        self.assertEqual(list(mk.get_top_indices([.2, .5], 0)), [])
+        self.assertEqual(list(mk.get_top_indices([], 3)), [])
+
+
+class TestMetricKernelsComputeGroupQuantiles(unittest.TestCase):
+    def testEqualsQuantilesOfEachGroup(self):
+        '''
+        Test that the quantiles of each group equal those computed for the group separately, empty groups get NaN
+        '''
+        random_state = np.random.RandomState(0)
+        values = random_state.rand(500)
+        groups = random_state.choice([0, 1, 3], 500)
+        quantiles = [0, .25, .5, .75, 1]
+
+        returned_quantiles = mk.compute_group_quantiles(values, groups, 4, quantiles)
+
+        self.assertEqual(returned_quantiles.shape, (5, 4))
+        for group in [0, 1, 3]:
+            self.assertTrue(np.allclose(returned_quantiles[:, group], np.quantile(values[groups == group], quantiles)))
+        self.assertTrue(np.all(np.isnan(returned_quantiles[:, 2])))
+
+    def testNoGroups(self):
+        '''
+        Test that no groups result in no quantiles
+        '''
+        self.assertEqual(mk.compute_group_quantiles([], [], 0, [.5]).shape, (1, 0))
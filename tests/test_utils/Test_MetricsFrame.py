@@ -0,0 +1,54 @@
+import numpy as np
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import MetricsFrame as mf
+
+
+class TestMetricsFrameCreateMetricsFrameFromColumns(unittest.TestCase):
+    def setUp(self):
+        '''
+        Create the columns of the metrics of two source files and two headers
+        '''
+        self._names = ['b.cpp', 'a.h', 'a.cpp', 'c.h']
+        self._columns = {mf.INSTABILITY: np.array([1., .5, .0, .0]), mf.ABSTRACTNESS: np.array([.0, .5, .0, .0]),
+                         mf.DISTANCE: np.array([.0, .0, 1., 1.]), mf.FAN_IN: np.array([0, 1, 2, 0]),
+                         mf.FAN_OUT: np.array([1, 1, 0, 0]), mf.NB_INTERFACES: np.array([0, 1, 0, 0]),
+                         mf.NB_CLASSES: np.array([0, 2, 0, 1]), mf.CYCLE: np.array([-1, -1, -1, -1])}
+
+    def testColumnsAndOrder(self):
+        '''
+        Test that the rows are the given files and the columns keep their order and values
+        '''
+        returned_metrics_frame = mf.create_metrics_frame_from_columns(self._names, self._columns)
+
+        self.assertEqual(list(returned_metrics_frame.columns), mf.COLUMNS)
+        self.assertEqual(list(returned_metrics_frame.index), self._names)
+        self.assertEqual(returned_metrics_frame.loc['a.h', mf.NB_CLASSES], 2)
+        self.assertEqual(returned_metrics_frame[mf.FAN_OUT].dtype, int)
+
+    def testNamesAndColumnsOfMetricsFrame(self):
+        '''
+        Test that the names and columns of a metrics frame are the ones it was created from
+        '''
+        names, columns = mf.get_names_and_columns(mf.create_metrics_frame_from_columns(self._names, self._columns))
+
+        self.assertEqual(names, self._names)
+        self.assertEqual(list(columns), mf.COLUMNS)
+        for column in mf.COLUMNS:
+            self.assertTrue(np.array_equal(columns[column], self._columns[column]))
+
+    def testNamedMetrics(self):
+        '''
+        Test that the single metrics are returned with their names
+        '''
+        returned_metrics_frame = mf.create_metrics_frame_from_columns(self._names, self._columns)
+
+        self.assertEqual(mf.get_instability_metric(returned_metrics_frame).name, 'Instability-Metric')
+        self.assertEqual(mf.get_abstractness_metric(returned_metrics_frame).name, 'Abstractness-Metric')
+        self.assertEqual(mf.get_distance_metric(returned_metrics_frame).name, 'Distance_IA')
+
+
+if __name__ == '__main__':
+    unittest.main()
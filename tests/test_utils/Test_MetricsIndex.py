@@ -0,0 +1,102 @@
+import os
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import MetricsIndex as mi
+import SourceFileScanner as sfs
+
+# constants (a.h and b.h form the component "comp", main.cpp includes both)
+FILE_RECORDS = [sfs.FileRecord('src/comp/a.h', [], ['vector'], 1, 1),
+                sfs.FileRecord('src/comp/b.h', ['a.h'], [], 0, 2),
+                sfs.FileRecord('src/main.cpp', ['a.h', 'b.h'], ['map'], 0, 0)]
+
+
+class TestMetricsIndexGetFileMetrics(unittest.TestCase):
+    def setUp(self):
+        self._metrics_index = mi.MetricsIndex('src', FILE_RECORDS)
+
+    def testKnownFile(self):
+        '''
+        Test that the metrics of a file are returned
+        '''
+        returned_metrics = self._metrics_index.get_file_metrics('b.h')
+
+        self.assertEqual(returned_metrics, {'file': 'b.h', 'path': 'comp/b.h', 'instability': .5, 'abstractness': .0,
+                                            'distance': .5, 'fan_in': 1, 'fan_out': 1})
+
+    def testFileByPath(self):
+        '''
+        Test that a file is found by its path relative to the analyzed directory, an ambiguous filename is unknown
+        '''
+        metrics_index = mi.MetricsIndex('src', FILE_RECORDS + [sfs.FileRecord('src/other/b.h', [], [], 0, 0)])
+
+        self.assertEqual(metrics_index.get_file_metrics('comp/b.h')['path'], 'comp/b.h')
+        self.assertEqual(metrics_index.get_file_metrics('other/b.h')['fan_in'], 0)
+        self.assertIsNone(metrics_index.get_file_metrics('b.h'))
+
+    def testFileByAbsolutePath(self):
+        '''
+        Test that a file is found by its absolute path or its path relative to the analyzed directory, independent of
+        the current working directory
+        '''
+        self.assertEqual(self._metrics_index.get_file_metrics(os.path.abspath('src/comp/b.h'))['path'], 'comp/b.h')
+        self.assertEqual(self._metrics_index.get_file_metrics('./comp/../comp/b.h')['path'], 'comp/b.h')
+        self.assertIsNone(self._metrics_index.get_file_metrics('src/comp/b.h'))
+
+    def testUnknownFile(self):
+        '''
+        Test that None is returned for an unknown file
+        '''
+        self.assertIsNone(self._metrics_index.get_file_metrics('vector'))
+        self.assertEqual(self._metrics_index.get_number_of_files(), 3)
+
+
+class TestMetricsIndexGetComponentMetrics(unittest.TestCase):
+    def setUp(self):
+        self._metrics_index = mi.MetricsIndex('src', FILE_RECORDS)
+
+    def testComponent(self):
+        '''
+        Test that only dependencies crossing the component boundary are counted
+        '''
+        returned_metrics = self._metrics_index.get_component_metrics('comp/')
+
+        self.assertEqual(returned_metrics['component'], 'comp')
+        self.assertEqual(returned_metrics['files'], 2)
+        self.assertEqual(returned_metrics['fan_in'], 1)
+        self.assertEqual(returned_metrics['fan_out'], 1)
+        self.assertAlmostEqual(returned_metrics['instability'], .5)
+        self.assertAlmostEqual(returned_metrics['abstractness'], 1 / 3)
+
+    def testUnknownComponent(self):
+        '''
+        Test that None is returned for a component without files
+        '''
+        self.assertIsNone(self._metrics_index.get_component_metrics('unknown'))
+
+
+class TestMetricsIndexGetTopFiles(unittest.TestCase):
+    def setUp(self):
+        self._metrics_index = mi.MetricsIndex('src', FILE_RECORDS)
+
+    def testTopFilesByDistance(self):
+        '''
+        Test that the files with the highest distance are returned first, ties ordered by filename
+        '''
+        returned_files = self._metrics_index.get_top_files(2)
+        self.assertEqual([metrics['file'] for metrics in returned_files], ['main.cpp', 'a.h'])
+
+    def testTopFilesByFanIn(self):
+        '''
+        Test that files can be ranked by another metric
+        '''
+        returned_files = self._metrics_index.get_top_files(1, 'fan_in')
+        self.assertEqual([metrics['file'] for metrics in returned_files], ['main.cpp'])
+
+    def testUnknownMetric(self):
+        '''
+        Test that a ValueError is raised for an unknown metric
+        '''
+        with self.assertRaises(ValueError):
+            self._metrics_index.get_top_files(1, 'unknown')
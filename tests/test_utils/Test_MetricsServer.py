@@ -0,0 +1,84 @@
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import MetricsServer as ms
+
+
+class TestMetricsServerRequests(unittest.TestCase):
+    def setUp(self):
+        '''
+        Start a server on a free port for a temporary directory containing two code files
+        '''
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._header_file = os.path.join(self._tmp_dir.name, 'lib1.hpp')
+        Path(self._header_file).write_text('class Lib1 {\n    virtual void run() = 0;\n};\n')
+        Path(self._tmp_dir.name, 'source.cpp').write_text('#include "lib1.hpp"\n')
+
+        self._service = ms.MetricsService(self._tmp_dir.name)
+        self._server = ms.create_server(self._service, port=0)
+        self._url = 'http://{}:{}'.format(*self._server.server_address[:2])
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._service.close()
+        self._tmp_dir.cleanup()
+
+    def _request(self, path, data=None):
+        ''' return status and decoded JSON response of the given request '''
+        try:
+            with urlopen(self._url + path, data=data) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as ex:
+            return ex.code, json.loads(ex.read())
+
+    def testFileMetrics(self):
+        '''
+        Test that the metrics of a file are returned
+        '''
+        status, metrics = self._request('/metrics?file=lib1.hpp')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics['fan_out'], 1)
+        self.assertEqual(metrics['instability'], 1.)
+        self.assertEqual(metrics['abstractness'], 1.)
+
+    def testTopFiles(self):
+        '''
+        Test that the files with the highest distance are returned
+        '''
+        status, top_files = self._request('/top?n=1')
+
+        self.assertEqual(status, 200)
+        self.assertEqual([metrics['file'] for metrics in top_files], ['lib1.hpp'])
+
+    def testInvalidRequests(self):
+        '''
+        Test that invalid requests are answered with an error
+        '''
+        self.assertEqual(self._request('/metrics')[0], 400)
+        self.assertEqual(self._request('/metrics?file=unknown.h')[0], 404)
+        self.assertEqual(self._request('/top?metric=unknown')[0], 400)
+        self.assertEqual(self._request('/unknown')[0], 404)
+        self.assertEqual(self._request('/refresh', data=b'{"files": "lib1.hpp"}')[0], 400)
+        self.assertEqual(self._request('/refresh', data=b'{"files": [1]}')[0], 400)
+
+    def testRefreshGivenFiles(self):
+        '''
+        Test that the given files are scanned again on refresh
+        '''
+        Path(self._header_file).write_text('class Lib1 {\n};\n')
+        status, summary = self._request('/refresh', data=json.dumps({'files': ['lib1.hpp']}).encode())
+
+        self.assertEqual(status, 200)
+        self.assertTrue(summary['updated'])
+        self.assertEqual(self._request('/metrics?file=lib1.hpp')[1]['abstractness'], 0.)
@@ -0,0 +1,84 @@
+import io
+import json
+import subprocess
+import unittest
+from unittest.mock import patch
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import MetricsStream as mst
+import SourceFileScanner as sfs
+
+# constants
+TEST_CODE_FILES = 'tests/files/'
+
+
+class TestMetricsStreamStreamMetrics(unittest.TestCase):
+    def testFileLinesFollowedByMetricsLines(self):
+        '''
+        Test that one line is written per scanned file, followed by one line of metrics per file
+        '''
+        stream = io.StringIO()
+        names, columns = mst.stream_metrics(TEST_CODE_FILES, stream)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        file_lines = [line for line in lines if line['type'] == mst.FILE_LINE]
+        metrics_lines = [line for line in lines if line['type'] == mst.METRICS_LINE]
+        self.assertEqual(lines, file_lines + metrics_lines)
+        self.assertEqual(len(file_lines), 5)
+        self.assertEqual([line['name'] for line in metrics_lines], names)
+        self.assertEqual([line['D'] for line in metrics_lines], list(columns['D']))
+
+    def testFileLineContainsIncludesAndClasses(self):
+        '''
+        Test that the line of a file contains its relative path, includes and number of interfaces and classes
+        '''
+        file_record = sfs.FileRecord('root/src/a.h', ['b.h'], ['vector'], 1, 2)
+
+        returned_line = mst.get_file_line('root', file_record)
+
+        self.assertEqual(returned_line, {'type': 'file', 'name': 'src/a.h', 'user_includes': ['b.h'],
+                                         'stl_includes': ['vector'], 'N_a': 1, 'N_c': 2})
+
+    def testFileLineFlushedBeforeNextScan(self):
+        '''
+        Test that the line of a file is flushed to the stream before the next file is scanned
+        '''
+        stream = io.StringIO()
+        flushed_lines = []
+
+        def scan_file(*args, **kwargs):
+            flushed_lines.append(len(stream.getvalue().splitlines()))
+            return sfs.FileRecord(args[0], [], [], 0, 0)
+
+        with patch('utils.SourceFileScanner.scan_file', side_effect=scan_file):
+            mst.stream_metrics(TEST_CODE_FILES, stream)
+
+        self.assertEqual(flushed_lines, [0, 1, 2, 3, 4])
+
+
+class TestMetricsStreamImports(unittest.TestCase):
+    def testStreamAndExportWithoutPandasAndMatplotlib(self):
+        '''
+        Test that streaming the results and exporting them as JSON Lines and csv (like a --stream run) neither imports
+        pandas nor matplotlib
+        '''
+        code = ('import io, os, sys, tempfile\n'
+                'sys.path.append("tests/modules_under_test/")\n'
+                'from utils import FileUtility, MetricsStream, ProgrammingLanguageConfig\n'
+                'ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE = "c++"\n'
+                'names, columns = MetricsStream.stream_metrics("{}", io.StringIO())\n'
+                'with tempfile.TemporaryDirectory() as tmp_dir:\n'
+                '    for file_name in ("metrics.jsonl", "metrics.csv"):\n'
+                '        FileUtility.save_metrics_to_file(names, columns, os.path.join(tmp_dir, file_name))\n'
+                'print(len(names), *[module for module in ("pandas", "matplotlib") if module in sys.modules])'
+                ).format(TEST_CODE_FILES)
+
+        output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True,
+                                universal_newlines=True).stdout.split()
+
+        self.assertEqual(output, ['5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import patch
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import ParseCache as pc
+import SourceFileScanner as sfs
+
+# constants
+PARSED_FILE = (['lib1.hpp'], ['vector'], 1, 2)
+
+
+class ParseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        '''
+        Create a temporary cache directory containing a single code file
+        '''
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._cache_dir = os.path.join(self._tmp_dir.name, 'cache')
+        self._code_file = os.path.join(self._tmp_dir.name, 'file.h')
+        Path(self._code_file).write_text('#include "lib1.hpp"\n')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _getContentHash(self, file_path):
+        ''' return the content hash of the given file, as computed by the scanner '''
+        return pc.get_content_hash(Path(file_path).read_bytes())
+
+    def _touch(self, nanoseconds=10**9):
+        ''' change the modification time of the code file only '''
+        stat_result = os.stat(self._code_file)
+        os.utime(self._code_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + nanoseconds))
+
+
+class TestParseCacheGetParsedFile(ParseCacheTestCase):
+    def testUnknownFile(self):
+        '''
+        Test that None is returned for a file not cached yet
+        '''
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            self.assertIsNone(parse_cache.get_parsed_file(self._code_file, True))
+
+    def testUnchangedFile(self):
+        '''
+        Test that a stored file is returned from the cache in a later run
+        '''
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            parse_cache.store_parsed_file(self._code_file, True, PARSED_FILE, self._getContentHash(self._code_file))
+
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            self.assertEqual(parse_cache.get_parsed_file(self._code_file, True), PARSED_FILE)
+
+    def testTouchedFileWithSameContent(self):
+        '''
+        Test that a file with changed modification time but same content is still returned (content hash)
+        '''
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            parse_cache.store_parsed_file(self._code_file, True, PARSED_FILE, self._getContentHash(self._code_file))
+
+        self._touch()
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            self.assertEqual(parse_cache.get_parsed_file(self._code_file, True), PARSED_FILE)
+
+    def testChangedContent(self):
+        '''
+        Test that a file with changed content is not returned
+        '''
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            parse_cache.store_parsed_file(self._code_file, True, PARSED_FILE, self._getContentHash(self._code_file))
+
+        Path(self._code_file).write_text('#include "lib2.hpp"\n')
+        self._touch()
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            self.assertIsNone(parse_cache.get_parsed_file(self._code_file, True))
+
+    def testReadContentOfChangedFile(self):
+        '''
+        Test that the content of a changed file of the same size, which was read to compare its hash, is passed on
+        '''
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            parse_cache.store_parsed_file(self._code_file, True, PARSED_FILE, self._getContentHash(self._code_file))
+
+        Path(self._code_file).write_text('#include "lib2.hpp"\n')
+        self._touch()
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            parse_cache.get_parsed_file(self._code_file, True)
+
+            self.assertEqual(parse_cache.pop_read_content(self._code_file), b'#include "lib2.hpp"\n')
+            self.assertIsNone(parse_cache.pop_read_content(self._code_file))
+
+    def testClassesNotCounted(self):
+        '''
+        Test that a file cached without counted classes is not returned if classes need to be counted
+        '''
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            parse_cache.store_parsed_file(self._code_file, False, (['lib1.hpp'], [], 0, 0),
+                                          self._getContentHash(self._code_file))
+
+            self.assertIsNone(parse_cache.get_parsed_file(self._code_file, True))
+            self.assertEqual(parse_cache.get_parsed_file(self._code_file, False), (['lib1.hpp'], [], 0, 0))
+
+    def testOtherProgrammingLanguage(self):
+        '''
+        Test that cached files are discarded if the programming language changed
+        '''
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            parse_cache.store_parsed_file(self._code_file, True, PARSED_FILE, self._getContentHash(self._code_file))
+
+        with patch('utils.ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE', 'other'):
+            with pc.ParseCache(self._cache_dir) as parse_cache:
+                self.assertIsNone(parse_cache.get_parsed_file(self._code_file, True))
+
+
+class TestParseCacheEviction(ParseCacheTestCase):
+    def testLeastRecentlyUsedAreEvicted(self):
+        '''
+        Test that the cache does not exceed its maximum number of entries
+        '''
+        other_file = os.path.join(self._tmp_dir.name, 'other.h')
+        Path(other_file).write_text('')
+
+        with pc.ParseCache(self._cache_dir, max_entries=1) as parse_cache:
+            parse_cache.store_parsed_file(self._code_file, True, PARSED_FILE, self._getContentHash(self._code_file))
+        with pc.ParseCache(self._cache_dir, max_entries=1) as parse_cache:
+            parse_cache.store_parsed_file(other_file, True, PARSED_FILE, self._getContentHash(other_file))
+
+        with pc.ParseCache(self._cache_dir, max_entries=1) as parse_cache:
+            self.assertEqual(parse_cache.get_number_of_entries(), 1)
+            self.assertIsNone(parse_cache.get_parsed_file(self._code_file, True))
+            self.assertEqual(parse_cache.get_parsed_file(other_file, True), PARSED_FILE)
+
+    def testClearCache(self):
+        '''
+        Test that clearing the cache removes all entries
+        '''
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            parse_cache.store_parsed_file(self._code_file, True, PARSED_FILE, self._getContentHash(self._code_file))
+
+        pc.clear_cache(self._cache_dir)
+        with pc.ParseCache(self._cache_dir) as parse_cache:
+            self.assertEqual(parse_cache.get_number_of_entries(), 0)
+
+
+class TestParseCacheScanCodeFiles(ParseCacheTestCase):
+    def testUnchangedFilesAreNotScannedAgain(self):
+        '''
+        Test that a warm rerun of the scanner does not parse unchanged files
+        '''
+        first_records = sfs.scan_code_files(self._tmp_dir.name, self._cache_dir)
+
+        with patch('SourceFileScanner.scan_file') as mocked_scan_func:
+            second_records = sfs.scan_code_files(self._tmp_dir.name, self._cache_dir)
+
+            mocked_scan_func.assert_not_called()
+            self.assertEqual(first_records, second_records)
+
+    def testChangedFileReadOnce(self):
+        '''
+        Test that a changed file whose content is compared by the cache is not read again to scan it
+        '''
+        sfs.scan_code_files(self._tmp_dir.name, self._cache_dir)
+        Path(self._code_file).write_text('#include "lib2.hpp"\n')
+        self._touch()
+
+        with patch('builtins.open', wraps=open) as mocked_open:
+            returned_records = sfs.scan_code_files(self._tmp_dir.name, self._cache_dir)
+
+            opened_files = [call_args[0][0] for call_args in mocked_open.call_args_list]
+            self.assertEqual(opened_files.count(self._code_file), 1)
+            self.assertEqual(returned_records[0].user_includes, ['lib2.hpp'])
+
+    def testNewFileReadOnce(self):
+        '''
+        Test that a file not cached yet is read once to scan it and to hash its content
+        '''
+        with patch('builtins.open', wraps=open) as mocked_open:
+            sfs.scan_code_files(self._tmp_dir.name, self._cache_dir)
+
+            opened_files = [call_args[0][0] for call_args in mocked_open.call_args_list]
+            self.assertEqual(opened_files.count(self._code_file), 1)
+
+        # the cached content hash keeps a touched file valid
+        self._touch()
+        with patch('SourceFileScanner.scan_file') as mocked_scan_func:
+            sfs.scan_code_files(self._tmp_dir.name, self._cache_dir)
+
+            mocked_scan_func.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
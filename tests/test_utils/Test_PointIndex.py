@@ -0,0 +1,41 @@
+import numpy as np
+import unittest
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import PointIndex as pi
+
+
+class TestPointIndexQuery(unittest.TestCase):
+    def testEqualsBruteForce(self):
+        '''
+        Test that the points found by the index equal those found by checking all points, including many
+        coincident points
+        '''
+        random_state = np.random.RandomState(0)
+        x, y = np.round(random_state.rand(2, 5000), 2)
+        x[:1000], y[:1000] = 0, 0
+
+        index = pi.PointIndex(x, y)
+
+        for query_x, query_y, radius_x, radius_y in random_state.rand(200, 4) * [1, 1, .05, .05] + [0, 0, .001, .001]:
+            distances = ((x - query_x) / radius_x) ** 2 + ((y - query_y) / radius_y) ** 2
+            expected_points = np.flatnonzero(distances <= 1)
+            expected_points = expected_points[np.lexsort((expected_points, distances[expected_points]))]
+            self.assertEqual(list(index.query(query_x, query_y, radius_x, radius_y)), list(expected_points))
+
+    def testPositionOutsideOfPoints(self):
+        '''
+        Test that positions outside of the bounding box of the points find the points close to its border only
+        '''
+        index = pi.PointIndex([.2, .4, .8], [.5, .5, .5])
+
+        self.assertEqual(list(index.query(.1, .5, .15, .1)), [0])
+        self.assertEqual(list(index.query(1.5, 1.5, .1, .1)), [])
+
+    def testNoPointsAndSinglePoint(self):
+        '''
+        Test that an index of no points finds nothing and an index of a single point finds it
+        '''
+        self.assertEqual(list(pi.PointIndex([], []).query(.5, .5, .1, .1)), [])
+        self.assertEqual(list(pi.PointIndex([.3], [.3]).query(.31, .3, .1, .1)), [0])
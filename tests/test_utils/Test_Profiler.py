@@ -0,0 +1,137 @@
+import subprocess
+import time
+import unittest
+from unittest.mock import patch
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import SourceFileScanner as sfs
+
+# the scanner counts by the module imported as utils.Profiler
+sys.path.append('tests/modules_under_test/')
+from utils import AnalysisConfig
+from utils import Profiler as prf
+
+# constants
+TEST_CODE_FILES = 'tests/files/'
+ABSTRACT_CLASS_FILE = TEST_CODE_FILES + 'abstractness_metric_test_files/abstract_class.h'
+SOURCE_FILE = TEST_CODE_FILES + 'instability_metric_test_files/source.cpp'
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def setUp(self):
+        prf.reset()
+        patcher = patch.object(AnalysisConfig, 'PROFILE', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(prf.reset)
+
+
+class TestProfilerPhase(ProfilerTestCase):
+    def testNestedPhaseExcludedFromOuterPhase(self):
+        '''
+        Test that the time of a phase entered within another one is not counted by the outer phase
+        '''
+        with prf.phase(prf.PARSING):
+            with prf.phase(prf.DISCOVERY):
+                time.sleep(.05)
+
+        phase_times = prf.get_phase_times()
+        self.assertGreaterEqual(phase_times[prf.DISCOVERY][0], .05)
+        self.assertLess(phase_times[prf.PARSING][0], .05)
+        self.assertEqual(phase_times[prf.PARSING][2], 1)
+
+    def testCallsAccumulated(self):
+        '''
+        Test that entering a phase several times accumulates its calls
+        '''
+        for _ in range(3):
+            with prf.phase(prf.EXPORT):
+                pass
+
+        self.assertEqual(prf.get_phase_times()[prf.EXPORT][2], 3)
+        self.assertIn(prf.EXPORT, prf.format_report())
+
+    def testLazyImportsMeasuredSeparately(self):
+        '''
+        Test that pandas is imported within the imports phase and not within the metrics frame phase using it
+        '''
+        code = ('import sys\n'
+                'sys.path.append("tests/modules_under_test/")\n'
+                'from utils import AnalysisConfig, DataSeriesUtility, Profiler, ProgrammingLanguageConfig\n'
+                'AnalysisConfig.PROFILE = True\n'
+                'ProgrammingLanguageConfig.PROGRAMMING_LANGUAGE = "c++"\n'
+                'DataSeriesUtility.get_metrics_frame("{}")\n'
+                'phase_times = Profiler.get_phase_times()\n'
+                'print(phase_times[Profiler.IMPORTS][0] > phase_times[Profiler.METRICS_FRAME][0])').format(
+                    TEST_CODE_FILES)
+
+        output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True,
+                                universal_newlines=True).stdout.split()
+
+        self.assertEqual(output, ['True'])
+
+    def testNothingMeasuredIfDisabled(self):
+        '''
+        Test that neither phases nor counters are recorded if profiling is disabled
+        '''
+        with patch.object(AnalysisConfig, 'PROFILE', False):
+            with prf.phase(prf.PARSING):
+                prf.count(prf.FILES_READ)
+
+        self.assertEqual(prf.get_phase_times(), {})
+        self.assertEqual(prf.get_counters(), {})
+
+
+class TestProfilerScanCounters(ProfilerTestCase):
+    def testCountersOfScannedFile(self):
+        '''
+        Test that files, bytes and lines read and the regex evaluations of scanning a file are counted
+        '''
+        with open(ABSTRACT_CLASS_FILE, 'rb') as file:
+            content = file.read()
+
+        file_record = sfs.scan_file(ABSTRACT_CLASS_FILE)
+
+        counters = prf.get_counters()
+        nb_lines = len(content.splitlines())
+        self.assertEqual(counters[prf.FILES_READ], 1)
+        self.assertEqual(counters[prf.BYTES_READ], len(content))
+        self.assertEqual(counters[prf.LINES_READ], nb_lines)
+        self.assertEqual(counters[prf.REGEX_EVALUATIONS],
+                         len(file_record.user_includes) + len(file_record.stl_includes) + 1 + nb_lines)
+
+    def testRegexEvaluationsCounted(self):
+        '''
+        Test that the regex evaluations are the searches and matches actually done, e.g. lines ending by \\r are
+        matched separately by the class definition pattern
+        '''
+        with patch('utils.LanguageProfile.LanguageProfile.match_class_definition', autospec=True,
+                   side_effect=lambda profile, line: None) as mocked_match_func:
+            sfs.scan_file('mac.h', content=b'#include "a.h"\n#include <vector>\nclass A {\r};\r')
+        nb_include_searches = 3
+
+        self.assertEqual(mocked_match_func.call_count, 4)
+        self.assertEqual(prf.get_counters()[prf.REGEX_EVALUATIONS], nb_include_searches + 4)
+
+        # the classes are not matched if not counted
+        prf.reset()
+        sfs.scan_file('mac.h', False, content=b'#include "a.h"\n#include <vector>\nclass A {\r};\r')
+        self.assertEqual(prf.get_counters()[prf.REGEX_EVALUATIONS], nb_include_searches)
+
+    def testCountersOfWorkerProcesses(self):
+        '''
+        Test that the counters of files scanned by worker processes are added to the counters of the run
+        '''
+        file_paths = [ABSTRACT_CLASS_FILE, SOURCE_FILE] * 2
+
+        sfs.scan_files(file_paths, [True, False] * 2, jobs=1)
+        sequential_counters = prf.pop_counters()
+        sfs.scan_files(file_paths, [True, False] * 2, jobs=2)
+
+        self.assertEqual(prf.get_counters(), sequential_counters)
+        self.assertEqual(sequential_counters[prf.FILES_READ], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
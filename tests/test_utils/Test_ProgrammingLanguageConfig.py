@@ -70,3 +70,10 @@ class TestProgrammingLanguageConfigAllGetterMethodsCPP(unittest.TestCase):
         '''
         returned_std_include_identifier = plc.get_prefix_standard_include_identifier()
         self.assertEqual(returned_std_include_identifier, plconst.CPP_PREFIX_STD_INCLUDE)
+
+    def testGetIncludePattern(self):
+        '''
+        Test that a correct C++ include pattern is returned
+        '''
+        returned_include_pattern = plc.get_include_pattern()
+        self.assertEqual(returned_include_pattern, plconst.CPP_INCLUDE_PATTERN)
@@ -0,0 +1,178 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import warnings
+import sys
+
+sys.path.append('tests/modules_under_test/utils/')
+import SourceFileScanner as sfs
+
+sys.path.append('tests/modules_under_test/')
+from utils import AnalysisConfig
+
+# constants
+TEST_CODE_FILES = 'tests/files/'
+ABSTRACT_CLASS_FILE = TEST_CODE_FILES + 'abstractness_metric_test_files/abstract_class.h'
+SOURCE_FILE = TEST_CODE_FILES + 'instability_metric_test_files/source.cpp'
+
+
+class TestSourceFileScannerScanFile(unittest.TestCase):
+    def testEmptyFilePath(self):
+        '''
+        Test that a valid record is returned although an empty filepath is provided
+        '''
+        with warnings.catch_warnings(record=True) as w:
+            # Cause all warnings to always be triggered.
+            warnings.simplefilter("always")
+
+            returned_record = sfs.scan_file('')
+
+            # assert correct result
+            self.assertEqual(returned_record, sfs.FileRecord('', [], [], 0, 0))
+            self.assertEqual(len(w), 1)
+            self.assertTrue('...returning default values' in str(w[-1].message))
+
+    def testIncludesAndClassesInOneRecord(self):
+        '''
+        Test that includes and classes are both contained in the returned record
+        '''
+        returned_record = sfs.scan_file(SOURCE_FILE)
+        self.assertEqual(returned_record.user_includes, ['lib1.hpp', 'lib2.hpp'])
+        self.assertEqual(returned_record.stl_includes, ['stdout'])
+
+        returned_record = sfs.scan_file(ABSTRACT_CLASS_FILE)
+        self.assertEqual(returned_record.nb_interfaces, 1)
+        self.assertEqual(returned_record.nb_classes, 1)
+
+    def testClassesNotCountedIfNotDesired(self):
+        '''
+        Test that classes are not counted if count_classes is False
+        '''
+        returned_record = sfs.scan_file(ABSTRACT_CLASS_FILE, count_classes=False)
+        self.assertEqual(returned_record.nb_interfaces, 0)
+        self.assertEqual(returned_record.nb_classes, 0)
+
+    def testNonUTF8File(self):
+        '''
+        Test that a file containing invalid UTF-8 bytes is scanned without an error
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'latin1.h')
+            with open(file_path, 'wb') as file:
+                file.write(b'// Gr\xfc\xdfe\n#include "lib\xe4.hpp"\n#include <map>\r\nclass A {\r\n'
+                           b'    virtual void run() = 0;\r\n};\r\n')
+
+            returned_record = sfs.scan_file(file_path)
+
+        self.assertEqual(returned_record.user_includes, ['lib\ufffd.hpp'])
+        self.assertEqual(returned_record.stl_includes, ['map'])
+        self.assertEqual(returned_record.nb_interfaces, 1)
+        self.assertEqual(returned_record.nb_classes, 1)
+
+    def testIncludedPathIsKept(self):
+        '''
+        Test that the path of an included file is kept and normalized
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'source.cpp')
+            with open(file_path, 'wb') as file:
+                file.write(b'#include "core/./utils.h"\n#include "..\\gui\\utils.h"\n#include <sys/types.h>\n')
+
+            returned_record = sfs.scan_file(file_path)
+
+        self.assertEqual(returned_record.user_includes, ['core/utils.h', '../gui/utils.h'])
+        self.assertEqual(returned_record.stl_includes, ['sys/types.h'])
+
+
+class TestSourceFileScannerScanCodeFiles(unittest.TestCase):
+    def testEachFileScannedOnce(self):
+        '''
+        Test that every code file is scanned exactly once
+        '''
+        with patch('SourceFileScanner.scan_file', wraps=sfs.scan_file) as mocked_scan_func:
+            returned_records = sfs.scan_code_files(TEST_CODE_FILES)
+
+            scanned_files = [call_args[0][0] for call_args in mocked_scan_func.call_args_list]
+            self.assertEqual(len(returned_records), 5)
+            self.assertEqual(sorted(scanned_files), sorted(set(scanned_files)))
+            self.assertEqual(sorted(record.file_path for record in returned_records), sorted(scanned_files))
+
+    def testClassesCountedInHeadersOnly(self):
+        '''
+        Test that classes are only counted in files considered by the abstractness metric
+        '''
+        with patch('SourceFileScanner.scan_file') as mocked_scan_func:
+            sfs.scan_code_files(TEST_CODE_FILES)
+
+            for (file_path, count_classes), _ in mocked_scan_func.call_args_list:
+                self.assertEqual(count_classes, not file_path.endswith('.cpp'))
+
+    def testRecordsYieldedWhileScanning(self):
+        '''
+        Test that the record of a file is yielded before the next file is scanned
+        '''
+        with patch('SourceFileScanner.scan_file', wraps=sfs.scan_file) as mocked_scan_func:
+            file_records = sfs.iterate_code_file_records(TEST_CODE_FILES)
+            first_record = next(file_records)
+
+            mocked_scan_func.assert_called_once()
+            self.assertEqual(first_record.file_path, mocked_scan_func.call_args[0][0])
+            self.assertEqual(len([first_record] + list(file_records)), 5)
+
+
+class TestSourceFileScannerCompilationDatabase(unittest.TestCase):
+    def testTranslationUnitsOfDatabase(self):
+        '''
+        Test that only the translation units listed in the compilation database and all headers are scanned
+        '''
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for filename in ['a.cpp', 'b.cpp', 'a.h']:
+                with open(os.path.join(tmp_dir, filename), 'w') as file:
+                    file.write('#include "a.h"\n')
+            database_file = os.path.join(tmp_dir, 'compile_commands.json')
+            with open(database_file, 'w') as file:
+                json.dump([{'directory': tmp_dir, 'file': 'a.cpp', 'command': 'g++ -c a.cpp'}], file)
+
+            with patch.object(AnalysisConfig, 'COMPILATION_DATABASE', database_file):
+                returned_records = sfs.scan_code_files(tmp_dir)
+
+        self.assertEqual(sorted(os.path.basename(record.file_path) for record in returned_records), ['a.cpp', 'a.h'])
+
+
+class TestSourceFileScannerUpdateFileRecords(unittest.TestCase):
+    def testRecordsUpdatedInPlace(self):
+        '''
+        Test that the records of changed files keep their position, records of files which are no code files anymore
+        are removed
+        '''
+        file_records = {file_path: sfs.FileRecord(file_path, [], [], 0, 0)
+                        for file_path in [SOURCE_FILE, ABSTRACT_CLASS_FILE, TEST_CODE_FILES + 'removed.h']}
+
+        sfs.update_file_records(file_records, [TEST_CODE_FILES + 'removed.h', SOURCE_FILE], TEST_CODE_FILES, jobs=1)
+
+        self.assertEqual(list(file_records), [SOURCE_FILE, ABSTRACT_CLASS_FILE])
+        self.assertEqual(file_records[SOURCE_FILE], sfs.scan_file(SOURCE_FILE, count_classes=False))
+
+
+class TestSourceFileScannerScanFiles(unittest.TestCase):
+    def testParallelScanEqualsSequentialScan(self):
+        '''
+        Test that scanning with several jobs returns the same records in the same order as a single job
+        '''
+        file_paths = [ABSTRACT_CLASS_FILE, SOURCE_FILE] * 3
+        count_classes_flags = [True, False] * 3
+
+        sequential_records = sfs.scan_files(file_paths, count_classes_flags, jobs=1)
+        parallel_records = sfs.scan_files(file_paths, count_classes_flags, jobs=2)
+
+        self.assertEqual([record.file_path for record in parallel_records], file_paths)
+        self.assertEqual(parallel_records, sequential_records)
+
+    def testAllCoresUsedForZeroJobs(self):
+        '''
+        Test that zero jobs are accepted and scan all given files
+        '''
+        returned_records = sfs.scan_files([SOURCE_FILE, ABSTRACT_CLASS_FILE], [False, True], jobs=0)
+        self.assertEqual([record.file_path for record in returned_records], [SOURCE_FILE, ABSTRACT_CLASS_FILE])